@@ -0,0 +1,114 @@
+import hashlib
+import json
+import os
+import random
+from typing import Dict, List, Tuple
+
+from benchmarks.SyntheticBagSpec import SyntheticBagSpec
+
+
+class SyntheticBagGenerator:
+    """
+    Writes BagIt bags shaped like tests/resources/bags/demo.person.1 (content files, sip.json,
+    bag-info.txt with Payload-Oxum, md5 and sha512 manifests), which pass the BagValidator.
+    """
+
+    BINARY_TYPES = {
+        "jpg": "image/jpeg", "png": "image/png", "tif": "image/tiff",
+        "mp3": "audio/mpeg", "mp4": "video/mp4", "pdf": "application/pdf",
+    }
+    TEXT_TYPES = {"xml": "text/xml", "json": "application/json", "txt": "text/plain"}
+
+    WORDS = ["gams", "person", "adler", "graz", "archive", "letter", "event", "place", "date", "rdf", "dc", "digital"]
+
+    def __init__(self, spec: SyntheticBagSpec) -> None:
+        self.spec = spec
+        unknown = set(spec.file_types) - set(self.BINARY_TYPES) - set(self.TEXT_TYPES)
+        if unknown:
+            raise ValueError(f"Unsupported file types: {sorted(unknown)}")
+
+    def generate(self, bag_root: str, project_abbr: str = "demo") -> List[Tuple[str, int]]:
+        """
+        Writes the bags below bag_root and returns (relative bag path, payload bytes) of every bag.
+        """
+        rng = random.Random(self.spec.seed)
+        bags = []
+        for index in range(1, self.spec.count + 1):
+            # spread nested bags over 10 folders per level
+            parents = [f"group-{(index // 10 ** level) % 10}" for level in range(self.spec.nesting_depth, 0, -1)]
+            relative_path = os.path.join(*parents, f"{project_abbr}.synthetic.{index}")
+            payload_bytes = self._write_bag(os.path.join(bag_root, relative_path), project_abbr, index, rng)
+            bags.append((relative_path, payload_bytes))
+        return bags
+
+    def _write_bag(self, bag_path: str, project_abbr: str, index: int, rng: random.Random) -> int:
+        recid = os.path.basename(bag_path)
+        types = list(self.spec.file_types)
+        weights = [self.spec.file_types[file_type] for file_type in types]
+
+        payload: Dict[str, bytes] = {}
+        content_files = []
+        for n in range(1, self.spec.files_per_bag + 1):
+            file_type = rng.choices(types, weights)[0]
+            dsid = f"FILE{n}.{file_type}"
+            content = self._content(file_type, rng.randint(self.spec.min_file_size, self.spec.max_file_size), rng)
+            payload[f"data/content/{dsid}"] = content
+            content_files.append({
+                "dsid": dsid,
+                "mimetype": self.TEXT_TYPES.get(file_type) or self.BINARY_TYPES[file_type],
+                "title": dsid,
+                "description": f"Datastream for {dsid}",
+                "size": len(content),
+                "bagpath": f"data/content/{dsid}",
+                "lang": [],
+                "tags": [],
+            })
+
+        sip = {
+            "title": f"Synthetic object {index}",
+            "project": project_abbr,
+            "recid": recid,
+            "objectType": "RDF",
+            "created_by": "pyrilo benchmarks",
+            "mainResource": content_files[0]["dsid"],
+            "contentFiles": content_files,
+            "lang": [],
+            "tags": ["synthetic"],
+        }
+        payload["data/meta/sip.json"] = json.dumps(sip, indent=2).encode("utf-8")
+
+        for relative_path, content in payload.items():
+            self._write(bag_path, relative_path, content)
+
+        payload_bytes = sum(len(content) for content in payload.values())
+        self._write(bag_path, "bagit.txt", b"BagIt-Version: 1.0\nTag-File-Character-Encoding: UTF-8\n")
+        self._write(bag_path, "bag-info.txt", (
+            "Bagging-Date: 2025-12-05\n"
+            f"Payload-Oxum: {payload_bytes}.{len(payload)}\n"
+            f"External-Description: Synthetic object {index}\n"
+        ).encode("utf-8"))
+        for algorithm in ["md5", "sha512"]:
+            lines = [f"{hashlib.new(algorithm, content).hexdigest()} {relative_path}\n"
+                     for relative_path, content in sorted(payload.items())]
+            self._write(bag_path, f"manifest-{algorithm}.txt", "".join(lines).encode("utf-8"))
+        return payload_bytes
+
+    def _content(self, file_type: str, size: int, rng: random.Random) -> bytes:
+        if file_type in self.BINARY_TYPES:
+            return rng.randbytes(size)
+
+        # text of repeating words compresses like real XML / JSON datastreams
+        words = []
+        length = 0
+        while length < size:
+            word = rng.choice(self.WORDS)
+            words.append(word)
+            length += len(word) + 1
+        return " ".join(words).encode("ascii")[:size]
+
+    @staticmethod
+    def _write(bag_path: str, relative_path: str, content: bytes) -> None:
+        path = os.path.join(bag_path, *relative_path.split("/"))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(content)
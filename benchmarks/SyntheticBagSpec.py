@@ -0,0 +1,45 @@
+from dataclasses import dataclass, field
+from typing import Dict
+
+
+@dataclass
+class SyntheticBagSpec:
+    """
+    Shape of the generated bags.
+    """
+
+    count: int = 100
+    """
+    Number of bags.
+    """
+
+    min_file_size: int = 1024
+    """
+    Lower bound of the size in bytes of a single content file.
+    """
+
+    max_file_size: int = 64 * 1024
+    """
+    Upper bound of the size in bytes of a single content file.
+    """
+
+    file_types: Dict[str, int] = field(default_factory=lambda: {"xml": 2, "json": 1})
+    """
+    Content file extensions and their weight, e.g. {"xml": 2, "json": 1, "jpg": 1}. Text types are
+    compressible, binary types (jpg, png, tif, mp3, mp4, pdf) are random bytes.
+    """
+
+    files_per_bag: int = 3
+    """
+    Number of content files of every bag.
+    """
+
+    nesting_depth: int = 0
+    """
+    Number of folders between the bag root and the bags (0 puts all bags directly below the bag root).
+    """
+
+    seed: int = 1
+    """
+    Seed of the random generator, the same spec always produces the same bags.
+    """
@@ -0,0 +1,234 @@
+"""
+End-to-end throughput benchmark of pyrilo against an in-process stand-in of GAMS5.
+
+Generates synthetic bags, then runs the real Pyrilo.ingest_bags (into an empty project and again
+over the existing objects), list_objects and delete_objects and reports bags/s, MB/s, p50 / p99
+per-bag latency and peak RSS as JSON.
+
+Run from the repository root:
+
+    python -m benchmarks.ingest_benchmark --bags 200 --workers 4 --output results.json
+"""
+import json
+import logging
+import math
+import os
+import platform
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+import click
+
+from benchmarks.SyntheticBagGenerator import SyntheticBagGenerator
+from benchmarks.SyntheticBagSpec import SyntheticBagSpec
+from pyrilo.Pyrilo import Pyrilo
+from pyrilo.cli import bootstrap_application
+from pyrilo.infrastructure.RunProfiler import RunProfiler
+from tests.utils.FakeGamsServer import FakeGamsServer
+from tests.utils.FaultRule import FaultRule
+from tests.utils.LatencyDistribution import LatencyDistribution
+
+PROJECT = "demo"
+MB = 1000 * 1000
+
+
+def percentile(values: List[float], fraction: float) -> Optional[float]:
+    """
+    Nearest-rank percentile, None for no values.
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(fraction * len(ordered)))
+    return ordered[rank - 1]
+
+
+def peak_rss_bytes() -> Dict[str, Optional[int]]:
+    """
+    Peak resident set size of this process and of its (finished) child processes e.g. the packing workers.
+    """
+    try:
+        import resource
+    except ImportError:
+        # not available on windows
+        return {"self": None, "children": None}
+
+    # kilobytes on linux, bytes on macOS
+    unit = 1 if sys.platform == "darwin" else 1024
+    return {
+        "self": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * unit,
+        "children": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * unit,
+    }
+
+
+def run_benchmark(spec: SyntheticBagSpec,
+                  work_dir: str,
+                  workers: int = 1,
+                  pack_workers: int = 1,
+                  delete_workers: int = None,
+                  page_size: int = 100,
+                  latency: float = 0.0,
+                  bandwidth: int = None,
+                  error_rate: float = 0.0) -> Dict[str, Any]:
+    """
+    Runs all scenarios against a fresh FakeGamsServer and returns the results.
+
+    :param latency: median processing delay of the server in seconds (log-normally distributed)
+    :param bandwidth: bytes per second per connection, None for no limit
+    :param error_rate: share of requests answered with 503 (retried by the client)
+    """
+    bag_root = os.path.join(work_dir, "bags")
+    started_at = time.perf_counter()
+    bags = SyntheticBagGenerator(spec).generate(bag_root, PROJECT)
+    generate_seconds = time.perf_counter() - started_at
+    payload_bytes = sum(size for _, size in bags)
+
+    results: Dict[str, Any] = {
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "parameters": {
+            "bags": spec.count,
+            "files_per_bag": spec.files_per_bag,
+            "min_file_size": spec.min_file_size,
+            "max_file_size": spec.max_file_size,
+            "file_types": spec.file_types,
+            "nesting_depth": spec.nesting_depth,
+            "seed": spec.seed,
+            "workers": workers,
+            "pack_workers": pack_workers,
+            "delete_workers": delete_workers or workers,
+            "page_size": page_size,
+            "latency": latency,
+            "bandwidth": bandwidth,
+            "error_rate": error_rate,
+        },
+        "generate_seconds": generate_seconds,
+        "payload_bytes": payload_bytes,
+        "scenarios": {},
+    }
+
+    server = FakeGamsServer(
+        page_size=page_size,
+        latency=LatencyDistribution.lognormal(latency) if latency else None,
+        bandwidth=bandwidth,
+        # the login isn't retried
+        faults=[FaultRule(route=route, status=503, probability=error_rate)
+                for route in FakeGamsServer.ROUTES if route != "auth"] if error_rate else None,
+        seed=spec.seed
+    )
+    with server:
+        pyrilo_app = bootstrap_application(server.url, bag_root)
+        pyrilo_app.login("benchmark", "benchmark")
+
+        def ingest():
+            pyrilo_app.ingest_bags(PROJECT, pack_workers=pack_workers, workers=workers, delete_workers=delete_workers)
+
+        scenarios = results["scenarios"]
+        # into an empty project, then again: every object exists and is deleted before its upload
+        scenarios["ingest"] = _measure(pyrilo_app, ingest, len(bags), payload_bytes)
+        scenarios["reingest"] = _measure(pyrilo_app, ingest, len(bags), payload_bytes)
+
+        object_ids: List[str] = []
+        scenarios["list_objects"] = _measure(
+            pyrilo_app, lambda: object_ids.extend(pyrilo_app.list_objects(PROJECT)), len(bags)
+        )
+        if len(object_ids) != len(bags):
+            raise RuntimeError(f"Listed {len(object_ids)} objects, expected {len(bags)}")
+
+        scenarios["delete_objects"] = _measure(
+            pyrilo_app, lambda: pyrilo_app.delete_objects(PROJECT, workers=delete_workers or workers), len(bags)
+        )
+        if server.objects(PROJECT):
+            raise RuntimeError(f"{len(server.objects(PROJECT))} objects were not deleted")
+
+    results["peak_rss_bytes"] = peak_rss_bytes()
+    return results
+
+
+def _measure(pyrilo_app: Pyrilo, run, items: int, payload_bytes: int = None) -> Dict[str, Any]:
+    # spans only, no cProfile / tracemalloc overhead
+    profiler = RunProfiler()
+    pyrilo_app.use_profiler(profiler)
+    started_at = time.perf_counter()
+    run()
+    seconds = time.perf_counter() - started_at
+    pyrilo_app.use_profiler(None)
+
+    latencies = list(profiler.bag_durations().values())
+    result = {
+        "seconds": seconds,
+        "items": items,
+        "items_per_second": items / seconds,
+        "latency_p50_seconds": percentile(latencies, 0.5),
+        "latency_p99_seconds": percentile(latencies, 0.99),
+    }
+    if payload_bytes is not None:
+        result["mb_per_second"] = payload_bytes / MB / seconds
+    return result
+
+
+@click.command()
+@click.option("--bags", default=100, show_default=True, type=click.IntRange(min=1), help="Number of synthetic bags")
+@click.option("--files-per-bag", default=3, show_default=True, type=click.IntRange(min=1))
+@click.option("--min-file-size", default=1024, show_default=True, type=click.IntRange(min=0), help="Bytes")
+@click.option("--max-file-size", default=64 * 1024, show_default=True, type=click.IntRange(min=0), help="Bytes")
+@click.option("--file-types", default="xml=2,json=1", show_default=True,
+              help="Content file types and their weights, e.g. xml=2,json=1,jpg=1")
+@click.option("--nesting-depth", default=0, show_default=True, type=click.IntRange(min=0),
+              help="Folder levels between the bag root and the bags")
+@click.option("--seed", default=1, show_default=True, type=int)
+@click.option("--workers", default=1, show_default=True, type=click.IntRange(min=1))
+@click.option("--pack-workers", default=1, show_default=True, type=click.IntRange(min=1))
+@click.option("--delete-workers", default=None, type=click.IntRange(min=1), help="Defaults to --workers")
+@click.option("--page-size", default=100, show_default=True, type=click.IntRange(min=1),
+              help="Object ids per page of the listing")
+@click.option("--latency", default=0.0, show_default=True, type=click.FloatRange(min=0),
+              help="Median processing delay of the server in seconds (log-normally distributed)")
+@click.option("--bandwidth", default=None, type=click.IntRange(min=1),
+              help="Bytes per second per connection to the server. Defaults to no limit")
+@click.option("--error-rate", default=0.0, show_default=True, type=click.FloatRange(0, 1),
+              help="Share of requests the server answers with 503")
+@click.option("--work-dir", default=None, type=click.Path(file_okay=False),
+              help="Folder for the generated bags. Defaults to a temporary folder removed afterwards")
+@click.option("--output", default=None, type=click.Path(dir_okay=False), help="Write the results to this JSON file")
+def main(bags: int, files_per_bag: int, min_file_size: int, max_file_size: int, file_types: str, nesting_depth: int,
+         seed: int, workers: int, pack_workers: int, delete_workers: int, page_size: int, latency: float, bandwidth: int, error_rate: float, work_dir: str, output: str):
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
+    try:
+        weights = {name.strip(): int(weight) for name, weight in
+                   (entry.split("=") for entry in file_types.split(","))}
+    except ValueError:
+        raise click.BadParameter(f"expected type=weight pairs, got '{file_types}'", param_hint="--file-types")
+
+    spec = SyntheticBagSpec(
+        count=bags,
+        min_file_size=min_file_size,
+        max_file_size=max(min_file_size, max_file_size),
+        file_types=weights,
+        files_per_bag=files_per_bag,
+        nesting_depth=nesting_depth,
+        seed=seed
+    )
+
+    options = dict(workers=workers, pack_workers=pack_workers, delete_workers=delete_workers, page_size=page_size,
+                   latency=latency, bandwidth=bandwidth, error_rate=error_rate)
+    if work_dir:
+        results = run_benchmark(spec, work_dir, **options)
+    else:
+        with tempfile.TemporaryDirectory(prefix="pyrilo-benchmark-") as tmp_dir:
+            results = run_benchmark(spec, tmp_dir, **options)
+
+    text = json.dumps(results, indent=2)
+    if output:
+        with open(output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    click.echo(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,29 @@
 import logging
 import os
-from typing import List, Optional
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional, Sequence, Set
 from pyrilo.api.DigitalObject.DigitalObjectService import DigitalObjectService
 from pyrilo.api.GamsApiClient import GamsApiClient
+from pyrilo.app.BulkDeleteEngine import BulkDeleteEngine
+from pyrilo.app.BulkDeleteReport import BulkDeleteReport
+from pyrilo.app.IngestPipeline import IngestPipeline
 from pyrilo.app.IngestService import IngestService
 from pyrilo.app.IntegrationService import IntegrationService
+from pyrilo.app.PackagingService import PackagingService
+from pyrilo.app.SyncReport import SyncReport
 from pyrilo.api.Project.ProjectService import ProjectService
 from pyrilo.api.auth.AuthorizationService import AuthorizationService
-from pyrilo.exceptions import PyriloConflictError, PyriloNetworkError
+from pyrilo.exceptions import PyriloConflictError, PyriloError, PyriloNetworkError, PyriloValidationError
+from pyrilo.infrastructure.AdaptiveConcurrencyLimiter import AdaptiveConcurrencyLimiter
+from pyrilo.infrastructure.BagCatalog import BagCatalog
+from pyrilo.infrastructure.BagEntry import BagEntry
+from pyrilo.infrastructure.BagValidationResult import BagValidationResult
+from pyrilo.infrastructure.BagValidator import BagValidator
+from pyrilo.infrastructure.IngestJournal import IngestJournal
+from pyrilo.infrastructure.IngestStateStore import IngestStateStore
+from pyrilo.infrastructure.PackageCache import PackageCache
+from pyrilo.infrastructure.RunProfiler import RunProfiler
 
 
 class Pyrilo:
@@ -28,6 +44,12 @@ class Pyrilo:
     integration_service: IntegrationService
     authorization_service: AuthorizationService
     project_service: ProjectService
+    packaging_service: Optional[PackagingService]
+    bag_catalog: Optional[BagCatalog]
+    ingest_state_store: Optional[IngestStateStore]
+    ingest_journal: Optional[IngestJournal]
+    bag_validator: Optional[BagValidator]
+    profiler: Optional[RunProfiler]
 
     def __init__(self,
                  local_bagit_files_path: str,
@@ -35,16 +57,30 @@ class Pyrilo:
                  digital_object_service: DigitalObjectService,
                  ingest_service: IngestService,
                  integration_service: IntegrationService,
-                 project_service: ProjectService
+                 project_service: ProjectService,
+                 packaging_service: PackagingService = None,
+                 bag_catalog: BagCatalog = None,
+                 ingest_state_store: IngestStateStore = None,
+                 ingest_journal: IngestJournal = None,
+                 bag_validator: BagValidator = None,
+                 client: GamsApiClient = None,
+                 profiler: RunProfiler = None
                  ) -> None:
 
         self.local_bagit_files_path = local_bagit_files_path
+        self.client = client
 
         self.authorization_service = authorization_service
         self.digital_object_service = digital_object_service
         self.ingest_service = ingest_service
         self.integration_service = integration_service
         self.project_service = project_service
+        self.packaging_service = packaging_service
+        self.bag_catalog = bag_catalog
+        self.ingest_state_store = ingest_state_store
+        self.ingest_journal = ingest_journal
+        self.bag_validator = bag_validator
+        self.profiler = profiler
 
     def login(self, username: str = None, password: str = None):
         """
@@ -60,6 +96,12 @@ class Pyrilo:
 
         return self.digital_object_service.list_objects(project_abbr)
 
+    def iter_objects(self, project_abbr: str) -> Iterator[str]:
+        """
+        Yields the ids of all objects of defined project while the listing pages in.
+        """
+        return self.digital_object_service.iter_objects(project_abbr)
+
     def save_object(self, id: str, project_abbr: str):
         """
         Creates a digital object
@@ -79,48 +121,218 @@ class Pyrilo:
 
         return self.digital_object_service.delete_object(id, project_abbr)
 
-    def delete_objects(self, project_abbr: str):
-        """
-        Deletes all digital objects of a project
-        """
-        project_objects = self.list_objects(project_abbr)
-        logging.info(f"Deleting now {len(project_objects)} objects for project {project_abbr}")
-        for obj in project_objects:
-            self.delete_object(obj, project_abbr)
-
-    def ingest_bag(self, project_abbr: str, sip_folder_name: str):
+    def delete_objects(self,
+                       project_abbr: str,
+                       workers: int = 1,
+                       adaptive: bool = False,
+                       failure_report: str = None,
+                       disintegrate: Sequence[str] = ()) -> BulkDeleteReport:
+        """
+        Deletes all digital objects of a project, up to `workers` at once, while their ids page in
+        (see BulkDeleteEngine). Failing deletes don't abort the run, they are raised together at the end
+        (and written to failure_report, if given). With adaptive, workers is the upper bound of
+        concurrent deletes, the actual number follows what the server sustains.
+        Deleted objects are disintegrated from the integration targets in disintegrate (see
+        IntegrationService.TARGETS), a failing disintegration counts as failed delete.
+        """
+        logging.info(f"Deleting all objects of project {project_abbr} ...")
+        # delete threads plus the prefetching listing
+        self._ensure_connections(workers + 1)
+        engine = BulkDeleteEngine(
+            self.digital_object_service,
+            workers=workers,
+            limiter=AdaptiveConcurrencyLimiter(workers, name="deletes") if adaptive else None,
+            profiler=self.profiler,
+            integration_service=self.integration_service,
+            disintegrate_targets=disintegrate
+        )
+        report = engine.run(project_abbr)
+
+        if failure_report:
+            report.write(failure_report)
+        if report.failed:
+            raise RuntimeError(f"Deleting objects completed with {len(report.failed)} errors: {sorted(report.failed)}")
+        return report
+
+    def ingest_bag(self,
+                   project_abbr: str,
+                   sip_folder_name: str,
+                   archive_path: str = None,
+                   existing_ids: Optional[Set[str]] = None):
         """
         Ingests defined folder from the local SIP structure.
+        sip_folder_name is relative to the bag root and may point to a nested bag folder, its last
+        segment is the object id.
+        If archive_path is given, the already packaged archive is uploaded instead of zipping the folder.
+        If existing_ids (the object inventory of the project) is given, it decides whether the object
+        has to be deleted first, instead of a HEAD request per object.
+        If a bag validator is configured, the bag is validated before the existing object is deleted.
         """
-        if self.digital_object_service.object_exists(sip_folder_name, project_abbr):
-            self.delete_object(sip_folder_name, project_abbr)
-            logging.info(f"Successfully deleted existing object: {sip_folder_name} for ingest")
+        object_id = os.path.basename(sip_folder_name)
+        if self.bag_validator:
+            result = self.bag_validator.validate(os.path.join(self.local_bagit_files_path, sip_folder_name))
+            if not result.valid:
+                raise PyriloValidationError(f"Bag {sip_folder_name} is invalid: {'; '.join(result.errors)}", result.errors)
 
+        if existing_ids is not None:
+            exists = object_id in existing_ids
+        else:
+            exists = self.digital_object_service.object_exists(object_id, project_abbr)
 
-        self.ingest_service.ingest_bag(project_abbr, sip_folder_name)
+        if exists:
+            self.delete_object(object_id, project_abbr)
+            logging.info(f"Successfully deleted existing object: {object_id} for ingest")
 
-    def ingest_bags(self, project_abbr: str):
+        if archive_path:
+            self.ingest_service.ingest_archive(project_abbr, archive_path)
+        else:
+            self.ingest_service.ingest_bag(project_abbr, sip_folder_name)
+        self.digital_object_service.note_object_created(object_id, project_abbr)
+
+    def use_package_cache(self, package_cache: PackageCache):
         """
-        Ingests all bags from the local bag structure.
+        Reuses archives of unchanged bags from given package cache instead of zipping them again.
         """
+        self.ingest_service.package_cache = package_cache
+        if self.packaging_service:
+            self.packaging_service.package_cache = package_cache
 
+    def discover_bags(self, project_abbr: str) -> List[BagEntry]:
+        """
+        Lists all bags of the project (bag folder name starting with the project abbreviation)
+        at any depth of the local bag structure.
+        """
         if not self.local_bagit_files_path:
             raise ValueError("Local bag path is not configured.")
 
-        failures = []
+        bag_catalog = self.bag_catalog or BagCatalog(self.local_bagit_files_path)
+        bags = [bag for bag in bag_catalog.scan() if bag.name.startswith(project_abbr)]
+        logging.info(f"Discovered {len(bags)} bags for project {project_abbr}")
+        return bags
 
-        for folder_name in os.listdir(self.local_bagit_files_path):
-            # Basic filter (you might want to improve this)
-            if not folder_name.startswith(project_abbr):
-                continue
+    def use_ingest_state_store(self, ingest_state_store: IngestStateStore):
+        """
+        Records successfully ingested bags in given state store (required for changed_only ingests).
+        """
+        self.ingest_state_store = ingest_state_store
 
-            try:
-                logging.info(f"Starting ingest for: {folder_name}")
-                self.ingest_bag(project_abbr, folder_name)
-                logging.info(f"Successfully ingested: {folder_name}")
-            except Exception as e:
-                logging.error(f"FAILED to ingest {folder_name}: {e}")
-                failures.append(folder_name)
+    def use_bag_validator(self, bag_validator: BagValidator):
+        """
+        Validates bags locally before ingesting them, invalid bags are rejected before any request is made.
+        """
+        self.bag_validator = bag_validator
+
+    def validate_bags(self, project_abbr: str) -> List[BagValidationResult]:
+        """
+        Validates all bags of the project locally (BagIt structure, Payload-Oxum, manifest checksums
+        and sip.json), without contacting the API.
+        """
+        bag_validator = self.bag_validator or BagValidator()
+        bags = self.discover_bags(project_abbr)
+        results = []
+        for result in bag_validator.validate_many(
+                os.path.join(self.local_bagit_files_path, bag.relative_path) for bag in bags):
+            if not result.valid:
+                logging.error(f"Bag {result.bag_path} is invalid: {'; '.join(result.errors)}")
+            results.append(result)
+        if bag_validator is not self.bag_validator:
+            bag_validator.close()
+        return results
+
+    def use_ingest_journal(self, ingest_journal: IngestJournal):
+        """
+        Records the per-bag progress of ingest runs in given journal (required to resume ingests).
+        """
+        self.ingest_journal = ingest_journal
+
+    def use_profiler(self, profiler: RunProfiler):
+        """
+        Attributes wall time and memory of ingests and deletes to their stages and bags in given profiler.
+        """
+        self.profiler = profiler
+
+    def ingest_bags(self,
+                    project_abbr: str,
+                    pack_workers: int = 1,
+                    workers: int = 1,
+                    changed_only: bool = False,
+                    delete_workers: int = None,
+                    queue_size: int = None,
+                    resume: bool = False,
+                    retry_failed: bool = False,
+                    adaptive: bool = False,
+                    integrate: Sequence[str] = (),
+                    integrate_workers: int = 4):
+        """
+        Ingests all bags from the local bag structure.
+
+        Bags pass the stages of the IngestPipeline (discover, verify, package, delete-existing, upload),
+        each running concurrently with its own worker count:
+        - pack_workers bags are zipped at once (> 1 uses a pool of worker processes)
+        - delete_workers (defaults to workers) existing objects are deleted at once
+        - workers bags are uploaded at once
+        With changed_only, bags that didn't change since their last successful ingest (according to the
+        ingest state store) are skipped.
+        With adaptive, delete_workers and workers are upper bounds: the number of concurrent deletes and
+        uploads follows what the server sustains (see AdaptiveConcurrencyLimiter).
+        With integrate targets (see IntegrationService.TARGETS), every uploaded object is integrated into
+        them by up to integrate_workers concurrent calls, so reindexing scales with the ingested bags
+        instead of the size of the project.
+
+        Progress is recorded in the ingest journal (if configured). With resume, the last run continues
+        where it stopped (bags already uploaded are skipped), with retry_failed only the bags that failed
+        in the last run are processed. Without either, a new run is started in the journal.
+        """
+        if not self.local_bagit_files_path:
+            raise ValueError("Local bag path is not configured.")
+
+        if (resume or retry_failed) and not self.ingest_journal:
+            raise ValueError("Resuming an ingest requires a configured ingest journal.")
+
+        # bags to leave out (resume) or to restrict the run to (retry_failed)
+        excluded: Set[str] = set()
+        selected: Optional[Set[str]] = None
+        if resume:
+            # everything not uploaded yet, including failed bags
+            excluded = self.ingest_journal.bags_in_state(project_abbr, {IngestJournal.UPLOADED})
+            logging.info(f"Resuming ingest, skipping {len(excluded)} already uploaded bags")
+        elif retry_failed:
+            selected = self.ingest_journal.bags_in_state(project_abbr, {IngestJournal.FAILED})
+            logging.info(f"Retrying {len(selected)} failed bags of the last ingest run")
+        elif self.ingest_journal:
+            self.ingest_journal.start_run(project_abbr)
+
+        def discover() -> List[BagEntry]:
+            return [
+                bag for bag in self.discover_bags(project_abbr)
+                if bag.relative_path not in excluded and (selected is None or bag.relative_path in selected)
+            ]
+
+        pipeline = IngestPipeline(
+            project_abbr,
+            self.local_bagit_files_path,
+            digital_object_service=self.digital_object_service,
+            ingest_service=self.ingest_service,
+            packaging_service=self.packaging_service or PackagingService(self.ingest_service.file_system),
+            integration_service=self.integration_service,
+            ingest_state_store=self.ingest_state_store,
+            journal=self.ingest_journal,
+            validator=self.bag_validator,
+            changed_only=changed_only,
+            pack_workers=pack_workers,
+            delete_workers=delete_workers or workers,
+            upload_workers=workers,
+            integrate_workers=integrate_workers,
+            integrate_targets=integrate,
+            queue_size=queue_size,
+            delete_limiter=AdaptiveConcurrencyLimiter(delete_workers or workers, name="deletes") if adaptive else None,
+            upload_limiter=AdaptiveConcurrencyLimiter(workers, name="uploads") if adaptive else None,
+            profiler=self.profiler
+        )
+
+        # upload, delete and integrate threads plus the inventory listing
+        self._ensure_connections(workers + (delete_workers or workers) + (integrate_workers if integrate else 0) + 1)
+        failures = pipeline.run(discover)
 
         # Critical: If there were failures, we should probably let the caller know
         if failures:
@@ -174,6 +386,40 @@ class Pyrilo:
         """
         return self.integration_service.disintegrate_all_plexus_search(project_abbr)
 
+    def sync_all(self,
+                 project_abbr: str,
+                 targets: Sequence[str] = IntegrationService.TARGETS,
+                 remove: bool = False,
+                 timeouts: Dict[str, float] = None) -> SyncReport:
+        """
+        Integrates (or with remove, disintegrates) all objects of a project into all given targets (see
+        IntegrationService.TARGETS) at once, one concurrent call per target within the current session.
+        timeouts are the seconds to wait per target, the defaults of IntegrationService otherwise.
+
+        A failing target doesn't abort the others, the returned report lists the outcome per target.
+        """
+        timeouts = timeouts or {}
+        report = SyncReport(project_abbr, remove=remove, targets=list(targets))
+
+        def sync_target(target: str):
+            started_at = time.perf_counter()
+            try:
+                if remove:
+                    self.integration_service.disintegrate_project(project_abbr, target, timeouts.get(target))
+                else:
+                    self.integration_service.integrate_project(project_abbr, target, timeouts.get(target))
+            except PyriloError as e:
+                logging.error(f"FAILED to sync project {project_abbr} with {target}: {e}")
+                report.failed[target] = str(e)
+            finally:
+                report.seconds[target] = time.perf_counter() - started_at
+
+        self._ensure_connections(len(report.targets))
+        with ThreadPoolExecutor(max_workers=max(len(report.targets), 1), thread_name_prefix="pyrilo-sync") as executor:
+            for future in [executor.submit(sync_target, target) for target in report.targets]:
+                future.result()
+        return report
+
     def ingest(self, project_abbr: str):
         """
         Performs a complete ingest operation based on the defined SIP folders.
@@ -221,3 +467,11 @@ class Pyrilo:
             # Do NOT catch this silently. If the network is down, the user must know.
             # We let it bubble up, or re-raise with context.
             raise
+
+    def _ensure_connections(self, max_connections: int):
+        """
+        Sizes the connection pool of the client for given number of concurrent requests, so that
+        every worker thread reuses its connection.
+        """
+        if self.client:
+            self.client.ensure_pool_size(max_connections)
@@ -7,5 +7,8 @@ class PyriloStatics:
     API_ROOT = "/api/v1"
     AUTH_ENDPOINT = API_ROOT + "/auth"
 
+    # bag archives up to this size are kept in memory during ingest, larger ones are spooled to disk
+    INGEST_SPOOL_THRESHOLD = 64 * 1024 * 1024
+
     def __init__(self) -> None:
         pass
\ No newline at end of file
@@ -0,0 +1,99 @@
+import logging
+
+from pyrilo.PyriloStatics import PyriloStatics
+from pyrilo.api.GamsApiClient import GamsApiClient, raise_for_api_status
+from pyrilo.exceptions import PyriloConfigurationError, PyriloNetworkError
+
+try:
+    import httpx
+except ImportError:  # optional dependency, installed via the 'async' extra
+    httpx = None
+
+
+class AsyncGamsApiClient:
+    """
+    asyncio counterpart of GamsApiClient. Owns an httpx.AsyncClient, so a single event loop can keep
+    many requests in flight over a shared connection pool (no thread per request).
+
+    Raises the same Pyrilo exceptions as GamsApiClient. Authentication is done with the synchronous
+    client, use from_client to take over its session cookies.
+    """
+    session: "httpx.AsyncClient"
+    host: str
+    api_base_url: str
+
+    def __init__(self, host: str, max_connections: int = 100, cookies=None):
+        if httpx is None:
+            raise PyriloConfigurationError("The async client requires httpx. Install it via 'pip install pyrilo[async]'.")
+
+        self.host = host.rstrip("/")
+        self.api_base_url = f"{self.host}{PyriloStatics.API_ROOT}"
+
+        self.session = httpx.AsyncClient(
+            headers={
+                "User-Agent": "Pyrilo (Research Software)",
+                "Accept": "application/json"
+            },
+            cookies=cookies,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            follow_redirects=True
+        )
+
+    @classmethod
+    def from_client(cls, client: GamsApiClient, max_connections: int = 100) -> "AsyncGamsApiClient":
+        """
+        Creates an async client for the host of given (already authenticated) client, sharing its session cookies.
+        """
+        cookies = httpx.Cookies() if httpx else None
+        if cookies is not None:
+            for cookie in client.session.cookies:
+                cookies.set(cookie.name, cookie.value, domain=cookie.domain, path=cookie.path)
+        return cls(client.host, max_connections=max_connections, cookies=cookies)
+
+    async def get(self, endpoint: str, **kwargs) -> "httpx.Response":
+        return await self._request("GET", endpoint, **kwargs)
+
+    async def post(self, endpoint: str, **kwargs) -> "httpx.Response":
+        return await self._request("POST", endpoint, **kwargs)
+
+    async def put(self, endpoint: str, **kwargs) -> "httpx.Response":
+        return await self._request("PUT", endpoint, **kwargs)
+
+    async def patch(self, endpoint: str, **kwargs) -> "httpx.Response":
+        return await self._request("PATCH", endpoint, **kwargs)
+
+    async def delete(self, endpoint: str, **kwargs) -> "httpx.Response":
+        return await self._request("DELETE", endpoint, **kwargs)
+
+    async def head(self, endpoint: str, **kwargs) -> "httpx.Response":
+        return await self._request("HEAD", endpoint, **kwargs)
+
+    async def close(self):
+        await self.session.aclose()
+
+    async def __aenter__(self) -> "AsyncGamsApiClient":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def _request(self, method: str, endpoint: str, raise_errors: bool = True, **kwargs) -> "httpx.Response":
+        if endpoint.startswith("http://") or endpoint.startswith("https://"):
+            url = endpoint
+        else:
+            url = f"{self.api_base_url}/{endpoint.lstrip('/')}"
+
+        logging.debug(f"Requesting {method} {url} ...")
+
+        try:
+            response = await self.session.request(method, url, **kwargs)
+        except httpx.HTTPError as e:
+            # Context: This is a low-level network failure (DNS, Timeout)
+            msg = f"Network failure connecting to {url}: {e}"
+            logging.error(msg)
+            raise PyriloNetworkError(msg) from e
+
+        if raise_errors and response.status_code >= 400:
+            raise_for_api_status(response.status_code, str(response.url), response.text)
+
+        return response
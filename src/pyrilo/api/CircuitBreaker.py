@@ -0,0 +1,122 @@
+import collections
+import logging
+import threading
+import time
+from typing import Deque
+
+from pyrilo.exceptions import PyriloCircuitOpenError
+
+
+class CircuitBreaker:
+    """
+    Pauses all requests of a client while the server is failing, instead of letting every
+    queued request (e.g. thousands of bags) fail on its own.
+
+    - closed: requests pass, outcomes are tracked over the last `window` requests
+    - open: the error rate exceeded `failure_threshold`, requests wait for `open_duration`
+    - half open: a single probe request is let through, the others keep waiting; a successful probe
+      closes the circuit, a failed one opens it again with a doubled duration (up to
+      `max_open_duration`)
+
+    If the server doesn't recover within `max_pause` seconds, waiting requests fail with
+    PyriloCircuitOpenError.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self,
+                 failure_threshold: float = 0.5,
+                 window: int = 20,
+                 min_requests: int = 10,
+                 open_duration: float = 5.0,
+                 max_open_duration: float = 60.0,
+                 max_pause: float = 900.0) -> None:
+        self.failure_threshold = failure_threshold
+        self.window = window
+        self.min_requests = min_requests
+        self.open_duration = open_duration
+        self.max_open_duration = max_open_duration
+        self.max_pause = max_pause
+
+        self.state = self.CLOSED
+        self._outcomes: Deque[bool] = collections.deque(maxlen=window)
+        self._current_open_duration = open_duration
+        self._opened_at = 0.0
+        self._paused_since = None
+        self._probe_in_flight = False
+        self._condition = threading.Condition()
+
+    def before_request(self) -> None:
+        """
+        Blocks while the circuit is open. Raises PyriloCircuitOpenError once the server stayed
+        unavailable for longer than max_pause.
+        """
+        with self._condition:
+            while True:
+                if self.state == self.CLOSED:
+                    return
+
+                now = time.monotonic()
+                if now - self._paused_since > self.max_pause:
+                    raise PyriloCircuitOpenError(
+                        f"Server still unavailable after a pause of {self.max_pause:.0f}s, giving up."
+                    )
+
+                if self.state == self.OPEN and now - self._opened_at >= self._current_open_duration:
+                    self.state = self.HALF_OPEN
+                if self.state == self.HALF_OPEN and not self._probe_in_flight:
+                    self._probe_in_flight = True
+                    logging.info("Probing whether the server recovered ...")
+                    return
+
+                remaining = self._opened_at + self._current_open_duration - now
+                self._condition.wait(timeout=max(remaining, 0.1) if self.state == self.OPEN else None)
+
+    def record_success(self) -> None:
+        with self._condition:
+            if self.state == self.OPEN:
+                # late response of a request sent before the circuit opened, only probes decide
+                return
+            if self.state == self.HALF_OPEN:
+                logging.info("Server recovered, resuming requests.")
+                self.state = self.CLOSED
+                self._outcomes.clear()
+                self._current_open_duration = self.open_duration
+                self._paused_since = None
+                self._probe_in_flight = False
+                self._condition.notify_all()
+            self._outcomes.append(True)
+
+    def record_neutral(self) -> None:
+        """
+        Records a request that failed for reasons unrelated to the server (e.g. an invalid url).
+        """
+        with self._condition:
+            if self._probe_in_flight:
+                self._probe_in_flight = False
+                self._condition.notify_all()
+
+    def record_failure(self) -> None:
+        with self._condition:
+            if self.state == self.HALF_OPEN:
+                self._probe_in_flight = False
+                self._current_open_duration = min(self._current_open_duration * 2, self.max_open_duration)
+                self._open()
+                return
+            if self.state == self.OPEN:
+                return
+
+            self._outcomes.append(False)
+            failures = self._outcomes.count(False)
+            if len(self._outcomes) >= self.min_requests and failures / len(self._outcomes) >= self.failure_threshold:
+                logging.warning(f"{failures} of the last {len(self._outcomes)} requests failed, "
+                                f"pausing requests for {self._current_open_duration:.0f}s")
+                self._paused_since = time.monotonic()
+                self._open()
+
+    def _open(self) -> None:
+        self.state = self.OPEN
+        self._opened_at = time.monotonic()
+        self._condition.notify_all()
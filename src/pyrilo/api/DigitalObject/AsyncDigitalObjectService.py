@@ -0,0 +1,65 @@
+import logging
+from typing import List, Dict, Any
+from pyrilo.api.AsyncGamsApiClient import AsyncGamsApiClient
+
+
+class AsyncDigitalObjectService:
+    """
+    asyncio counterpart of DigitalObjectService.
+    """
+    client: AsyncGamsApiClient
+
+    def __init__(self, client: AsyncGamsApiClient) -> None:
+        self.client = client
+
+    async def object_exists(self, id: str, project_abbr: str) -> bool:
+        """
+        Checks if a digital object exists on the gams-api.
+        """
+        r = await self.client.head(
+            f"projects/{project_abbr}/objects/{id}",
+            raise_errors=False
+        )
+        return r.status_code < 400
+
+    async def save_object(self, id: str, project_abbr: str):
+        """
+        Creates digital object for project with given id.
+        """
+        await self.client.put(f"projects/{project_abbr}/objects/{id}")
+        logging.info(f"Successfully created digital object with id {id} for project {project_abbr}.")
+
+    async def list_objects(self, project_abbr: str) -> List[str]:
+        """
+        Retrieves the ids of all digital objects for given project (following the pagination).
+        """
+        object_ids = []
+        page_index = 0
+        while True:
+            r = await self.client.get(
+                f"projects/{project_abbr}/objects/ids",
+                params={"pageIndex": str(page_index)}
+            )
+            paginated_response_object: Dict[str, Any] = r.json()
+            object_ids.extend(paginated_response_object.get("results", []))
+
+            if paginated_response_object.get("pagination", {}).get("hasNext") is not True:
+                logging.info(f"Successfully retrieved digital objects for project {project_abbr}.")
+                return object_ids
+            page_index += 1
+
+    async def assign_child_objects(self, parent_id: str, children_ids: List[str], project_abbr: str):
+        """
+        Assigns child objects to a parent object.
+        """
+        await self.client.patch(
+            f"projects/{project_abbr}/objects/{parent_id}/collect",
+            data={"childObjects": ",".join(children_ids)}
+        )
+        logging.info(f"Successfully assigned child-objects to object {parent_id} for project {project_abbr}.")
+
+    async def delete_object(self, id: str, project_abbr: str):
+        """
+        Deletes a digital object with given id.
+        """
+        await self.client.delete(f"projects/{project_abbr}/objects/{id}")
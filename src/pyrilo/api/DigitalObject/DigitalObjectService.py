@@ -1,16 +1,27 @@
 import logging
-from typing import List, Dict, Any, Optional
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Dict, Any, Iterator, Optional, Set, Tuple
+
+import requests
+
 from pyrilo.api.GamsApiClient import GamsApiClient
+from pyrilo.exceptions import PyriloNotFoundError
+from pyrilo.infrastructure.InventoryCache import InventoryCache
 
 
 class DigitalObjectService:
     """
     Service class for operations on digital objects using GamsApiClient.
+
+    If an inventory cache is configured, the object ids of a project are cached across runs (see
+    inventory) and the creations / deletions made through this service update the cached inventory.
     """
     client: GamsApiClient
+    inventory_cache: Optional[InventoryCache]
 
-    def __init__(self, client: GamsApiClient) -> None:
+    def __init__(self, client: GamsApiClient, inventory_cache: InventoryCache = None) -> None:
         self.client = client
+        self.inventory_cache = inventory_cache
 
     def object_exists(self, id: str, project_abbr: str) -> bool:
         """
@@ -23,6 +34,11 @@ class DigitalObjectService:
             raise_errors=False
         )
 
+        if r.status_code == 404:
+            self._forget_object(id, project_abbr)
+        elif r.status_code < 400:
+            self.note_object_created(id, project_abbr)
+
         if r.status_code >= 400:
             return False
         else:
@@ -34,40 +50,138 @@ class DigitalObjectService:
         Creates digital object for project with given id.
         """
         self.client.put(f"projects/{project_abbr}/objects/{id}")
+        self.note_object_created(id, project_abbr)
         logging.info(f"Successfully created digital object with id {id} for project {project_abbr}.")
 
-    def list_objects(self, project_abbr: str, object_ids: Optional[List[str]] = None, page_index: int = 0):
+    def list_objects(self, project_abbr: str) -> List[str]:
         """
-        Retrieves an overview over all digital objects for given project.
+        Retrieves the ids of all digital objects for given project (following the pagination).
         """
-        if object_ids is None:
-            object_ids = []
-        else:
-            page_index += 1
+        object_ids = list(self.iter_objects(project_abbr))
+        logging.info(f"Successfully retrieved digital objects for project {project_abbr}.")
+        return object_ids
+
+    def inventory(self, project_abbr: str) -> Set[str]:
+        """
+        Returns the ids of all objects of given project, from the inventory cache if possible:
+        - a fresh cached inventory is returned without request
+        - an expired one that fit in a single page is revalidated with a conditional request for that
+          page (If-None-Match / If-Modified-Since with the ETag / Last-Modified the server sent), 304 keeps it
+        - otherwise the whole listing is paged in and cached
+        Without inventory cache, this always lists all objects.
+
+        The ETag / Last-Modified of a page is assumed to validate the page's response body (the ids and
+        the hasNext flag), as HTTP requires, not the whole project. A 304 for the first page therefore
+        only proves an unchanged listing if there were no further pages, so validators are only kept for
+        single page listings and longer listings are paged in again once expired.
+        """
+        if not self.inventory_cache:
+            return set(self.iter_objects(project_abbr))
+
+        cached = self.inventory_cache.load(self.client.host, project_abbr)
+        if self.inventory_cache.is_fresh(cached):
+            logging.info(f"Using cached inventory of {len(cached.object_ids)} objects for project {project_abbr}")
+            return cached.object_ids
+
+        headers = {}
+        if cached and cached.etag:
+            headers["If-None-Match"] = cached.etag
+        if cached and cached.last_modified:
+            headers["If-Modified-Since"] = cached.last_modified
+
+        response = self._request_object_page(project_abbr, 0, headers)
+        if response.status_code == 304 and cached:
+            logging.info(f"Cached inventory of project {project_abbr} is still valid")
+            self.inventory_cache.touch(self.client.host, project_abbr)
+            return cached.object_ids
+
+        object_ids, has_next = self._parse_object_page(response)
+        object_ids = set(object_ids)
+        if has_next:
+            for page in self.iter_object_pages(project_abbr, start_page=1):
+                object_ids.update(page)
+
+        self.inventory_cache.store(
+            self.client.host, project_abbr, object_ids,
+            etag=None if has_next else response.headers.get("ETag"),
+            last_modified=None if has_next else response.headers.get("Last-Modified")
+        )
+        return object_ids
 
-        params = {"pageIndex": str(page_index)}
+    def cached_objects(self, project_abbr: str) -> Optional[Set[str]]:
+        """
+        Returns the cached object ids of given project if they are fresh (no request is made), None otherwise.
+        """
+        if not self.inventory_cache:
+            return None
+        cached = self.inventory_cache.load(self.client.host, project_abbr)
+        return cached.object_ids if self.inventory_cache.is_fresh(cached) else None
+
+    def note_object_created(self, id: str, project_abbr: str):
+        """
+        Records an object created by other means than save_object (e.g. an ingest) in the inventory cache.
+        """
+        if self.inventory_cache:
+            self.inventory_cache.add(self.client.host, project_abbr, id)
 
+    def iter_objects(self, project_abbr: str, prefetch: bool = True) -> Iterator[str]:
+        """
+        Yields the ids of all digital objects for given project page by page, without holding the
+        whole listing in memory (see iter_object_pages).
+        """
+        for page in self.iter_object_pages(project_abbr, prefetch):
+            yield from page
+
+    def iter_object_pages(self, project_abbr: str, prefetch: bool = True, start_page: int = 0) -> Iterator[List[str]]:
+        """
+        Yields the pages of object ids of given project (from start_page on). With prefetch, the next
+        page is requested (on a background thread) while the caller processes the current one.
+
+        The pagination is by page index: objects created or deleted while paging shift the pages,
+        callers modifying the project have to list again (see Pyrilo.delete_objects).
+        """
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pyrilo-list") if prefetch else None
+        try:
+            page_index = start_page
+            page = self._fetch_object_page(project_abbr, page_index)
+            while True:
+                object_ids, has_next = page
+                next_page: Optional[Future] = None
+                if has_next and executor:
+                    next_page = executor.submit(self._fetch_object_page, project_abbr, page_index + 1)
+
+                yield object_ids
+
+                if not has_next:
+                    return
+                page_index += 1
+                page = next_page.result() if next_page else self._fetch_object_page(project_abbr, page_index)
+        finally:
+            if executor:
+                # a prefetch of a listing the caller abandoned finishes in the background
+                executor.shutdown(wait=False, cancel_futures=True)
+
+    def _fetch_object_page(self, project_abbr: str, page_index: int) -> Tuple[List[str], bool]:
+        """
+        Fetches one page of object ids, returns the ids and whether further pages follow.
+        """
+        return self._parse_object_page(self._request_object_page(project_abbr, page_index))
+
+    def _request_object_page(self, project_abbr: str, page_index: int, headers: Dict[str, str] = None) -> requests.Response:
         # The client handles the URL and error checking (>= 400) automatically
         r = self.client.get(
             f"projects/{project_abbr}/objects/ids",
-            params=params
+            params={"pageIndex": str(page_index)},
+            headers=headers
         )
+        logging.debug(f"Successfully GET requested page {page_index} of digital objects for project {project_abbr}.")
+        return r
 
-        logging.debug(f"Successfully GET requested digital objects for project {project_abbr}.")
-
+    @staticmethod
+    def _parse_object_page(r: requests.Response) -> Tuple[List[str], bool]:
         paginated_response_object: Dict[str, Any] = r.json()
-        paginated_id_list = paginated_response_object.get("results", [])
-
-        # Append current page results
-        object_ids.extend(paginated_id_list)
-
-        # Check for recursion
-        if paginated_response_object.get("pagination", {}).get("hasNext") is True:
-            logging.debug("hasNext property in returned pagination is true -> recursing")
-            return self.list_objects(project_abbr, object_ids, page_index)
-        else:
-            logging.info(f"Successfully retrieved digital objects for project {project_abbr}.")
-            return object_ids
+        has_next = paginated_response_object.get("pagination", {}).get("hasNext") is True
+        return paginated_response_object.get("results", []), has_next
 
     def assign_child_objects(self, parent_id: str, children_ids: List[str], project_abbr: str):
         """
@@ -88,4 +202,13 @@ class DigitalObjectService:
         """
         Deletes a digital object with given id.
         """
-        self.client.delete(f"projects/{project_abbr}/objects/{id}")
\ No newline at end of file
+        try:
+            self.client.delete(f"projects/{project_abbr}/objects/{id}")
+        except PyriloNotFoundError:
+            self._forget_object(id, project_abbr)
+            raise
+        self._forget_object(id, project_abbr)
+
+    def _forget_object(self, id: str, project_abbr: str):
+        if self.inventory_cache:
+            self.inventory_cache.remove(self.client.host, project_abbr, id)
\ No newline at end of file
@@ -1,8 +1,19 @@
+import dataclasses
+import json
 import logging
+import threading
+import time
+from typing import Callable, Dict, Optional
+from urllib.parse import urlencode
 
 import requests
 
 from pyrilo.PyriloStatics import PyriloStatics
+from pyrilo.api.CircuitBreaker import CircuitBreaker
+from pyrilo.api.PooledHTTPAdapter import PooledHTTPAdapter
+from pyrilo.api.RetryPolicy import RetryPolicy
+from pyrilo.infrastructure.AdaptiveConcurrencyLimiter import AdaptiveConcurrencyLimiter
+from pyrilo.infrastructure.MetricsRegistry import MetricsRegistry
 from pyrilo.exceptions import PyriloAuthenticationError, PyriloPermissionError, PyriloNotFoundError, \
     PyriloConflictError, PyriloApiError, PyriloNetworkError
 
@@ -10,12 +21,40 @@ from pyrilo.exceptions import PyriloAuthenticationError, PyriloPermissionError,
 class GamsApiClient:
     """
     Owns the HTTP session and handles all low-level API interactions.
+
+    Transient failures (connection errors, timeouts, 429 / 502 / 503 / 504) are retried according
+    to the retry policy of the request method. Requests that are not idempotent are only retried
+    if the caller marks them replay_safe, and then only for failures that prove the server didn't
+    process them (see RetryPolicy.replay_safe). All requests pass the circuit breaker (if configured),
+    which pauses them while the server is failing. Every overloaded attempt (network failure,
+    429 / 503 / 504) is reported to the adaptive concurrency limiter whose slot the calling thread
+    holds, retried attempts included.
+
+    A single session is shared by all threads (e.g. the workers of the ingest pipeline), so they
+    share the authentication cookies and the connection pool. This is thread-safe as used here:
+    headers and adapters are only configured before requests are sent, the cookie jar is locked
+    internally and the urllib3 pools hand out every connection to one thread at a time. The pool
+    size must match the number of concurrent threads (see ensure_pool_size), otherwise
+    connections are not reused.
+
+    If an authenticator is set (see AuthorizationService.login), a request answered with 401 or
+    redirected to the login page is sent again once after a new login. Concurrent requests hitting
+    the expired session trigger a single login.
     """
     session: requests.Session
     host: str
     api_base_url: str
+    retry_policies: Dict[str, RetryPolicy]
+    circuit_breaker: Optional[CircuitBreaker]
+    metrics: Optional[MetricsRegistry]
+    authenticator: Optional[Callable[[], None]]
 
-    def __init__(self, host: str):
+    def __init__(self,
+                 host: str,
+                 retry_policies: Dict[str, RetryPolicy] = None,
+                 circuit_breaker: CircuitBreaker = None,
+                 pool_maxsize: int = 10,
+                 metrics: MetricsRegistry = None):
         # 1. Initialize Session internally
         self.session = requests.Session()
 
@@ -24,10 +63,37 @@ class GamsApiClient:
             "User-Agent": "Pyrilo (Research Software)",
             "Accept": "application/json"
         })
+        self._pool_lock = threading.Lock()
+        self._mount_adapters(pool_maxsize)
 
         self.host = host.rstrip("/")
         self.api_base_url = f"{self.host}{PyriloStatics.API_ROOT}"
 
+        self.retry_policies = retry_policies if retry_policies is not None else RetryPolicy.defaults()
+        self.circuit_breaker = circuit_breaker
+        self.metrics = metrics
+
+        self.authenticator = None
+        self._auth_lock = threading.Lock()
+        self._auth_generation = 0
+
+    @property
+    def pool_maxsize(self) -> int:
+        return self._adapter.pool_maxsize
+
+    def ensure_pool_size(self, max_connections: int):
+        """
+        Grows the connection pool to keep at least max_connections connections to the host.
+        Call before starting the threads that use the client, pooled connections are dropped.
+        """
+        with self._pool_lock:
+            if max_connections <= self._adapter.pool_maxsize:
+                return
+            logging.debug(f"Growing connection pool to {max_connections} connections")
+            previous = self._adapter
+            self._mount_adapters(max_connections)
+            previous.close()
+
     def get(self, endpoint: str, **kwargs) -> requests.Response:
         return self._request("GET", endpoint, **kwargs)
 
@@ -46,45 +112,197 @@ class GamsApiClient:
     def head(self, endpoint: str, **kwargs) -> requests.Response:
         return self._request("HEAD", endpoint, **kwargs)
 
-    def _request(self, method: str, endpoint: str, raise_errors: bool = True, **kwargs) -> requests.Response:
+    def _request(self,
+                 method: str,
+                 endpoint: str,
+                 raise_errors: bool = True,
+                 replay_safe: bool = False,
+                 reauthenticate: bool = True,
+                 retry_timeouts: bool = True,
+                 **kwargs) -> requests.Response:
+        """
+        :param replay_safe: the (non-idempotent) request may be sent again after failures that prove the server
+         didn't process it: failures to connect and 429 / 503 (see RetryPolicy.replay_safe)
+        :param reauthenticate: log in again and repeat the request if the session expired (False for the
+         requests of the login itself)
+        :param retry_timeouts: False to not send the request again after a read timeout (e.g. long running
+         requests the server may still be processing)
+        """
         if endpoint.startswith("http://") or endpoint.startswith("https://"):
             url = endpoint
         else:
             url = f"{self.api_base_url}/{endpoint.lstrip('/')}"
 
-        logging.debug(f"Requesting {method} {url} ...")
+        policy = self._retry_policy(method, replay_safe, kwargs.get("data"))
+        if not retry_timeouts and policy.retry_timeouts:
+            policy = dataclasses.replace(policy, retry_timeouts=False)
+        attempt = 0
+        auth_generation = self._auth_generation
+        while True:
+            attempt += 1
+            if self.circuit_breaker:
+                self.circuit_breaker.before_request()
+
+            logging.debug(f"Requesting {method} {url} ..." + (f" (attempt {attempt})" if attempt > 1 else ""))
 
-        try:
-            response = self.session.request(method, url, **kwargs)
-        except requests.RequestException as e:
-            # Context: This is a low-level network failure (DNS, Timeout)
-            msg = f"Network failure connecting to {url}: {e}"
-            logging.error(msg)
-            raise PyriloNetworkError(msg) from e
+            started_at = time.perf_counter()
+            attempt_started_at = time.monotonic()
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except requests.RequestException as e:
+                self._observe(method, url, None, started_at, kwargs)
+                transient = isinstance(e, (requests.ConnectionError, requests.Timeout))
+                self._record_outcome(failed=transient, neutral=not transient)
+                if transient:
+                    AdaptiveConcurrencyLimiter.report_overload(attempt_started_at)
+                if policy.should_retry_error(e, attempt):
+                    self._wait_before_retry(method, url, attempt, policy, str(e), kwargs.get("data"))
+                    continue
+                # Context: This is a low-level network failure (DNS, Timeout)
+                msg = f"Network failure connecting to {url}: {e}"
+                logging.error(msg)
+                raise PyriloNetworkError(msg) from e
+
+            status_code = response.status_code
+            self._observe(method, url, response, started_at, kwargs)
+            self._record_outcome(failed=status_code >= 500 or status_code == 429)
+            if status_code in AdaptiveConcurrencyLimiter.OVERLOAD_STATUS_CODES:
+                AdaptiveConcurrencyLimiter.report_overload(attempt_started_at)
+            if policy.should_retry_status(status_code, attempt):
+                self._wait_before_retry(method, url, attempt, policy, f"status {status_code}", kwargs.get("data"),
+                                        response.headers.get("Retry-After"))
+                continue
+            if reauthenticate and self.authenticator and self._session_expired(response, kwargs):
+                # the server didn't process the request, it can be sent again once logged in
+                reauthenticate = False
+                if self._reauthenticate(auth_generation, method, url, kwargs.get("data")):
+                    continue
+            break
 
         if raise_errors:
             self._handle_error_status(response)
 
         return response
 
+    def _reauthenticate(self, auth_generation: int, method: str, url: str, data) -> bool:
+        """
+        Logs in again (unless another thread did since the request was sent), returns whether the
+        request can be repeated.
+        """
+        if hasattr(data, "read") and not hasattr(data, "seek"):
+            return False
+        with self._auth_lock:
+            if self._auth_generation == auth_generation:
+                logging.warning(f"Session expired ({method} {url}), logging in again")
+                self.authenticator()
+                self._auth_generation += 1
+        if hasattr(data, "seek"):
+            data.seek(0)
+        return True
+
+    @staticmethod
+    def _session_expired(response: requests.Response, kwargs) -> bool:
+        if response.status_code == 401:
+            return True
+        # redirected to the login form of the identity provider instead of the api response
+        if not response.history or "text/html" not in response.headers.get("Content-Type", ""):
+            return False
+        return bool(kwargs.get("stream")) or 'type="password"' in response.text.lower()
+
+    def _mount_adapters(self, pool_maxsize: int):
+        self._adapter = PooledHTTPAdapter(pool_maxsize=pool_maxsize)
+        self.session.mount("https://", self._adapter)
+        self.session.mount("http://", self._adapter)
+
+    def _retry_policy(self, method: str, replay_safe: bool, data) -> RetryPolicy:
+        policy = self.retry_policies.get(method) or RetryPolicy(max_attempts=1)
+        if replay_safe and policy.max_attempts == 1:
+            idempotent = self.retry_policies.get("GET")
+            policy = RetryPolicy.replay_safe(idempotent.max_attempts if idempotent else 1)
+        # a streamed body can only be sent again if it can be rewound
+        if policy.max_attempts > 1 and data is not None and hasattr(data, "read") and not hasattr(data, "seek"):
+            policy = RetryPolicy(max_attempts=1)
+        return policy
+
+    def _wait_before_retry(self, method: str, url: str, attempt: int, policy: RetryPolicy, reason: str, data,
+                           retry_after: str = None):
+        delay = policy.backoff(attempt, retry_after)
+        logging.warning(f"{method} {url} failed ({reason}), retrying in {delay:.1f}s "
+                        f"(attempt {attempt + 1} of {policy.max_attempts})")
+        time.sleep(delay)
+        if hasattr(data, "seek"):
+            data.seek(0)
+
+    def _observe(self, method: str, url: str, response: Optional[requests.Response], started_at: float, kwargs):
+        if not self.metrics:
+            return
+        received = 0
+        if response is not None and not kwargs.get("stream"):
+            received = _body_size(response.content)
+        self.metrics.observe_request(
+            method,
+            url,
+            response.status_code if response is not None else None,
+            time.perf_counter() - started_at,
+            bytes_sent=_body_size(kwargs.get("data")) + (len(json.dumps(kwargs["json"])) if kwargs.get("json") else 0),
+            bytes_received=received
+        )
+
+    def _record_outcome(self, failed: bool, neutral: bool = False):
+        if not self.circuit_breaker:
+            return
+        if neutral:
+            self.circuit_breaker.record_neutral()
+        elif failed:
+            self.circuit_breaker.record_failure()
+        else:
+            self.circuit_breaker.record_success()
+
     def _handle_error_status(self, response: requests.Response):
         """Maps HTTP status codes to Pyrilo exceptions."""
         if response.status_code < 400:
             return
 
-        code = response.status_code
-        msg = f"API Error {code} for {response.url}: {response.text}"
+        raise_for_api_status(response.status_code, str(response.url), response.text)
 
-        logging.error(msg)
 
-        if code == 401:
-            raise PyriloAuthenticationError(msg, code, response.text)
-        elif code == 403:
-            raise PyriloPermissionError(msg, code, response.text)
-        elif code == 404:
-            raise PyriloNotFoundError(msg, code, response.text)
-        elif code == 409:
-            raise PyriloConflictError(msg, code, response.text)
-        else:
-            # Fallback for 500s or other 4xx
-            raise PyriloApiError(msg, code, response.text)
\ No newline at end of file
+def _body_size(body) -> int:
+    """
+    Size in bytes of a request / response body (streams with a length like MultipartStream included).
+    """
+    if body is None:
+        return 0
+    if isinstance(body, str):
+        return len(body.encode("utf-8"))
+    if isinstance(body, dict):
+        # form fields
+        return len(urlencode(body, doseq=True))
+    try:
+        return len(body)
+    except TypeError:
+        return 0
+
+
+def raise_for_api_status(code: int, url: str, text: str):
+    """
+    Maps HTTP status codes to Pyrilo exceptions.
+    Shared by the synchronous and the asynchronous client, so both raise the same exceptions.
+    """
+    if code < 400:
+        return
+
+    msg = f"API Error {code} for {url}: {text}"
+
+    logging.error(msg)
+
+    if code == 401:
+        raise PyriloAuthenticationError(msg, code, text)
+    elif code == 403:
+        raise PyriloPermissionError(msg, code, text)
+    elif code == 404:
+        raise PyriloNotFoundError(msg, code, text)
+    elif code == 409:
+        raise PyriloConflictError(msg, code, text)
+    else:
+        # Fallback for 500s or other 4xx
+        raise PyriloApiError(msg, code, text)
@@ -0,0 +1,61 @@
+import socket
+from typing import List, Tuple
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """
+    HTTPAdapter with a blocking connection pool of a configurable size and TCP keep-alive.
+
+    - pool_maxsize connections per host are kept open and reused. The pool blocks when all
+      connections are in use, instead of opening extra connections that are thrown away after a
+      single request (a new TCP / TLS handshake each time), so it should be at least as large as
+      the number of threads sending requests.
+    - TCP keep-alive probes keep idle pooled connections alive through NAT / firewalls (and detect
+      dead ones), so a connection idle while a large bag is zipped can still be reused.
+    """
+
+    def __init__(self,
+                 pool_maxsize: int = 10,
+                 pool_connections: int = 4,
+                 keepalive_idle: int = 60,
+                 keepalive_interval: int = 15,
+                 keepalive_count: int = 4) -> None:
+        """
+        :param pool_maxsize: connections kept per host
+        :param pool_connections: number of hosts whose pools are cached (pyrilo talks to a single GAMS5 host)
+        :param keepalive_idle: seconds of idleness before the first keep-alive probe
+        """
+        # init_poolmanager is called by the HTTPAdapter constructor, so this has to be set before
+        self.socket_options = self.keepalive_socket_options(keepalive_idle, keepalive_interval, keepalive_count)
+        super().__init__(pool_connections=pool_connections, pool_maxsize=pool_maxsize, pool_block=True)
+
+    @property
+    def pool_maxsize(self) -> int:
+        return self._pool_maxsize
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs["socket_options"] = self.socket_options
+        super().init_poolmanager(*args, **kwargs)
+
+    def proxy_manager_for(self, proxy, **proxy_kwargs):
+        proxy_kwargs["socket_options"] = self.socket_options
+        return super().proxy_manager_for(proxy, **proxy_kwargs)
+
+    @staticmethod
+    def keepalive_socket_options(idle: int, interval: int, count: int) -> List[Tuple[int, int, int]]:
+        """
+        Default urllib3 socket options (TCP_NODELAY) plus TCP keep-alive, tuned where the platform allows.
+        """
+        options = list(HTTPConnection.default_socket_options) + [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+        # TCP_KEEPIDLE on Linux, TCP_KEEPALIVE on macOS
+        idle_option = getattr(socket, "TCP_KEEPIDLE", None) or getattr(socket, "TCP_KEEPALIVE", None)
+        if idle_option is not None:
+            options.append((socket.IPPROTO_TCP, idle_option, idle))
+        if hasattr(socket, "TCP_KEEPINTVL"):
+            options.append((socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, interval))
+        if hasattr(socket, "TCP_KEEPCNT"):
+            options.append((socket.IPPROTO_TCP, socket.TCP_KEEPCNT, count))
+        return options
@@ -0,0 +1,110 @@
+import random
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, Optional
+
+import requests
+from urllib3.exceptions import NewConnectionError
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    Decides whether a failed request is sent again and how long to wait before.
+    """
+
+    max_attempts: int = 5
+    """
+    Total number of attempts, including the first one (1 disables retries).
+    """
+
+    backoff_base: float = 0.5
+    """
+    Backoff in seconds before the first retry, doubled for every further retry.
+    """
+
+    backoff_max: float = 30.0
+    """
+    Upper bound of a single backoff (and of honored Retry-After headers) in seconds.
+    """
+
+    retry_statuses: FrozenSet[int] = field(default_factory=lambda: frozenset({429, 502, 503, 504}))
+    """
+    Response status codes that are retried (the server did not process the request).
+    """
+
+    retry_timeouts: bool = True
+    """
+    Whether read timeouts are retried. A request that timed out may still have been processed,
+    so this is only safe for idempotent requests.
+    """
+
+    retry_connection_losses: bool = True
+    """
+    Whether connection failures after the connection was established (reset, closed by the server
+    before the response) are retried. The server may have received and processed the request, so
+    this is only safe for idempotent requests. Failures to connect are always retried.
+    """
+
+    def should_retry_error(self, error: requests.RequestException, attempt: int) -> bool:
+        if attempt >= self.max_attempts:
+            return False
+        if self.is_connect_failure(error):
+            # the request never reached the server
+            return True
+        if isinstance(error, requests.ConnectionError):
+            return self.retry_connection_losses
+        return self.retry_timeouts and isinstance(error, requests.Timeout)
+
+    @staticmethod
+    def is_connect_failure(error: requests.RequestException) -> bool:
+        """
+        Tells whether the connection couldn't be established (refused, DNS, connect timeout).
+        """
+        if isinstance(error, requests.ConnectTimeout):
+            return True
+        # requests wraps the urllib3 MaxRetryError, whose reason is the actual failure
+        reason = error.args[0] if error.args else None
+        return isinstance(getattr(reason, "reason", reason), NewConnectionError)
+
+    def should_retry_status(self, status_code: int, attempt: int) -> bool:
+        return attempt < self.max_attempts and status_code in self.retry_statuses
+
+    def backoff(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """
+        Seconds to wait after given (failed) attempt: a Retry-After header (in seconds) if sent by
+        the server, otherwise exponential backoff with full jitter, so that many clients (or worker
+        threads) failing at the same time don't retry in lockstep.
+        """
+        if retry_after:
+            try:
+                return min(max(float(retry_after), 0.0), self.backoff_max)
+            except ValueError:
+                pass  # HTTP date, fall back to the computed backoff
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1)))
+
+    @classmethod
+    def defaults(cls, max_attempts: int = 5) -> Dict[str, "RetryPolicy"]:
+        """
+        Retry policies per HTTP method: idempotent methods are retried, POST and PATCH are not
+        (see replay_safe() for POSTs that may be sent again).
+        """
+        idempotent = cls(max_attempts=max_attempts)
+        no_retry = cls(max_attempts=1)
+        return {
+            "HEAD": idempotent,
+            "GET": idempotent,
+            "PUT": idempotent,
+            "DELETE": idempotent,
+            "POST": no_retry,
+            "PATCH": no_retry,
+        }
+
+    @classmethod
+    def replay_safe(cls, max_attempts: int = 5) -> "RetryPolicy":
+        """
+        Policy for non-idempotent requests that may be replayed if the server certainly didn't
+        process them: failures to connect and 429 / 503. Not after read timeouts, lost connections
+        or 502 / 504, the server (behind a gateway) may still have processed the request.
+        """
+        return cls(max_attempts=max_attempts, retry_statuses=frozenset({429, 503}), retry_timeouts=False,
+                   retry_connection_losses=False)
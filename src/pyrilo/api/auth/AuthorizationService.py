@@ -2,14 +2,37 @@ import logging
 from urllib.parse import urljoin
 from pyrilo.api.GamsApiClient import GamsApiClient  # <--- Changed from requests
 from pyrilo.api.auth.LoginFormParser import LoginFormParser
+from pyrilo.infrastructure.SessionCache import SessionCache
 
 
 class AuthorizationService:
     # 1. Inject the Client, not the Session
-    def __init__(self, client: GamsApiClient):
+    def __init__(self, client: GamsApiClient, session_cache: SessionCache = None):
         self.client = client
+        self.session_cache = session_cache
 
     def login(self, username: str = None, password: str = None) -> None:
+        """
+        Authenticates the shared GamsApiClient: restores the cached session of the user on the host (if a
+        session cache is configured) or performs the login form flow and caches the new session.
+
+        Afterwards, the client logs in again with the same credentials whenever the session expires.
+        """
+        cookies = self.session_cache.load(self.client.host, username) if self.session_cache else None
+        if cookies is not None:
+            self.client.session.cookies.update(cookies)
+            logging.info("Reusing cached session (login skipped).")
+        else:
+            self._login_with_form(username, password)
+
+        self.client.authenticator = lambda: self._reauthenticate(username, password)
+
+    def _reauthenticate(self, username: str, password: str) -> None:
+        # the cookies of the expired session would only get in the way of the login flow
+        self.client.session.cookies.clear()
+        self._login_with_form(username, password)
+
+    def _login_with_form(self, username: str, password: str) -> None:
         """
         Performs authentication using the shared GamsApiClient.
         """
@@ -24,7 +47,7 @@ class AuthorizationService:
 
         # 3. Use client.get()
         # We assume the API returns HTML here, but client.get returns the response object, so that's fine.
-        response = self.client.get("auth", headers=headers)
+        response = self.client.get("auth", headers=headers, reauthenticate=False)
         response.raise_for_status()
 
         # Parsing the keycloak form
@@ -49,7 +72,7 @@ class AuthorizationService:
         payload.update(parser.hidden_inputs)
 
         # 4. Use client.post() with the absolute URL (handled by our client upgrade)
-        post_response = self.client.post(action_url, data=payload, headers=headers)
+        post_response = self.client.post(action_url, data=payload, headers=headers, reauthenticate=False)
 
         # --- VALIDATION LOGIC START ---
 
@@ -66,4 +89,6 @@ class AuthorizationService:
             raise PermissionError("Login failed: Login form detected in response content.")
 
         # --- VALIDATION LOGIC END ---
-        logging.info("Login successful (session cookie established).")
\ No newline at end of file
+        logging.info("Login successful (session cookie established).")
+        if self.session_cache:
+            self.session_cache.store(self.client.host, username, self.client.session.cookies)
\ No newline at end of file
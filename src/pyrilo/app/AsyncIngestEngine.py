@@ -0,0 +1,117 @@
+import asyncio
+import contextlib
+import logging
+from typing import Awaitable, Callable, Iterable, List, Optional
+
+from pyrilo.api.DigitalObject.AsyncDigitalObjectService import AsyncDigitalObjectService
+from pyrilo.app.AsyncIngestService import AsyncIngestService
+from pyrilo.app.AsyncIntegrationService import AsyncIntegrationService
+from pyrilo.infrastructure.AdaptiveConcurrencyLimiter import AdaptiveConcurrencyLimiter
+
+_END = object()
+
+
+class AsyncIngestEngine:
+    """
+    Runs ingest, delete and integration workloads on a single event loop, keeping up to
+    `concurrency` per-object operations in flight.
+
+    Like Pyrilo.ingest_bags, per-object failures don't abort the run: the methods return the
+    ids / folder names that failed. With adaptive, `concurrency` is the upper bound and the number
+    of operations in flight follows what the server sustains (see AdaptiveConcurrencyLimiter).
+    """
+
+    digital_object_service: AsyncDigitalObjectService
+    ingest_service: AsyncIngestService
+    integration_service: AsyncIntegrationService
+
+    def __init__(self,
+                 digital_object_service: AsyncDigitalObjectService,
+                 ingest_service: AsyncIngestService,
+                 integration_service: AsyncIntegrationService) -> None:
+        self.digital_object_service = digital_object_service
+        self.ingest_service = ingest_service
+        self.integration_service = integration_service
+
+    async def ingest_bags(self,
+                          project_abbr: str,
+                          folder_names: Iterable[str],
+                          concurrency: int,
+                          adaptive: bool = False) -> List[str]:
+        """
+        Ingests given bag folders (relative to the bag root), replacing existing objects.
+        """
+        async def ingest_bag(folder_name: str):
+            object_id = folder_name.replace("\\", "/").rsplit("/", 1)[-1]
+            if await self.digital_object_service.object_exists(object_id, project_abbr):
+                await self.digital_object_service.delete_object(object_id, project_abbr)
+                logging.info(f"Successfully deleted existing object: {object_id} for ingest")
+            await self.ingest_service.ingest_bag(project_abbr, folder_name)
+            logging.info(f"Successfully ingested: {folder_name}")
+
+        return await self._run_bounded("ingest", folder_names, ingest_bag, concurrency, adaptive)
+
+    async def delete_objects(self, project_abbr: str, concurrency: int, adaptive: bool = False) -> List[str]:
+        """
+        Deletes all digital objects of a project.
+        """
+        object_ids = await self.digital_object_service.list_objects(project_abbr)
+        logging.info(f"Deleting now {len(object_ids)} objects for project {project_abbr}")
+
+        async def delete_object(object_id: str):
+            await self.digital_object_service.delete_object(object_id, project_abbr)
+
+        return await self._run_bounded("delete", object_ids, delete_object, concurrency, adaptive)
+
+    async def integrate_objects(self,
+                                project_abbr: str,
+                                object_ids: Iterable[str],
+                                concurrency: int,
+                                adaptive: bool = False) -> List[str]:
+        """
+        Integrates given objects in the gams-integration services.
+        """
+        async def integrate(object_id: str):
+            await self.integration_service.integrate(project_abbr, object_id)
+
+        return await self._run_bounded("integrate", object_ids, integrate, concurrency, adaptive)
+
+    @staticmethod
+    async def _run_bounded(operation: str,
+                           items: Iterable[str],
+                           action: Callable[[str], Awaitable[None]],
+                           concurrency: int,
+                           adaptive: bool = False) -> List[str]:
+        """
+        Runs action for all items with at most `concurrency` running at once and returns the failed items.
+        Tasks are created lazily, so huge item lists don't turn into as many pending tasks.
+        """
+        failures = []
+        item_iterator = iter(items)
+        running = set()
+        limiter: Optional[AdaptiveConcurrencyLimiter] = None
+        if adaptive:
+            limiter = AdaptiveConcurrencyLimiter(concurrency, name=operation)
+
+        async def run(item: str):
+            try:
+                # the loop below only starts tasks below the limit, so the slot never has to wait
+                with limiter.slot(wait=False) if limiter else contextlib.nullcontext():
+                    await action(item)
+            except Exception as e:
+                logging.error(f"FAILED to {operation} {item}: {e}")
+                failures.append(item)
+
+        exhausted = False
+        while True:
+            while not exhausted and len(running) < (limiter.limit if limiter else concurrency):
+                item = next(item_iterator, _END)
+                if item is _END:
+                    exhausted = True
+                else:
+                    running.add(asyncio.create_task(run(item)))
+
+            if not running:
+                return failures
+
+            _, running = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
@@ -0,0 +1,74 @@
+import asyncio
+import logging
+import os
+from typing import BinaryIO
+
+from pyrilo.PyriloStatics import PyriloStatics
+from pyrilo.api.AsyncGamsApiClient import AsyncGamsApiClient
+from pyrilo.infrastructure.FileSystemService import FileSystemService
+from pyrilo.infrastructure.MultipartStream import MultipartStream
+
+
+class AsyncIngestService:
+    """
+    asyncio counterpart of IngestService. Zipping and all file reads of the upload run in worker
+    threads, so the event loop keeps serving other requests meanwhile.
+    """
+
+    client: AsyncGamsApiClient
+    file_system: FileSystemService
+    LOCAL_BAGIT_FILES_PATH: str
+    spool_threshold: int
+
+    def __init__(self,
+                 client: AsyncGamsApiClient,
+                 file_system: FileSystemService,
+                 local_bagit_files_path: str,
+                 spool_threshold: int = PyriloStatics.INGEST_SPOOL_THRESHOLD) -> None:
+        self.client = client
+        self.file_system = file_system
+        self.LOCAL_BAGIT_FILES_PATH = local_bagit_files_path
+        self.spool_threshold = spool_threshold
+
+    async def ingest_bag(self, project_abbr: str, folder_name: str):
+        """
+        Ingests defined folder from the local bag structure.
+        """
+        folder_path = os.path.join(self.LOCAL_BAGIT_FILES_PATH, folder_name)
+        logging.debug(f"Zipping folder {folder_path} ...")
+
+        zip_file = await asyncio.to_thread(
+            self.file_system.create_spooled_zip_from_folder, folder_path, self.spool_threshold
+        )
+        with zip_file:
+            await self.upload_archive(project_abbr, zip_file)
+
+    async def ingest_archive(self, project_abbr: str, archive_path: str):
+        """
+        Ingests an already packaged bag archive.
+        """
+        zip_file = await asyncio.to_thread(open, archive_path, "rb")
+        try:
+            await self.upload_archive(project_abbr, zip_file)
+        finally:
+            zip_file.close()
+
+    async def upload_archive(self, project_abbr: str, zip_file: BinaryIO):
+        """
+        Streams given bag archive as ingest request to the GAMS5 REST-API (the multipart body of
+        IngestService.upload_archive, read chunk by chunk in worker threads).
+        """
+        body = MultipartStream(
+            fields={"ingestProfile": "simple"},
+            files={"subInfoPackZIP": ("bag.zip", zip_file, "application/zip")}
+        )
+
+        logging.debug(f"Requesting ingest for project {project_abbr} ({len(body)} bytes) ...")
+
+        await self.client.post(
+            f"projects/{project_abbr}/objects",
+            content=body.aiter_chunks(),
+            # a known length instead of chunked transfer encoding, like the synchronous upload
+            headers={"Content-Type": body.content_type, "Content-Length": str(len(body))},
+            timeout=100
+        )
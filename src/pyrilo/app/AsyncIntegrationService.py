@@ -0,0 +1,97 @@
+import logging
+from pyrilo.api.AsyncGamsApiClient import AsyncGamsApiClient
+from pyrilo.app.IntegrationService import IntegrationService
+
+
+class AsyncIntegrationService:
+    """
+    asyncio counterpart of IntegrationService.
+    """
+    client: AsyncGamsApiClient
+
+    def __init__(self, client: AsyncGamsApiClient) -> None:
+        self.client = client
+
+    async def integrate_all(self, project_abbr: str, timeout: float = IntegrationService.INTEGRATE_TIMEOUT):
+        await self.client.post(
+            f"integration/projects/{project_abbr}/objects",
+            timeout=timeout
+        )
+        logging.info(f"Successfully integrated all digital objects for project {project_abbr}.")
+
+    async def disintegrate_all(self, project_abbr: str, timeout: float = IntegrationService.DISINTEGRATE_TIMEOUT):
+        await self.client.delete(
+            f"integration/projects/{project_abbr}/objects",
+            timeout=timeout
+        )
+        logging.info(f"Successfully disintegrated all digital objects for project {project_abbr}.")
+
+    async def integrate_all_custom_search(self, project_abbr: str, timeout: float = IntegrationService.INTEGRATE_TIMEOUT):
+        await self.client.post(
+            f"integration/c-search/projects/{project_abbr}/objects",
+            timeout=timeout
+        )
+        logging.info(f"Successfully integrated all objects to customSearch for project {project_abbr}.")
+
+    async def disintegrate_all_custom_search(self, project_abbr: str, timeout: float = IntegrationService.DISINTEGRATE_TIMEOUT):
+        await self.client.delete(
+            f"integration/c-search/projects/{project_abbr}/objects",
+            timeout=timeout
+        )
+        logging.info(f"Successfully disintegrated all objects from customSearch for project {project_abbr}.")
+
+    async def integrate_all_plexus_search(self, project_abbr: str, timeout: float = IntegrationService.INTEGRATE_TIMEOUT):
+        await self.client.post(
+            f"integration/plexus-search/projects/{project_abbr}/objects",
+            timeout=timeout
+        )
+        logging.info(f"Successfully integrated all objects to plexusSearch for project {project_abbr}.")
+
+    async def disintegrate_all_plexus_search(self, project_abbr: str, timeout: float = IntegrationService.DISINTEGRATE_TIMEOUT):
+        await self.client.delete(
+            f"integration/plexus-search/projects/{project_abbr}/objects",
+            timeout=timeout
+        )
+        logging.info(f"Successfully disintegrated all objects from plexusSearch for project {project_abbr}.")
+
+    async def integrate(self, project_abbr: str, object_id: str):
+        await self.client.post(
+            f"integration/projects/{project_abbr}/objects/{object_id}",
+            timeout=IntegrationService.OBJECT_TIMEOUT
+        )
+        logging.info(f"Successfully integrated object {object_id} for project {project_abbr}.")
+
+    async def disintegrate(self, project_abbr: str, object_id: str):
+        await self.client.delete(
+            f"integration/projects/{project_abbr}/objects/{object_id}",
+            timeout=IntegrationService.OBJECT_TIMEOUT
+        )
+        logging.info(f"Successfully disintegrated object {object_id} for project {project_abbr}.")
+
+    async def integrate_custom_search(self, project_abbr: str, object_id: str):
+        await self.client.post(
+            f"integration/c-search/projects/{project_abbr}/objects/{object_id}",
+            timeout=IntegrationService.OBJECT_TIMEOUT
+        )
+        logging.info(f"Successfully integrated object {object_id} to customSearch for project {project_abbr}.")
+
+    async def disintegrate_custom_search(self, project_abbr: str, object_id: str):
+        await self.client.delete(
+            f"integration/c-search/projects/{project_abbr}/objects/{object_id}",
+            timeout=IntegrationService.OBJECT_TIMEOUT
+        )
+        logging.info(f"Successfully disintegrated object {object_id} from customSearch for project {project_abbr}.")
+
+    async def integrate_plexus_search(self, project_abbr: str, object_id: str):
+        await self.client.post(
+            f"integration/plexus-search/projects/{project_abbr}/objects/{object_id}",
+            timeout=IntegrationService.OBJECT_TIMEOUT
+        )
+        logging.info(f"Successfully integrated object {object_id} to plexusSearch for project {project_abbr}.")
+
+    async def disintegrate_plexus_search(self, project_abbr: str, object_id: str):
+        await self.client.delete(
+            f"integration/plexus-search/projects/{project_abbr}/objects/{object_id}",
+            timeout=IntegrationService.OBJECT_TIMEOUT
+        )
+        logging.info(f"Successfully disintegrated object {object_id} from plexusSearch for project {project_abbr}.")
@@ -0,0 +1,40 @@
+from dataclasses import dataclass
+from typing import Optional
+
+from pyrilo.infrastructure.BagEntry import BagEntry
+from pyrilo.infrastructure.BagState import BagState
+
+
+@dataclass
+class BagIngestTask:
+    """
+    A bag travelling through the stages of the IngestPipeline.
+    """
+
+    bag: BagEntry
+    """
+    The discovered bag.
+    """
+
+    folder_path: str
+    """
+    Absolute path of the bag folder.
+    """
+
+    state: Optional[BagState] = None
+    """
+    Local state of the bag (set by the verify stage if an ingest state store is configured).
+    """
+
+    archive_path: Optional[str] = None
+    """
+    Path of the packaged bag archive (set by the package stage).
+    """
+
+    deleted: bool = False
+    """
+    Whether the existing remote object was deleted (set by the delete-existing stage).
+    """
+
+    def __str__(self) -> str:
+        return self.bag.relative_path
@@ -0,0 +1,132 @@
+import contextlib
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional, Sequence, Set
+
+from pyrilo.api.DigitalObject.DigitalObjectService import DigitalObjectService
+from pyrilo.app.BulkDeleteReport import BulkDeleteReport
+from pyrilo.app.IntegrationService import IntegrationService
+from pyrilo.exceptions import PyriloNotFoundError
+from pyrilo.infrastructure.AdaptiveConcurrencyLimiter import AdaptiveConcurrencyLimiter
+from pyrilo.infrastructure.RunProfiler import RunProfiler
+
+
+class BulkDeleteEngine:
+    """
+    Deletes all objects of a project with bounded parallelism:
+
+    - deletes start while the id listing is still paging in, at most `workers` run at once and at
+      most twice as many ids wait for a worker (so the listing doesn't run ahead of the deletes)
+    - deleting shifts the pages of the listing, so it is repeated until it returns no objects that
+      weren't attempted yet (the first pass uses the cached inventory instead, if it's fresh)
+    - deleted objects are disintegrated from the given integration targets right away
+    - a failing delete doesn't abort the run, failures are collected in the BulkDeleteReport
+    - progress is logged every `progress_interval` seconds
+    """
+
+    digital_object_service: DigitalObjectService
+
+    def __init__(self,
+                 digital_object_service: DigitalObjectService,
+                 workers: int = 4,
+                 limiter: AdaptiveConcurrencyLimiter = None,
+                 profiler: RunProfiler = None,
+                 progress_interval: float = 10.0,
+                 integration_service: IntegrationService = None,
+                 disintegrate_targets: Sequence[str] = ()) -> None:
+        """
+        :param limiter: adapts the number of concurrent deletes to the server load, workers is then the upper bound
+        :param profiler: attributes the time of every delete to the stage 'delete' and the object id
+        :param disintegrate_targets: targets to disintegrate every deleted object from (see IntegrationService.TARGETS)
+        """
+        if disintegrate_targets and not integration_service:
+            raise ValueError("Disintegrating deleted objects requires an integration service.")
+
+        self.digital_object_service = digital_object_service
+        self.integration_service = integration_service
+        self.disintegrate_targets = list(disintegrate_targets)
+        self.workers = workers
+        self.limiter = limiter
+        self.profiler = profiler
+        self.progress_interval = progress_interval
+
+        self._condition = threading.Condition()
+        self._pending = 0
+        self._report: Optional[BulkDeleteReport] = None
+        self._started_at = 0.0
+        self._last_progress = 0.0
+
+    def run(self, project_abbr: str) -> BulkDeleteReport:
+        """
+        Deletes all objects of given project and returns the report.
+        """
+        self._report = report = BulkDeleteReport(project_abbr)
+        self._started_at = self._last_progress = time.monotonic()
+        attempted: Set[str] = set()
+        max_pending = 3 * self.workers
+
+        cached_ids = self.digital_object_service.cached_objects(project_abbr)
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="pyrilo-delete") as executor:
+            while True:
+                listed = 0
+                live = cached_ids is None
+                if live:
+                    object_ids = self.digital_object_service.iter_objects(project_abbr)
+                else:
+                    object_ids, cached_ids = sorted(cached_ids), None
+                for object_id in object_ids:
+                    if object_id in attempted:
+                        continue
+                    attempted.add(object_id)
+                    listed += 1
+
+                    with self._condition:
+                        self._condition.wait_for(lambda: self._pending < max_pending)
+                        self._pending += 1
+                    future = executor.submit(self._delete, project_abbr, object_id)
+                    future.add_done_callback(lambda done, deleted_id=object_id: self._on_done(deleted_id, done))
+
+                # list again once the deletes of this pass are through, for the objects the shifted pages skipped
+                with self._condition:
+                    self._condition.wait_for(lambda: self._pending == 0)
+                # the project is empty once a live listing has nothing left but failed objects
+                if live and not listed:
+                    break
+
+        report.seconds = time.monotonic() - self._started_at
+        logging.info(f"Deleted {report.deleted} objects of project {project_abbr} in {report.seconds:.1f}s"
+                     + (f", {len(report.failed)} failed" if report.failed else ""))
+        return report
+
+    def _delete(self, project_abbr: str, object_id: str):
+        with self.limiter.slot() if self.limiter else contextlib.nullcontext(), \
+                RunProfiler.spanned(self.profiler, "delete", object_id):
+            try:
+                self.digital_object_service.delete_object(object_id, project_abbr)
+            except PyriloNotFoundError:
+                logging.debug(f"Object {object_id} was already deleted")
+            if self.disintegrate_targets:
+                self.integration_service.disintegrate_targets(project_abbr, object_id, self.disintegrate_targets)
+
+    def _on_done(self, object_id: str, future: Future):
+        error = future.exception()
+        with self._condition:
+            self._pending -= 1
+            if error is None:
+                self._report.deleted += 1
+            else:
+                logging.error(f"FAILED to delete {object_id}: {error}")
+                self._report.failed[object_id] = str(error)
+            self._log_progress()
+            self._condition.notify_all()
+
+    def _log_progress(self):
+        now = time.monotonic()
+        if now - self._last_progress < self.progress_interval:
+            return
+        self._last_progress = now
+        elapsed = now - self._started_at
+        logging.info(f"Deleted {self._report.deleted} objects ({len(self._report.failed)} failed), "
+                     f"{self._report.deleted / elapsed:.1f} objects/s")
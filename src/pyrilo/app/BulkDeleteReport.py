@@ -0,0 +1,47 @@
+import json
+from dataclasses import dataclass, field
+from typing import Dict
+
+
+@dataclass
+class BulkDeleteReport:
+    """
+    Outcome of deleting all objects of a project.
+    """
+
+    project_abbr: str
+    """
+    Abbreviation of the project whose objects were deleted.
+    """
+
+    deleted: int = 0
+    """
+    Number of objects deleted (including objects that were already gone when their delete was sent).
+    """
+
+    failed: Dict[str, str] = field(default_factory=dict)
+    """
+    Error per object id that could not be deleted.
+    """
+
+    seconds: float = 0.0
+    """
+    Duration of the whole run, including the listing.
+    """
+
+    @property
+    def succeeded(self) -> bool:
+        return not self.failed
+
+    def write(self, path: str) -> None:
+        """
+        Writes the report as JSON e.g. to retry the failed objects later.
+        """
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({
+                "project": self.project_abbr,
+                "deleted": self.deleted,
+                "failed": self.failed,
+                "seconds": self.seconds,
+            }, f, indent=2, ensure_ascii=False)
+            f.write("\n")
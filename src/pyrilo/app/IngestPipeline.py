@@ -0,0 +1,247 @@
+import contextlib
+import logging
+import multiprocessing
+import os
+import tempfile
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Iterable, List, Optional, Sequence, Set
+
+from pyrilo.api.DigitalObject.DigitalObjectService import DigitalObjectService
+from pyrilo.app.BagIngestTask import BagIngestTask
+from pyrilo.app.IngestService import IngestService
+from pyrilo.app.IntegrationService import IntegrationService
+from pyrilo.app.PackagingService import PackagingService
+from pyrilo.exceptions import PyriloError, PyriloValidationError
+from pyrilo.infrastructure.AdaptiveConcurrencyLimiter import AdaptiveConcurrencyLimiter
+from pyrilo.infrastructure.BagEntry import BagEntry
+from pyrilo.infrastructure.BagValidator import BagValidator
+from pyrilo.infrastructure.IngestJournal import IngestJournal
+from pyrilo.infrastructure.IngestStateStore import IngestStateStore
+from pyrilo.infrastructure.RunProfiler import RunProfiler
+from pyrilo.infrastructure.StagedPipeline import PipelineStage, StagedPipeline
+
+
+class IngestPipeline:
+    """
+    Ingests the bags of a project in explicit stages, joined by bounded queues:
+
+    discover -> verify -> package -> delete-existing -> upload -> integrate
+
+    Every stage has its own worker count, so zipping (CPU, disk), deleting and uploading (network)
+    overlap instead of alternating. The remote object inventory is fetched while bags are discovered.
+
+    With integrate targets, every uploaded object is integrated into them right away (instead of
+    re-integrating the whole project afterwards), and an object deleted for a failed upload is
+    disintegrated from them again. A bag only counts as ingested (journal, ingest state) once its
+    last stage succeeded, so resuming or ingesting changed bags only repeats an object that was
+    uploaded but not integrated.
+    """
+
+    project_abbr: str
+    bag_root: str
+
+    def __init__(self,
+                 project_abbr: str,
+                 bag_root: str,
+                 digital_object_service: DigitalObjectService,
+                 ingest_service: IngestService,
+                 packaging_service: PackagingService,
+                 integration_service: IntegrationService,
+                 ingest_state_store: IngestStateStore = None,
+                 journal: IngestJournal = None,
+                 validator: BagValidator = None,
+                 changed_only: bool = False,
+                 pack_workers: int = 1,
+                 delete_workers: int = 1,
+                 upload_workers: int = 1,
+                 integrate_workers: int = 0,
+                 integrate_targets: Sequence[str] = (),
+                 queue_size: int = None,
+                 delete_limiter: AdaptiveConcurrencyLimiter = None,
+                 upload_limiter: AdaptiveConcurrencyLimiter = None,
+                 profiler: RunProfiler = None) -> None:
+        """
+        :param validator: if given, bags failing the pre-flight validation are rejected in the verify stage,
+         before their remote object is deleted
+        :param pack_workers: zipping processes (> 1 uses a process pool, 1 zips in the package stage thread)
+        :param integrate_workers: concurrent per-object integrations after upload
+        :param integrate_targets: targets to integrate the uploaded objects into (see IntegrationService.TARGETS),
+         none disables the integrate stage
+        :param queue_size: capacity of the queues between stages, defaults to twice the largest worker count
+        :param delete_limiter: adapts the number of concurrent existence checks / deletes to the server load,
+         delete_workers is then the upper bound
+        :param upload_limiter: adapts the number of concurrent uploads to the server load, upload_workers is then
+         the upper bound
+        :param profiler: attributes wall time and memory to the discovery and to every stage per bag
+        """
+        if changed_only and not ingest_state_store:
+            raise ValueError("Ingesting changed bags only requires a configured ingest state store.")
+        if integrate_targets and integrate_workers < 1:
+            raise ValueError("Integrating ingested objects requires at least one integrate worker.")
+
+        self.project_abbr = project_abbr
+        self.bag_root = bag_root
+        self.digital_object_service = digital_object_service
+        self.ingest_service = ingest_service
+        self.packaging_service = packaging_service
+        self.integration_service = integration_service
+        self.ingest_state_store = ingest_state_store
+        self.journal = journal
+        self.validator = validator
+        self.changed_only = changed_only
+        self.pack_workers = pack_workers
+        self.delete_workers = delete_workers
+        self.upload_workers = upload_workers
+        self.integrate_workers = integrate_workers if integrate_targets else 0
+        self.integrate_targets = list(integrate_targets)
+        self.delete_limiter = delete_limiter
+        self.upload_limiter = upload_limiter
+        self.profiler = profiler
+        self.queue_size = queue_size or 2 * max(pack_workers, delete_workers, upload_workers, self.integrate_workers, 1)
+
+        self._inventory: Optional[Future] = None
+        self._work_dir: Optional[str] = None
+        self._pack_executor: Optional[ProcessPoolExecutor] = None
+
+    def run(self, discover: Callable[[], Iterable[BagEntry]]) -> List[str]:
+        """
+        Runs the pipeline for the bags returned by discover and returns the relative paths of the
+        bags that failed in any stage.
+        """
+        stages = [
+            # verify hashes on the validator's own thread pool, more verify workers keep that pool busy
+            PipelineStage("verify", self._verify, self.validator.workers if self.validator else 1),
+            PipelineStage("package", self._package, self.pack_workers),
+            PipelineStage("delete-existing", self._delete_existing, self.delete_workers),
+            PipelineStage("upload", self._upload, self.upload_workers),
+            PipelineStage("integrate", self._integrate, self.integrate_workers),
+        ]
+        pipeline = StagedPipeline(stages, self.queue_size, on_failure=self._on_failure, metrics=self.ingest_service.metrics,
+                                  profiler=self.profiler)
+
+        with contextlib.ExitStack() as stack:
+            self._work_dir = stack.enter_context(tempfile.TemporaryDirectory(prefix="pyrilo-packages-"))
+            if self.pack_workers > 1:
+                logging.info(f"Packaging bags on {self.pack_workers} worker processes")
+                # spawn, since forking a process that already runs the stage threads may deadlock the children
+                self._pack_executor = stack.enter_context(ProcessPoolExecutor(
+                    max_workers=self.pack_workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                ))
+
+            # the remote inventory is paged in while the local bags are discovered
+            inventory_executor = stack.enter_context(ThreadPoolExecutor(max_workers=1, thread_name_prefix="pyrilo-inventory"))
+            self._inventory = inventory_executor.submit(self._fetch_object_inventory)
+
+            with RunProfiler.spanned(self.profiler, "discover"):
+                bags = list(discover())
+            failures = pipeline.run(
+                BagIngestTask(bag, os.path.join(self.bag_root, bag.relative_path)) for bag in bags
+            )
+
+        return [str(task) for task, _, _ in failures]
+
+    def _verify(self, task: BagIngestTask) -> Optional[BagIngestTask]:
+        if self.ingest_state_store:
+            task.state, changed = self.ingest_state_store.inspect(self.digital_object_service.client.host,
+                                                                  self.project_abbr, self.bag_root, task.bag)
+            # unchanged locally, but the object may have been deleted on the server since
+            if self.changed_only and not changed and self._exists_remotely(task.bag.name):
+                logging.debug(f"Skipping unchanged bag: {task}")
+                return None
+
+        if self.validator:
+            result = self.validator.validate(task.folder_path)
+            if not result.valid:
+                raise PyriloValidationError(f"Bag is invalid: {'; '.join(result.errors)}", result.errors)
+        return task
+
+    def _package(self, task: BagIngestTask) -> BagIngestTask:
+        task.archive_path = self.packaging_service.package_bag(task.folder_path, self._work_dir, self._pack_executor)
+        self._journal(task, IngestJournal.PACKAGED)
+        return task
+
+    def _delete_existing(self, task: BagIngestTask) -> BagIngestTask:
+        object_id = task.bag.name
+        if self._exists_remotely(object_id):
+            with self._slot(self.delete_limiter):
+                self.digital_object_service.delete_object(object_id, self.project_abbr)
+            task.deleted = True
+            logging.info(f"Successfully deleted existing object: {object_id} for ingest")
+            self._journal(task, IngestJournal.DELETED)
+        return task
+
+    def _upload(self, task: BagIngestTask) -> Optional[BagIngestTask]:
+        logging.info(f"Starting ingest for: {task}")
+        try:
+            with self._slot(self.upload_limiter):
+                self.ingest_service.ingest_archive(self.project_abbr, task.archive_path)
+        finally:
+            self._release_archive(task)
+        logging.info(f"Successfully ingested: {task}")
+        self.digital_object_service.note_object_created(task.bag.name, self.project_abbr)
+        if not self.integrate_targets:
+            self._complete(task)
+        return task
+
+    def _integrate(self, task: BagIngestTask) -> None:
+        self.integration_service.integrate_targets(self.project_abbr, task.bag.name, self.integrate_targets)
+        self._complete(task)
+
+    def _complete(self, task: BagIngestTask):
+        """
+        Records a bag whose last stage succeeded.
+        """
+        self._journal(task, IngestJournal.UPLOADED)
+        if self.ingest_state_store and task.state:
+            self.ingest_state_store.record_ingest(self.digital_object_service.client.host, self.project_abbr,
+                                                  task.state)
+
+    def _exists_remotely(self, object_id: str) -> bool:
+        existing_ids = self._inventory.result()
+        if existing_ids is not None:
+            return object_id in existing_ids
+        with self._slot(self.delete_limiter):
+            return self.digital_object_service.object_exists(object_id, self.project_abbr)
+
+    def _on_failure(self, task: BagIngestTask, stage_name: str, error: Exception):
+        logging.error(f"FAILED to ingest {task} ({stage_name}): {error}")
+        self._journal(task, IngestJournal.FAILED, f"{stage_name}: {error}")
+        self._release_archive(task)
+        if task.deleted and stage_name == "upload":
+            self._disintegrate_deleted(task)
+
+    def _disintegrate_deleted(self, task: BagIngestTask):
+        # the old object is gone and its replacement wasn't uploaded: don't leave it in the indices
+        try:
+            self.integration_service.disintegrate_targets(self.project_abbr, task.bag.name, self.integrate_targets)
+        except PyriloError as e:
+            logging.warning(f"Could not disintegrate deleted object {task.bag.name}: {e}")
+
+    @staticmethod
+    def _slot(limiter: Optional[AdaptiveConcurrencyLimiter]):
+        return limiter.slot() if limiter else contextlib.nullcontext()
+
+    def _journal(self, task: BagIngestTask, state: str, error: str = None):
+        if self.journal:
+            self.journal.record(self.project_abbr, task.bag.relative_path, state, error)
+
+    def _release_archive(self, task: BagIngestTask):
+        if task.archive_path:
+            self.packaging_service.release_archive(task.archive_path)
+            task.archive_path = None
+
+    def _fetch_object_inventory(self) -> Optional[Set[str]]:
+        """
+        Fetches the ids of all objects of the project in one paginated listing (or from the inventory cache).
+        Returns None if the listing fails, the pipeline then falls back to per-object existence checks.
+        """
+        try:
+            existing_ids = self.digital_object_service.inventory(self.project_abbr)
+        except PyriloError as e:
+            logging.warning(f"Could not fetch object inventory of project {self.project_abbr}, "
+                            f"checking objects one by one instead: {e}")
+            return None
+
+        logging.info(f"Fetched inventory of {len(existing_ids)} existing objects for project {self.project_abbr}")
+        return existing_ids
@@ -1,9 +1,14 @@
 import logging
 import os
 from pathlib import Path
+from typing import BinaryIO, Optional
+from pyrilo.PyriloStatics import PyriloStatics
 from pyrilo.api.GamsApiClient import GamsApiClient
 # Import the new service
 from pyrilo.infrastructure.FileSystemService import FileSystemService
+from pyrilo.infrastructure.MetricsRegistry import MetricsRegistry
+from pyrilo.infrastructure.MultipartStream import MultipartStream
+from pyrilo.infrastructure.PackageCache import PackageCache
 
 class IngestService:
     """
@@ -13,14 +18,23 @@ class IngestService:
     client: GamsApiClient
     file_system: FileSystemService  # New dependency
     LOCAL_BAGIT_FILES_PATH: str
+    spool_threshold: int
+    package_cache: Optional[PackageCache]
+    metrics: Optional[MetricsRegistry]
 
     # Updated constructor to accept file_system dependency
     def __init__(self,
                  client: GamsApiClient,
                  file_system: FileSystemService,
-                 local_bagit_files_path: str = None) -> None:
+                 local_bagit_files_path: str = None,
+                 spool_threshold: int = PyriloStatics.INGEST_SPOOL_THRESHOLD,
+                 package_cache: PackageCache = None,
+                 metrics: MetricsRegistry = None) -> None:
         self.client = client
         self.file_system = file_system
+        self.spool_threshold = spool_threshold
+        self.package_cache = package_cache
+        self.metrics = metrics
 
         if local_bagit_files_path:
             self.LOCAL_BAGIT_FILES_PATH = local_bagit_files_path
@@ -37,28 +51,56 @@ class IngestService:
         Ingests defined folder from the local bag structure.
         """
         folder_path = os.path.join(self.LOCAL_BAGIT_FILES_PATH, folder_name)
-        logging.debug(f"Zipping folder {folder_path} ...")
 
-        # This fixes the Windows bug and allows us to mock 'create_zip_from_folder' in tests.
-        zip_content = self.file_system.create_zip_from_folder(folder_path)
+        if self.package_cache:
+            # unchanged bags (same manifests) reuse the archive of an earlier run
+            cache_key = self.package_cache.key_for(folder_path, self.file_system.compression_policy.fingerprint())
+            if cache_key:
+                archive_path = self.package_cache.get(cache_key)
+                if archive_path is None:
+                    logging.debug(f"Zipping folder {folder_path} into package cache ...")
+                    archive_path = self.package_cache.create(
+                        cache_key,
+                        lambda target: self.file_system.write_zip_from_folder(folder_path, target)
+                    )
+                self.ingest_archive(project_abbr, archive_path)
+                return
+
+        logging.debug(f"Zipping folder {folder_path} ...")
 
-        # Prepare for requests
-        files_payload = {
-            "subInfoPackZIP": ("bag.zip", zip_content, "application/zip")
-        }
-        data_payload = {
-            "ingestProfile": "simple"
-        }
+        # The archive is spooled (memory up to spool_threshold, temp file above) and streamed
+        # into the multipart body, so neither the zip nor the request body is ever held in memory.
+        with self.file_system.create_spooled_zip_from_folder(folder_path, self.spool_threshold) as zip_file:
+            self.upload_archive(project_abbr, zip_file)
 
-        logging.debug(f"Requesting ingest for project {project_abbr} ...")
+    def ingest_archive(self, project_abbr: str, archive_path: str):
+        """
+        Ingests an already packaged bag archive (e.g. zipped by the PackagingService).
+        """
+        with open(archive_path, "rb") as zip_file:
+            self.upload_archive(project_abbr, zip_file)
 
-        self.client.post(
-            f"projects/{project_abbr}/objects",
-            files=files_payload,
-            data=data_payload,
-            timeout=100
+    def upload_archive(self, project_abbr: str, zip_file: BinaryIO):
+        """
+        Streams given bag archive as ingest request to the GAMS5 REST-API.
+        """
+        body = MultipartStream(
+            fields={"ingestProfile": "simple"},
+            files={"subInfoPackZIP": ("bag.zip", zip_file, "application/zip")}
         )
 
+        logging.debug(f"Requesting ingest for project {project_abbr} ({len(body)} bytes) ...")
+
+        with MetricsRegistry.timed(self.metrics, "upload"):
+            self.client.post(
+                f"projects/{project_abbr}/objects",
+                data=body,
+                headers={"Content-Type": body.content_type},
+                timeout=100,
+                # the existing object is deleted before, so a request the server rejected unprocessed can be sent again
+                replay_safe=True
+            )
+
     def ingest_bags(self, project_abbr: str):
         """
         Walks through project directory and ingest the bags as individual objects.
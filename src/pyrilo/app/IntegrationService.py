@@ -1,65 +1,169 @@
 import logging
+from typing import Iterable
+
 from pyrilo.api.GamsApiClient import GamsApiClient
 
 
 class IntegrationService:
+    """
+    Integration of project objects into the gams-integration services: the base integration and the
+    custom search (c-search) and plexus search indices. Whole projects or single objects.
+    """
     client: GamsApiClient
 
+    # targets of integrate_project / integrate_targets and their disintegrate counterparts
+    TARGETS = ("integration", "c-search", "plexus-search")
+
+    # default seconds to wait for the response to a whole-project call (the integration runs synchronously).
+    # A timed out whole-project call is not sent again, the server may still be working on it.
+    INTEGRATE_TIMEOUT = 300.0
+    DISINTEGRATE_TIMEOUT = 30.0
+    # seconds to wait for the response to a single-object call
+    OBJECT_TIMEOUT = 30.0
+
     def __init__(self, client: GamsApiClient) -> None:
         self.client = client
 
-    def integrate_all(self, project_abbr: str):
+    def integrate_all(self, project_abbr: str, timeout: float = INTEGRATE_TIMEOUT):
         self.client.post(
             f"integration/projects/{project_abbr}/objects",
-            timeout=300
+            timeout=timeout,
+            retry_timeouts=False
         )
         logging.info(f"Successfully integrated all digital objects for project {project_abbr}.")
 
-    def disintegrate_all(self, project_abbr: str):
+    def disintegrate_all(self, project_abbr: str, timeout: float = DISINTEGRATE_TIMEOUT):
         self.client.delete(
             f"integration/projects/{project_abbr}/objects",
-            timeout=30
+            timeout=timeout,
+            retry_timeouts=False
         )
         logging.info(f"Successfully disintegrated all digital objects for project {project_abbr}.")
 
-    def integrate_all_custom_search(self, project_abbr: str):
+    def integrate_all_custom_search(self, project_abbr: str, timeout: float = INTEGRATE_TIMEOUT):
         self.client.post(
             f"integration/c-search/projects/{project_abbr}/objects",
-            timeout=300
+            timeout=timeout,
+            retry_timeouts=False
         )
         logging.info(f"Successfully integrated all objects to customSearch for project {project_abbr}.")
 
-    def disintegrate_all_custom_search(self, project_abbr: str):
+    def disintegrate_all_custom_search(self, project_abbr: str, timeout: float = DISINTEGRATE_TIMEOUT):
         self.client.delete(
             f"integration/c-search/projects/{project_abbr}/objects",
-            timeout=30
+            timeout=timeout,
+            retry_timeouts=False
         )
         logging.info(f"Successfully disintegrated all objects from customSearch for project {project_abbr}.")
 
-    def integrate_all_plexus_search(self, project_abbr: str):
+    def integrate_all_plexus_search(self, project_abbr: str, timeout: float = INTEGRATE_TIMEOUT):
         self.client.post(
             f"integration/plexus-search/projects/{project_abbr}/objects",
-            timeout=300
+            timeout=timeout,
+            retry_timeouts=False
         )
         logging.info(f"Successfully integrated all objects to plexusSearch for project {project_abbr}.")
 
-    def disintegrate_all_plexus_search(self, project_abbr: str):
+    def disintegrate_all_plexus_search(self, project_abbr: str, timeout: float = DISINTEGRATE_TIMEOUT):
         self.client.delete(
             f"integration/plexus-search/projects/{project_abbr}/objects",
-            timeout=30
+            timeout=timeout,
+            retry_timeouts=False
         )
         logging.info(f"Successfully disintegrated all objects from plexusSearch for project {project_abbr}.")
 
     def integrate(self, project_abbr: str, object_id: str):
         self.client.post(
             f"integration/projects/{project_abbr}/objects/{object_id}",
-            timeout=30
+            timeout=self.OBJECT_TIMEOUT
         )
         logging.info(f"Successfully integrated object {object_id} for project {project_abbr}.")
 
     def disintegrate(self, project_abbr: str, object_id: str):
         self.client.delete(
             f"integration/projects/{project_abbr}/objects/{object_id}",
-            timeout=30
+            timeout=self.OBJECT_TIMEOUT
+        )
+        logging.info(f"Successfully disintegrated object {object_id} for project {project_abbr}.")
+
+    def integrate_custom_search(self, project_abbr: str, object_id: str):
+        self.client.post(
+            f"integration/c-search/projects/{project_abbr}/objects/{object_id}",
+            timeout=self.OBJECT_TIMEOUT
         )
-        logging.info(f"Successfully disintegrated object {object_id} for project {project_abbr}.")
\ No newline at end of file
+        logging.info(f"Successfully integrated object {object_id} to customSearch for project {project_abbr}.")
+
+    def disintegrate_custom_search(self, project_abbr: str, object_id: str):
+        self.client.delete(
+            f"integration/c-search/projects/{project_abbr}/objects/{object_id}",
+            timeout=self.OBJECT_TIMEOUT
+        )
+        logging.info(f"Successfully disintegrated object {object_id} from customSearch for project {project_abbr}.")
+
+    def integrate_plexus_search(self, project_abbr: str, object_id: str):
+        self.client.post(
+            f"integration/plexus-search/projects/{project_abbr}/objects/{object_id}",
+            timeout=self.OBJECT_TIMEOUT
+        )
+        logging.info(f"Successfully integrated object {object_id} to plexusSearch for project {project_abbr}.")
+
+    def disintegrate_plexus_search(self, project_abbr: str, object_id: str):
+        self.client.delete(
+            f"integration/plexus-search/projects/{project_abbr}/objects/{object_id}",
+            timeout=self.OBJECT_TIMEOUT
+        )
+        logging.info(f"Successfully disintegrated object {object_id} from plexusSearch for project {project_abbr}.")
+
+    def integrate_project(self, project_abbr: str, target: str, timeout: float = None):
+        """
+        Integrates all objects of a project into given target (see TARGETS).
+
+        :param timeout: seconds to wait for the response, 0 waits without limit (defaults to INTEGRATE_TIMEOUT)
+        """
+        calls = {
+            "integration": self.integrate_all,
+            "c-search": self.integrate_all_custom_search,
+            "plexus-search": self.integrate_all_plexus_search,
+        }
+        if timeout is None:
+            timeout = self.INTEGRATE_TIMEOUT
+        calls[target](project_abbr, timeout or None)
+
+    def disintegrate_project(self, project_abbr: str, target: str, timeout: float = None):
+        """
+        Disintegrates all objects of a project from given target (see TARGETS).
+
+        :param timeout: seconds to wait for the response, 0 waits without limit (defaults to DISINTEGRATE_TIMEOUT)
+        """
+        calls = {
+            "integration": self.disintegrate_all,
+            "c-search": self.disintegrate_all_custom_search,
+            "plexus-search": self.disintegrate_all_plexus_search,
+        }
+        if timeout is None:
+            timeout = self.DISINTEGRATE_TIMEOUT
+        calls[target](project_abbr, timeout or None)
+
+    def integrate_targets(self, project_abbr: str, object_id: str, targets: Iterable[str]):
+        """
+        Integrates a single object into given targets (see TARGETS), one after the other.
+        """
+        calls = {
+            "integration": self.integrate,
+            "c-search": self.integrate_custom_search,
+            "plexus-search": self.integrate_plexus_search,
+        }
+        for target in targets:
+            calls[target](project_abbr, object_id)
+
+    def disintegrate_targets(self, project_abbr: str, object_id: str, targets: Iterable[str]):
+        """
+        Disintegrates a single object from given targets (see TARGETS), one after the other.
+        """
+        calls = {
+            "integration": self.disintegrate,
+            "c-search": self.disintegrate_custom_search,
+            "plexus-search": self.disintegrate_plexus_search,
+        }
+        for target in targets:
+            calls[target](project_abbr, object_id)
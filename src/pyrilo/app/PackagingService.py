@@ -0,0 +1,73 @@
+import logging
+import os
+import tempfile
+from concurrent.futures import Executor
+from typing import Optional
+
+from pyrilo.infrastructure.FileSystemService import FileSystemService
+from pyrilo.infrastructure.PackageCache import PackageCache
+
+
+def _package_bag(file_system: FileSystemService, folder_path: str, target_dir: str) -> str:
+    """
+    Zips one bag into a new archive file inside target_dir and returns its path.
+    Module level function, so that it can be pickled to the worker processes.
+    """
+    fd, archive_path = tempfile.mkstemp(suffix=".zip", dir=target_dir)
+    try:
+        with os.fdopen(fd, "wb") as archive_file:
+            file_system.write_zip_from_folder(folder_path, archive_file)
+    except BaseException:
+        os.remove(archive_path)
+        raise
+    return archive_path
+
+
+class PackagingService:
+    """
+    Zips bags (optionally in parallel worker processes) and hands the finished archives over as files on disk.
+    """
+
+    file_system: FileSystemService
+    package_cache: Optional[PackageCache]
+
+    def __init__(self, file_system: FileSystemService, package_cache: PackageCache = None) -> None:
+        self.file_system = file_system
+        self.package_cache = package_cache
+
+    def package_bag(self, folder_path: str, work_dir: str, executor: Executor = None) -> str:
+        """
+        Zips a bag into an archive file inside work_dir (owned by the caller) and returns its path.
+        The zipping runs on given (process pool) executor if set, in the calling thread otherwise.
+        Bags found in the package cache are not zipped again, the cached archive is returned instead.
+        Hand the archive back via release_archive once it has been uploaded.
+        """
+        cache_key = None
+        if self.package_cache:
+            cache_key = self.package_cache.key_for(folder_path, self.file_system.compression_policy.fingerprint())
+            cached_archive_path = self.package_cache.get(cache_key) if cache_key else None
+            if cached_archive_path:
+                return cached_archive_path
+
+        if executor:
+            archive_path = executor.submit(_package_bag, self.file_system, folder_path, work_dir).result()
+        else:
+            archive_path = _package_bag(self.file_system, folder_path, work_dir)
+        logging.debug(f"Packaged bag {folder_path} to {archive_path}")
+
+        if cache_key:
+            archive_path = self.package_cache.put(cache_key, archive_path)
+        return archive_path
+
+    def release_archive(self, archive_path: str) -> None:
+        """
+        Removes an archive returned by package_bag. Entries of the package cache are kept, but may
+        be evicted from now on.
+        """
+        if self.package_cache and self.package_cache.contains(archive_path):
+            self.package_cache.release(archive_path)
+            return
+        try:
+            os.remove(archive_path)
+        except FileNotFoundError:
+            pass
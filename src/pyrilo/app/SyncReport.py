@@ -0,0 +1,53 @@
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+
+@dataclass
+class SyncReport:
+    """
+    Outcome of integrating (or disintegrating) a project into several integration targets at once.
+    """
+
+    project_abbr: str
+    """
+    Abbreviation of the synced project.
+    """
+
+    remove: bool = False
+    """
+    Whether the objects were disintegrated instead of integrated.
+    """
+
+    targets: List[str] = field(default_factory=list)
+    """
+    Targets of the sync, in the order they were requested.
+    """
+
+    seconds: Dict[str, float] = field(default_factory=dict)
+    """
+    Duration of the call per target.
+    """
+
+    failed: Dict[str, str] = field(default_factory=dict)
+    """
+    Error per target whose call failed (or timed out).
+    """
+
+    @property
+    def succeeded(self) -> bool:
+        return not self.failed
+
+    def summary(self) -> str:
+        """
+        One line per target with its status and duration.
+        """
+        action = "Disintegrated" if self.remove else "Integrated"
+        lines = [f"{action} project {self.project_abbr}: "
+                 f"{len(self.targets) - len(self.failed)} of {len(self.targets)} targets succeeded"]
+        for target in self.targets:
+            status = "FAILED" if target in self.failed else "ok"
+            line = f"  {target:<15} {status:<7} {self.seconds.get(target, 0.0):>8.1f}s"
+            if target in self.failed:
+                line += f"  {self.failed[target]}"
+            lines.append(line)
+        return "\n".join(lines)
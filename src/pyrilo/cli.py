@@ -8,13 +8,25 @@ import requests
 
 from pyrilo.Pyrilo import Pyrilo
 from pyrilo.api.DigitalObject.DigitalObjectService import DigitalObjectService
+from pyrilo.api.CircuitBreaker import CircuitBreaker
 from pyrilo.api.GamsApiClient import GamsApiClient
+from pyrilo.api.RetryPolicy import RetryPolicy
 from pyrilo.app.IngestService import IngestService
 from pyrilo.app.IntegrationService import IntegrationService
+from pyrilo.app.PackagingService import PackagingService
 from pyrilo.api.Project.exceptions import ProjectAlreadyExistsError
 from pyrilo.api.Project.ProjectService import ProjectService
 from pyrilo.api.auth.AuthorizationService import AuthorizationService
+from pyrilo.infrastructure.BagCatalog import BagCatalog
+from pyrilo.infrastructure.BagValidator import BagValidator
 from pyrilo.infrastructure.FileSystemService import FileSystemService
+from pyrilo.infrastructure.IngestJournal import IngestJournal
+from pyrilo.infrastructure.IngestStateStore import IngestStateStore
+from pyrilo.infrastructure.InventoryCache import InventoryCache
+from pyrilo.infrastructure.MetricsRegistry import MetricsRegistry
+from pyrilo.infrastructure.PackageCache import PackageCache
+from pyrilo.infrastructure.RunProfiler import RunProfiler
+from pyrilo.infrastructure.SessionCache import SessionCache
 
 
 # 1. Configure Logging Helper
@@ -28,7 +40,15 @@ def setup_logging(verbose: bool = False):
     )
 
 
-def bootstrap_application(host: str, bag_root: str) -> Pyrilo:
+def bootstrap_application(host: str,
+                          bag_root: str,
+                          catalog_index: str = None,
+                          retries: int = 4,
+                          circuit_breaker: bool = True,
+                          metrics: MetricsRegistry = None,
+                          profiler: RunProfiler = None,
+                          inventory_cache: InventoryCache = None,
+                          session_cache: SessionCache = None) -> Pyrilo:
     """
     The Composition Root.
     Constructs the object graph and returns the fully assembled application.
@@ -40,23 +60,31 @@ def bootstrap_application(host: str, bag_root: str) -> Pyrilo:
     else:
         resolved_bag_path = str(Path.cwd() / "bags")
 
-    client = GamsApiClient(host)
+    client = GamsApiClient(
+        host,
+        retry_policies=RetryPolicy.defaults(max_attempts=retries + 1),
+        circuit_breaker=CircuitBreaker() if circuit_breaker else None,
+        metrics=metrics
+    )
 
 
     # Services (Injecting the client)
-    auth_service = AuthorizationService(client)
-    digital_object_service = DigitalObjectService(client)
+    auth_service = AuthorizationService(client, session_cache=session_cache)
+    digital_object_service = DigitalObjectService(client, inventory_cache=inventory_cache)
 
-    file_system_service = FileSystemService()
+    file_system_service = FileSystemService(metrics=metrics)
     # IngestService needs both client and the file path
     ingest_service = IngestService(
         client,
         file_system_service,
-        local_bagit_files_path=resolved_bag_path
+        local_bagit_files_path=resolved_bag_path,
+        metrics=metrics
     )
 
     integration_service = IntegrationService(client)
     project_service = ProjectService(client)
+    packaging_service = PackagingService(file_system_service)
+    bag_catalog = BagCatalog(resolved_bag_path, index_path=catalog_index)
 
     # 3. Facade (Injecting the services)
     app = Pyrilo(
@@ -65,26 +93,101 @@ def bootstrap_application(host: str, bag_root: str) -> Pyrilo:
         digital_object_service=digital_object_service,
         ingest_service=ingest_service,
         integration_service=integration_service,
-        project_service=project_service
+        project_service=project_service,
+        packaging_service=packaging_service,
+        bag_catalog=bag_catalog,
+        client=client,
+        profiler=profiler
     )
 
     return app
 
+def write_metrics(metrics: MetricsRegistry, metrics_file: str, metrics_format: str = None):
+    try:
+        metrics.write(metrics_file, metrics_format)
+        logging.info(f"Metrics written to {metrics_file}")
+    except OSError as e:
+        logging.error(f"Could not write metrics to {metrics_file}: {e}")
+
+
+def write_profile(profiler: RunProfiler, output_prefix: str):
+    profiler.stop()
+    try:
+        profiler.write(output_prefix)
+    except OSError as e:
+        logging.error(f"Could not write profile to {output_prefix}: {e}")
+        return
+    click.echo(profiler.summary(), err=True)
+    logging.info(f"Profile written to {output_prefix}.txt and {output_prefix}.pstats")
+
+
+# commands working on the local bag structure only (no login)
+LOCAL_COMMANDS = {"validate"}
+
+
 @click.group()
 @click.option("--host", "-h", default="http://localhost:18085", help="The host of the GAMS5 instance")
 @click.option("--bag_root", "-r", default=None, help="Root folder path of the bagit files. Defaults to ./bags")
+@click.option("--catalog-index", default=None, type=click.Path(dir_okay=False),
+              help="File persisting the index of discovered bags, so that rescans of the bag root are incremental")
+@click.option("--retries", default=4, show_default=True, type=click.IntRange(min=0),
+              help="Retries of failed idempotent requests (and replay safe ingests), with jittered exponential backoff")
+@click.option("--circuit-breaker/--no-circuit-breaker", default=True, show_default=True,
+              help="Pause all requests while the server is failing, instead of failing every remaining request")
+@click.option("--metrics-file", default=None, type=click.Path(dir_okay=False),
+              help="Write request and stage metrics to this file when the command ends (e.g. for the node exporter textfile collector)")
+@click.option("--metrics-format", default=None, type=click.Choice([MetricsRegistry.PROMETHEUS, MetricsRegistry.JSON]),
+              help="Format of the metrics file. Defaults to json for *.json files, prometheus otherwise")
+@click.option("--profile", default=None, type=click.Path(dir_okay=False),
+              help="Profile the command (cProfile, tracemalloc, wall time and peak memory per stage and bag) "
+                   "and write the summary to PROFILE.txt and the call stats to PROFILE.pstats")
+@click.option("--inventory-cache", default=None, type=click.Path(dir_okay=False),
+              help="SQLite file caching the object ids per host and project, so that repeated ingests / deletes "
+                   "don't list all objects again")
+@click.option("--inventory-ttl", default=600, show_default=True, type=click.IntRange(min=0),
+              help="Seconds a cached inventory is used without asking the server")
+@click.option("--session-cache", default=None, type=click.Path(dir_okay=False), envvar="PYRILO_SESSION_CACHE",
+              help="File caching the login session per host (readable by you only), so that subsequent commands "
+                   "skip the login. Also read from PYRILO_SESSION_CACHE")
+@click.option("--session-ttl", default=12 * 3600, show_default=True, type=click.IntRange(min=0),
+              help="Seconds a cached session is reused at most")
 @click.option("--verbose", "-v", is_flag=True, help="Enable verbose debug logging")
 @click.pass_context
-def cli(ctx, host: str, bag_root: str, verbose: bool):
+def cli(ctx, host: str, bag_root: str, catalog_index: str, retries: int, circuit_breaker: bool,
+        metrics_file: str, metrics_format: str, profile: str, inventory_cache: str, inventory_ttl: int,
+        session_cache: str, session_ttl: int, verbose: bool):
     """
     Pyrilo is a command line tool for managing your GAMS5 project.
     """
     setup_logging(verbose)
     ctx.ensure_object(dict)
 
+    metrics = None
+    if metrics_file:
+        metrics = MetricsRegistry()
+        # also written if the command fails (sys.exit), that's when the metrics are most interesting
+        ctx.call_on_close(lambda: write_metrics(metrics, metrics_file, metrics_format))
+
+    profiler = None
+    if profile:
+        profiler = RunProfiler()
+        profiler.start()
+        ctx.call_on_close(lambda: write_profile(profiler, profile))
+
     # Initialize pyrilo-app
     try:
-        pyrilo_app = bootstrap_application(host, bag_root)
+        cache = None
+        if inventory_cache:
+            cache = InventoryCache(inventory_cache, ttl=inventory_ttl)
+            ctx.call_on_close(cache.close)
+
+        pyrilo_app = bootstrap_application(host, bag_root, catalog_index, retries, circuit_breaker, metrics, profiler,
+                                           cache, SessionCache(session_cache, session_ttl) if session_cache else None)
+        ctx.obj['PYRILO_APP'] = pyrilo_app
+
+        # local only commands don't need a session
+        if ctx.invoked_subcommand in LOCAL_COMMANDS:
+            return
 
         # Handle Credentials at the CLI/Entrypoint layer
         # 1. Try Environment Variables first (Best for CI/CD/Docker)
@@ -102,8 +205,6 @@ def cli(ctx, host: str, bag_root: str, verbose: bool):
         # 3. Pass credentials to the service
         pyrilo_app.login(username, password)
 
-        ctx.obj['PYRILO_APP'] = pyrilo_app
-
     except requests.exceptions.ConnectionError:
         logging.critical(f"Could not connect to GAMS host: {host}")
         sys.exit(1)
@@ -119,10 +220,48 @@ def cli(ctx, host: str, bag_root: str, verbose: bool):
 
 @cli.command(name="ingest")
 @click.argument("project", required=True)
+@click.option("--pack-workers", default=1, show_default=True, type=click.IntRange(min=1),
+              help="Number of worker processes zipping bags in parallel to the uploads")
+@click.option("--workers", default=1, show_default=True, type=click.IntRange(min=1),
+              help="Number of bags uploaded concurrently")
+@click.option("--delete-workers", default=None, type=click.IntRange(min=1),
+              help="Number of existing objects deleted concurrently before their re-ingest. Defaults to --workers")
+@click.option("--queue-size", default=None, type=click.IntRange(min=1),
+              help="Maximum number of bags waiting between two ingest stages. Defaults to twice the largest worker count")
+@click.option("--changed-only", is_flag=True, default=False,
+              help="Only ingest bags that changed since their last successful ingest (requires the ingest state db)")
+@click.option("--state-db", default=None, type=click.Path(dir_okay=False),
+              help="SQLite file recording ingested bags. Defaults to <bag_root>/.pyrilo/ingest-state.sqlite with --changed-only")
+@click.option("--resume", is_flag=True, default=False,
+              help="Continue the last ingest run where it stopped (skips bags the journal records as uploaded)")
+@click.option("--retry-failed", is_flag=True, default=False,
+              help="Only ingest the bags that failed in the last ingest run")
+@click.option("--journal", default=None, type=click.Path(dir_okay=False),
+              help="Journal of the ingest progress (per host, keeps the latest run). "
+                   "Defaults to <bag_root>/.pyrilo/journal-<project>.jsonl")
+@click.option("--adaptive", is_flag=True, default=False,
+              help="Treat --workers / --delete-workers as upper bounds and adapt the concurrency to the server load")
+@click.option("--validate", is_flag=True, default=False,
+              help="Validate bags (BagIt structure, checksums, sip.json) before ingesting, invalid bags are skipped as failed")
+@click.option("--validate-workers", default=None, type=click.IntRange(min=1),
+              help="Number of threads hashing files with --validate. Defaults to the number of CPUs")
+@click.option("--package-cache", default=None, type=click.Path(file_okay=False),
+              help="Directory caching zipped bags between runs. Unchanged bags (same manifests) are not zipped again")
+@click.option("--package-cache-size", default=10240, show_default=True, type=click.IntRange(min=0),
+              help="Maximum size of the package cache in MiB, least recently used archives are evicted first")
+@click.option("--integrate", multiple=True, type=click.Choice(IntegrationService.TARGETS),
+              help="Integrate every ingested object into this target right away (repeatable), instead of syncing "
+                   "the whole project afterwards")
+@click.option("--integrate-workers", default=4, show_default=True, type=click.IntRange(min=1),
+              help="Number of objects integrated concurrently with --integrate")
 @click.pass_context
-def ingest(ctx, project: str):
+def ingest(ctx, project: str, pack_workers: int, workers: int, delete_workers: int, queue_size: int,
+           changed_only: bool, state_db: str, resume: bool, retry_failed: bool, journal: str, adaptive: bool, validate: bool,
+           validate_workers: int, package_cache: str, package_cache_size: int, integrate: tuple, integrate_workers: int):
     """Ingest bags for a project."""
     pyrilo_app: Pyrilo = ctx.obj['PYRILO_APP']
+    if resume and retry_failed:
+        raise click.UsageError("--resume and --retry-failed are mutually exclusive.")
     try:
         # We can try to create, but if it fails (e.g. exists), we might want to continue
         try:
@@ -130,13 +269,69 @@ def ingest(ctx, project: str):
         except ProjectAlreadyExistsError:
             logging.info(f"Project {project} already exists (or creation failed non-fatally). Continuing...")
 
-        pyrilo_app.ingest_bags(project)
+        if package_cache:
+            pyrilo_app.use_package_cache(PackageCache(package_cache, package_cache_size * 1024 * 1024))
+
+        if validate:
+            pyrilo_app.use_bag_validator(BagValidator(validate_workers))
+
+        if changed_only and not state_db:
+            state_db = os.path.join(pyrilo_app.local_bagit_files_path or "bags", ".pyrilo", "ingest-state.sqlite")
+        if state_db:
+            pyrilo_app.use_ingest_state_store(IngestStateStore(state_db))
+
+        if not journal:
+            journal = os.path.join(pyrilo_app.local_bagit_files_path or "bags", ".pyrilo", f"journal-{project}.jsonl")
+        try:
+            pyrilo_app.use_ingest_journal(IngestJournal(journal, host=pyrilo_app.client.host))
+        except OSError as e:
+            if resume or retry_failed:
+                raise
+            logging.warning(f"Could not open ingest journal {journal}, continuing without: {e}")
+
+        pyrilo_app.ingest_bags(
+            project,
+            pack_workers=pack_workers,
+            workers=workers,
+            changed_only=changed_only,
+            delete_workers=delete_workers,
+            queue_size=queue_size,
+            resume=resume,
+            retry_failed=retry_failed,
+            adaptive=adaptive,
+            integrate=integrate,
+            integrate_workers=integrate_workers
+        )
         logging.info("Ingest complete.")
     except Exception as e:
         logging.critical(f"Ingest failed: {e}")
         sys.exit(1)
 
 
+@cli.command(name="validate", help="Validates the local bags of a project without contacting GAMS")
+@click.argument("project", required=True)
+@click.option("--workers", default=None, type=click.IntRange(min=1),
+              help="Number of threads hashing files. Defaults to the number of CPUs")
+@click.pass_context
+def validate(ctx, project: str, workers: int):
+    pyrilo_app: Pyrilo = ctx.obj['PYRILO_APP']
+    try:
+        pyrilo_app.use_bag_validator(BagValidator(workers))
+        results = pyrilo_app.validate_bags(project)
+    except Exception as e:
+        logging.critical(f"Validation failed: {e}")
+        sys.exit(1)
+
+    invalid = [result for result in results if not result.valid]
+    for result in invalid:
+        click.echo(f"INVALID {result.bag_path}")
+        for error in result.errors:
+            click.echo(f"  - {error}")
+    click.echo(f"Validated {len(results)} bags: {len(results) - len(invalid)} valid, {len(invalid)} invalid.")
+    if invalid:
+        sys.exit(1)
+
+
 @cli.command(name="create_project", help="Creates a new project on GAMS")
 @click.argument("project", required=True)
 @click.argument("desc", required=False, default="")
@@ -175,13 +370,36 @@ def update_project(ctx, project: str, desc: str):
         sys.exit(1)
 
 
+@cli.command(name="list_objects", help="Prints the ids of all objects of a project on GAMS, one per line")
+@click.argument("project", required=True)
+@click.pass_context
+def list_objects(ctx, project: str):
+    pyrilo_app: Pyrilo = ctx.obj['PYRILO_APP']
+    try:
+        # printed while the listing pages in
+        for object_id in pyrilo_app.iter_objects(project):
+            click.echo(object_id)
+    except Exception as e:
+        logging.error(f"Failed to list objects: {e}")
+        sys.exit(1)
+
+
 @cli.command(name="delete_objects", help="Deletes all objects of a project on GAMS")
 @click.argument("project", required=True)
+@click.option("--workers", default=4, show_default=True, type=click.IntRange(min=1),
+              help="Number of objects deleted concurrently")
+@click.option("--adaptive", is_flag=True, default=False,
+              help="Treat --workers as upper bound and adapt the concurrency to the server load")
+@click.option("--failure-report", default=None, type=click.Path(dir_okay=False),
+              help="Write the objects that could not be deleted (with their errors) to this JSON file")
+@click.option("--disintegrate", multiple=True, type=click.Choice(IntegrationService.TARGETS),
+              help="Disintegrate every deleted object from this target right away (repeatable)")
 @click.pass_context
-def delete_objects(ctx, project: str):
+def delete_objects(ctx, project: str, workers: int, adaptive: bool, failure_report: str, disintegrate: tuple):
     pyrilo_app: Pyrilo = ctx.obj['PYRILO_APP']
     try:
-        pyrilo_app.delete_objects(project)
+        pyrilo_app.delete_objects(project, workers=workers, adaptive=adaptive, failure_report=failure_report,
+                                  disintegrate=disintegrate)
     except Exception as e:
         logging.error(f"Failed to delete objects: {e}")
         sys.exit(1)
@@ -234,6 +452,44 @@ def plexus_search(ctx, project: str, remove: bool):
         logging.error(f"Failed to integrate objects: {e}")
         sys.exit(1)
 
+@sync.command('all', help="Integrates a project into all integration targets at once, within one login")
+@click.argument("project", required=True)
+@click.option("--remove", "-r", default=False, is_flag=True, help="If set, removes all data from the targets instead")
+@click.option("--target", "targets", multiple=True, type=click.Choice(IntegrationService.TARGETS),
+              help="Target to sync (repeatable). Defaults to all targets")
+@click.option("--timeout", "timeouts", multiple=True, metavar="[TARGET=]SECONDS",
+              help="Seconds to wait for a target (repeatable), without TARGET for all targets, 0 waits without limit. "
+                   f"Defaults to {IntegrationService.INTEGRATE_TIMEOUT:.0f}s to integrate, "
+                   f"{IntegrationService.DISINTEGRATE_TIMEOUT:.0f}s to remove")
+@click.pass_context
+def sync_all(ctx, project: str, remove: bool, targets: tuple, timeouts: tuple):
+    pyrilo_app: Pyrilo = ctx.obj['PYRILO_APP']
+    targets = targets or IntegrationService.TARGETS
+    parsed = []
+    for entry in timeouts:
+        target, _, seconds = entry.rpartition("=")
+        if target and target not in IntegrationService.TARGETS:
+            raise click.BadParameter(f"unknown target '{target}'", param_hint="--timeout")
+        try:
+            parsed.append((target, float(seconds)))
+            if parsed[-1][1] < 0:
+                raise ValueError(seconds)
+        except ValueError:
+            raise click.BadParameter(f"expected [TARGET=]SECONDS, got '{entry}'", param_hint="--timeout")
+    # the timeout of a single target overrides the one for all targets
+    target_timeouts = {name: seconds for target, seconds in parsed if not target for name in targets}
+    target_timeouts.update((target, seconds) for target, seconds in parsed if target)
+
+    try:
+        report = pyrilo_app.sync_all(project, targets=targets, remove=remove, timeouts=target_timeouts)
+    except Exception as e:
+        logging.error(f"Failed to sync objects: {e}")
+        sys.exit(1)
+
+    click.echo(report.summary())
+    if not report.succeeded:
+        sys.exit(1)
+
 cli.add_command(ingest)
 cli.add_command(create_project)
 cli.add_command(update_project)
@@ -6,10 +6,20 @@ class PyriloConfigurationError(PyriloError):
     """Raised when the application is misconfigured (e.g. missing generic environment variables)."""
     pass
 
+class PyriloValidationError(PyriloError):
+    """Raised when a local bag fails the pre-flight validation (before anything is sent to the API)."""
+    def __init__(self, message: str, errors: list = None):
+        super().__init__(message)
+        self.errors = errors or []
+
 class PyriloNetworkError(PyriloError):
     """Raised when the server cannot be reached (DNS, Timeout, Connection Refused)."""
     pass
 
+class PyriloCircuitOpenError(PyriloNetworkError):
+    """Raised when the server stayed unavailable for longer than the circuit breaker pauses requests."""
+    pass
+
 class PyriloApiError(PyriloError):
     """Base for HTTP 4xx/5xx errors returned by the API."""
     def __init__(self, message: str, status_code: int = None, response_text: str = None):
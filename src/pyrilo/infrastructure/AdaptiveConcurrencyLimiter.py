@@ -0,0 +1,165 @@
+import contextlib
+import contextvars
+import logging
+import math
+import threading
+import time
+from typing import Iterator, Tuple
+
+from pyrilo.exceptions import PyriloApiError, PyriloNetworkError
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    AIMD (additive increase, multiplicative decrease) limit for the number of requests in flight,
+    similar to TCP congestion control:
+
+    - starts small and doubles the limit per round of successful requests (slow start)
+    - after the first back off, grows by one request per round, as long as the latency stays
+      within latency_tolerance times the lowest latency seen (a growing latency means requests
+      queue up at the server, the limit is then held)
+    - halves the limit on overload signals: 429 / 503 / 504 responses and network failures
+      (timeouts, refused connections), at most once per round of requests
+
+    Threads use slot() around a request, it blocks while the limit is reached. Event loops start
+    new tasks only below the current limit and use slot(wait=False) within the tasks.
+
+    A slot only sees the final outcome of the block. The client retries overloaded requests
+    internally, so it reports every overloaded attempt with report_overload() to the limiters whose
+    slot the current thread (or task) holds.
+    """
+
+    OVERLOAD_STATUS_CODES = {429, 503, 504}
+
+    _held: contextvars.ContextVar[Tuple["AdaptiveConcurrencyLimiter", ...]] = \
+        contextvars.ContextVar("held_limiter_slots", default=())
+
+    min_limit: int
+    max_limit: int
+
+    def __init__(self,
+                 max_limit: int,
+                 initial_limit: int = None,
+                 min_limit: int = 1,
+                 decrease_factor: float = 0.5,
+                 latency_tolerance: float = 2.0,
+                 name: str = "requests") -> None:
+        """
+        :param max_limit: upper bound of requests in flight (e.g. the number of worker threads)
+        :param initial_limit: limit to start with, defaults to min(2, max_limit)
+        :param decrease_factor: factor the limit is multiplied with on overload
+        :param latency_tolerance: latency (relative to the lowest latency seen) up to which the limit still grows
+        """
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.decrease_factor = decrease_factor
+        self.latency_tolerance = latency_tolerance
+        self.name = name
+
+        self._window = float(min(max(initial_limit or 2, self.min_limit), self.max_limit))
+        self._slow_start_threshold = float(self.max_limit)
+        self._in_flight = 0
+        self._baseline_latency = None
+        self._smoothed_latency = None
+        self._last_decrease = float("-inf")
+        self._condition = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        """
+        Current number of requests allowed in flight.
+        """
+        return int(self._window)
+
+    @classmethod
+    def is_overload(cls, error: BaseException) -> bool:
+        """
+        Tells whether an error signals an overloaded (or unreachable) server.
+        """
+        if isinstance(error, PyriloNetworkError):
+            return True
+        return isinstance(error, PyriloApiError) and error.status_code in cls.OVERLOAD_STATUS_CODES
+
+    @classmethod
+    def report_overload(cls, started_at: float) -> None:
+        """
+        Reports an overloaded attempt of a request to the limiters whose slot is held by the caller.
+
+        :param started_at: time.monotonic() at which the attempt was sent
+        """
+        for limiter in cls._held.get():
+            limiter.on_overload(started_at)
+
+    @contextlib.contextmanager
+    def slot(self, wait: bool = True) -> Iterator[None]:
+        """
+        Holds one of the limited slots while the block runs and feeds its outcome (latency or
+        overload error) back into the limit.
+
+        :param wait: block while the limit is reached (False if the caller already checked the limit)
+        """
+        with self._condition:
+            while wait and self._in_flight >= self.limit:
+                self._condition.wait()
+            self._in_flight += 1
+
+        started_at = time.monotonic()
+        token = self._held.set(self._held.get() + (self,))
+        try:
+            yield
+        except BaseException as e:
+            # an overload already reported by the client for this round doesn't decrease the limit again
+            if self.is_overload(e):
+                self.on_overload(started_at)
+            raise
+        else:
+            self.on_success(time.monotonic() - started_at)
+        finally:
+            self._held.reset(token)
+            self._release()
+
+    def on_success(self, latency: float) -> None:
+        """
+        Reports a successful request and its latency in seconds.
+        """
+        with self._condition:
+            if self._baseline_latency is None:
+                self._baseline_latency = self._smoothed_latency = latency
+            else:
+                self._smoothed_latency += 0.2 * (latency - self._smoothed_latency)
+                # the baseline follows the lowest latency, but recovers slowly (e.g. after a slow phase of the server)
+                if latency < self._baseline_latency:
+                    self._baseline_latency = latency
+                else:
+                    self._baseline_latency += 0.01 * (latency - self._baseline_latency)
+
+            # only grow when the limit is actually used and latency is stable
+            saturated = self._in_flight >= self.limit
+            stable = self._smoothed_latency <= self._baseline_latency * self.latency_tolerance
+            if not saturated or not stable or self._window >= self.max_limit:
+                return
+
+            if self._window < self._slow_start_threshold:
+                self._window += 1
+            else:
+                self._window += 1 / self._window
+            self._window = min(self._window, float(self.max_limit))
+            self._condition.notify_all()
+
+    def on_overload(self, started_at: float = None) -> None:
+        """
+        Reports an overload signal. Requests that started before the last decrease don't decrease
+        the limit again, so a burst of failures of the same round only halves it once.
+        """
+        with self._condition:
+            if started_at is not None and started_at < self._last_decrease:
+                return
+            self._window = max(float(self.min_limit), math.floor(self._window * self.decrease_factor))
+            self._slow_start_threshold = self._window
+            self._last_decrease = time.monotonic()
+        logging.warning(f"Server overloaded, reducing concurrent {self.name} to {self.limit}")
+
+    def _release(self) -> None:
+        with self._condition:
+            self._in_flight -= 1
+            self._condition.notify_all()
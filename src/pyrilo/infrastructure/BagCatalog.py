@@ -0,0 +1,134 @@
+import json
+import logging
+import os
+import tempfile
+from typing import Any, Dict, List, Optional, Tuple
+
+from pyrilo.infrastructure.BagEntry import BagEntry
+
+
+class BagCatalog:
+    """
+    Discovers BagIt bags (folders containing a bagit.txt) at any depth below a bag root.
+
+    Directories are listed with os.scandir, so file types come from the directory listing and no
+    extra stat call per entry is needed. Bags are not descended into and their size is taken from
+    the Payload-Oxum of bag-info.txt instead of walking the payload.
+
+    If an index path is configured, the scan result is persisted together with the modification
+    time of every directory. Later scans only re-list directories whose modification time changed,
+    all others are taken from the index. (Note: in-place edits of bag-info.txt don't change the
+    modification time of the bag folder, use scan(full=True) to force a complete rescan.)
+    """
+
+    INDEX_VERSION = 1
+
+    BAG_DECLARATION = "bagit.txt"
+    BAG_INFO = "bag-info.txt"
+
+    root: str
+    index_path: Optional[str]
+
+    def __init__(self, root: str, index_path: str = None) -> None:
+        self.root = root
+        self.index_path = index_path
+
+    def scan(self, full: bool = False) -> List[BagEntry]:
+        """
+        Returns all bags below the bag root, sorted by their relative path.
+        """
+        if not os.path.isdir(self.root):
+            logging.warning(f"Bag root does not exist: {self.root}")
+            return []
+
+        cached_dirs = {} if full else self._load_index()
+        scanned_dirs: Dict[str, Dict[str, Any]] = {}
+        bags: List[BagEntry] = []
+        relisted = 0
+
+        stack = [""]
+        while stack:
+            relative_path = stack.pop()
+            try:
+                mtime_ns = os.stat(self._absolute(relative_path)).st_mtime_ns
+            except FileNotFoundError:
+                continue
+
+            record = cached_dirs.get(relative_path)
+            if record is None or record["mtime_ns"] != mtime_ns:
+                record = self._list_directory(relative_path, mtime_ns)
+                relisted += 1
+
+            scanned_dirs[relative_path] = record
+            if record.get("bag") is not None:
+                bags.append(BagEntry(relative_path, mtime_ns, *record["bag"]))
+            else:
+                stack.extend(record["subdirs"])
+
+        logging.debug(f"Bag catalog scan found {len(bags)} bags ({relisted} of {len(scanned_dirs)} directories listed)")
+
+        self._save_index(scanned_dirs)
+        return sorted(bags, key=lambda bag: bag.relative_path)
+
+    def _list_directory(self, relative_path: str, mtime_ns: int) -> Dict[str, Any]:
+        subdirs = []
+        is_bag = False
+        with os.scandir(self._absolute(relative_path)) as entries:
+            for entry in entries:
+                if entry.name == self.BAG_DECLARATION and entry.is_file():
+                    is_bag = True
+                elif entry.is_dir(follow_symlinks=False) and not entry.name.startswith("."):
+                    subdirs.append(f"{relative_path}/{entry.name}" if relative_path else entry.name)
+
+        if is_bag:
+            return {"mtime_ns": mtime_ns, "subdirs": [], "bag": list(self._read_payload_oxum(relative_path))}
+        return {"mtime_ns": mtime_ns, "subdirs": subdirs, "bag": None}
+
+    def _read_payload_oxum(self, relative_path: str) -> Tuple[Optional[int], Optional[int]]:
+        """
+        Reads the Payload-Oxum ('<octet count>.<stream count>') from bag-info.txt.
+        """
+        bag_info_path = os.path.join(self._absolute(relative_path), self.BAG_INFO)
+        try:
+            with open(bag_info_path, encoding="utf-8") as f:
+                for line in f:
+                    label, _, value = line.partition(":")
+                    if label.strip().lower() == "payload-oxum":
+                        octets, _, streams = value.strip().partition(".")
+                        return int(octets), int(streams)
+        except (OSError, ValueError) as e:
+            logging.warning(f"Could not read Payload-Oxum of bag {relative_path}: {e}")
+        return None, None
+
+    def _load_index(self) -> Dict[str, Dict[str, Any]]:
+        if not self.index_path or not os.path.exists(self.index_path):
+            return {}
+        try:
+            with open(self.index_path, encoding="utf-8") as f:
+                index = json.load(f)
+        except (OSError, ValueError) as e:
+            logging.warning(f"Ignoring unreadable bag catalog index {self.index_path}: {e}")
+            return {}
+
+        if index.get("version") != self.INDEX_VERSION or index.get("root") != os.path.abspath(self.root):
+            return {}
+        return index.get("dirs", {})
+
+    def _save_index(self, dirs: Dict[str, Dict[str, Any]]) -> None:
+        if not self.index_path:
+            return
+
+        index_dir = os.path.dirname(os.path.abspath(self.index_path))
+        os.makedirs(index_dir, exist_ok=True)
+        # write and rename, so that an interrupted run never leaves a truncated index behind
+        fd, tmp_path = tempfile.mkstemp(suffix=".tmp", dir=index_dir)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"version": self.INDEX_VERSION, "root": os.path.abspath(self.root), "dirs": dirs}, f)
+            os.replace(tmp_path, self.index_path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+    def _absolute(self, relative_path: str) -> str:
+        return os.path.join(self.root, relative_path) if relative_path else self.root
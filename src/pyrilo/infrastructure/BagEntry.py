@@ -0,0 +1,37 @@
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass
+class BagEntry:
+    """
+    Represents a BagIt bag found in the local bag structure.
+    """
+
+    relative_path: str
+    """
+    Path of the bag folder relative to the bag root, with forward slashes e.g. 'demo/persons/demo.person.1'
+    """
+
+    mtime_ns: int
+    """
+    Modification time of the bag folder in nanoseconds.
+    """
+
+    payload_bytes: Optional[int] = None
+    """
+    Payload size in bytes as declared by the Payload-Oxum of bag-info.txt (None if not declared).
+    """
+
+    payload_files: Optional[int] = None
+    """
+    Number of payload files as declared by the Payload-Oxum of bag-info.txt (None if not declared).
+    """
+
+    @property
+    def name(self) -> str:
+        """
+        Name of the bag folder, which is the id of the digital object e.g. 'demo.person.1'
+        """
+        return os.path.basename(self.relative_path)
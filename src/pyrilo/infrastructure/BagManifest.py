@@ -0,0 +1,62 @@
+import glob
+import hashlib
+import os
+from typing import List, Optional
+
+
+class BagManifest:
+    """
+    Identifies the content of a bag by its manifest / tag manifest files (which list the checksums
+    of all payload and tag files), without reading the payload itself.
+    """
+
+    # tag files covering the bag contents; manifests (payload checksums) are hashed as a whole
+    TAG_FILES = ["bagit.txt", "bag-info.txt"]
+    MANIFEST_PATTERNS = ["manifest-*.txt", "tagmanifest-*.txt"]
+
+    @classmethod
+    def manifest_paths(cls, folder_path: str) -> List[str]:
+        """
+        Lists the manifest and tag manifest files of a bag, sorted by name.
+        """
+        return sorted(
+            path for pattern in cls.MANIFEST_PATTERNS
+            for path in glob.glob(os.path.join(glob.escape(folder_path), pattern))
+        )
+
+    @classmethod
+    def digest(cls, folder_path: str, salt: str = "") -> Optional[str]:
+        """
+        Hashes the manifests and tag files of a bag (plus an optional salt) into a sha256 hex digest.
+        Returns None for bags without any manifest, since their content cannot be identified
+        without hashing the whole payload.
+        """
+        manifest_paths = cls.manifest_paths(folder_path)
+        if not manifest_paths:
+            return None
+
+        digest = hashlib.sha256()
+        digest.update(f"{salt}\0".encode("utf-8"))
+        for path in manifest_paths + [os.path.join(folder_path, name) for name in cls.TAG_FILES]:
+            if not os.path.exists(path):
+                continue
+            digest.update(os.path.basename(path).encode("utf-8") + b"\0")
+            with open(path, "rb") as f:
+                digest.update(hashlib.sha256(f.read()).digest())
+
+        return digest.hexdigest()
+
+    @classmethod
+    def stat_signature(cls, folder_path: str) -> str:
+        """
+        Cheap change indicator of a bag: size and modification time of the bag folder, its manifests
+        and tag files. Only stat calls, no file is read.
+        """
+        parts = []
+        for path in [folder_path] + cls.manifest_paths(folder_path) + [os.path.join(folder_path, name) for name in cls.TAG_FILES]:
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            parts.append(f"{os.path.basename(path)}:{stat.st_size}:{stat.st_mtime_ns}")
+        return "|".join(parts)
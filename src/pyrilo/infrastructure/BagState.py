@@ -0,0 +1,34 @@
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass
+class BagState:
+    """
+    Local state of a bag as recorded by the IngestStateStore.
+    """
+
+    bag_path: str
+    """
+    Path of the bag folder relative to the bag root e.g. 'demo.person.1'
+    """
+
+    stat_signature: str
+    """
+    Sizes and modification times of the bag folder, manifests and tag files (see BagManifest.stat_signature).
+    """
+
+    manifest_digest: Optional[str]
+    """
+    Digest of the manifests and tag files (see BagManifest.digest), None for bags without manifest.
+    """
+
+    payload_oxum: Optional[str]
+    """
+    Payload-Oxum ('<octet count>.<stream count>') from bag-info.txt, None if not declared.
+    """
+
+    ingested_at: Optional[float] = None
+    """
+    Unix timestamp of the last successful ingest, None if the bag was never ingested.
+    """
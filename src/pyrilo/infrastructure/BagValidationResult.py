@@ -0,0 +1,33 @@
+from dataclasses import dataclass, field
+from typing import List
+
+
+@dataclass
+class BagValidationResult:
+    """
+    Outcome of the pre-flight validation of a single bag.
+    """
+
+    bag_path: str
+    """
+    Path of the validated bag folder.
+    """
+
+    errors: List[str] = field(default_factory=list)
+    """
+    Human readable validation errors e.g. 'manifest-md5.txt: checksum mismatch for data/content/DC.xml'
+    """
+
+    files_hashed: int = 0
+    """
+    Number of files whose checksums were verified.
+    """
+
+    bytes_hashed: int = 0
+    """
+    Number of bytes read while verifying checksums.
+    """
+
+    @property
+    def valid(self) -> bool:
+        return not self.errors
@@ -0,0 +1,315 @@
+import collections
+import glob
+import hashlib
+import json
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from pyrilo.infrastructure.BagValidationResult import BagValidationResult
+
+# (manifest name, relative path, expected checksum, future of (size, digests), algorithm)
+_ChecksumCheck = Tuple[str, str, str, Future, str]
+
+
+class BagValidator:
+    """
+    Local pre-flight validation of BagIt bags, done before anything is deleted or uploaded:
+
+    - bagit.txt declares BagIt-Version and Tag-File-Character-Encoding
+    - bag-info.txt declares a Payload-Oxum matching the payload on disk
+    - every manifest-*.txt / tagmanifest-*.txt checksum matches and every payload file is listed
+    - data/meta/sip.json is valid and all contentFiles[].bagpath exist
+
+    Checksums are computed on a shared thread pool. Every file is read once with large buffered
+    reads, feeding all manifest algorithms at the same time (hashlib releases the GIL while hashing,
+    so the threads really run in parallel).
+    """
+
+    BAG_DECLARATION = "bagit.txt"
+    BAG_INFO = "bag-info.txt"
+    PAYLOAD_DIR = "data"
+    SIP_PATH = "data/meta/sip.json"
+    MANIFEST_PATTERNS = ["manifest-*.txt", "tagmanifest-*.txt"]
+
+    REQUIRED_DECLARATION_TAGS = ["BagIt-Version", "Tag-File-Character-Encoding"]
+    REQUIRED_SIP_FIELDS = ["recid", "contentFiles"]
+    REQUIRED_CONTENT_FILE_FIELDS = ["dsid", "bagpath"]
+
+    workers: int
+    buffer_size: int
+
+    def __init__(self, workers: int = None, buffer_size: int = 1024 * 1024) -> None:
+        """
+        :param workers: hashing threads, defaults to the number of CPUs
+        :param buffer_size: size of a single read while hashing a file
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.buffer_size = buffer_size
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="pyrilo-hash")
+
+    def validate(self, folder_path: str) -> BagValidationResult:
+        """
+        Validates a single bag.
+        """
+        return self._finish(*self._start(folder_path))
+
+    def validate_many(self, folder_paths: Iterable[str]) -> Iterator[BagValidationResult]:
+        """
+        Validates bags in given order. Files of the following bags are already hashed while the
+        results of earlier bags are collected, so the thread pool is also busy for many small bags.
+        """
+        pending: Deque[Tuple[BagValidationResult, List[_ChecksumCheck]]] = collections.deque()
+        for folder_path in folder_paths:
+            pending.append(self._start(folder_path))
+            if len(pending) > self.workers:
+                yield self._finish(*pending.popleft())
+        while pending:
+            yield self._finish(*pending.popleft())
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+
+    def _start(self, folder_path: str) -> Tuple[BagValidationResult, List[_ChecksumCheck]]:
+        """
+        Runs the cheap structural checks and submits the hashing of all manifest entries.
+        Returns the (preliminary) result and the pending checksum checks as (manifest name,
+        relative path, expected checksum, future of the file digests, algorithm).
+        """
+        result = BagValidationResult(folder_path)
+        if not os.path.isdir(folder_path):
+            result.errors.append("bag folder does not exist")
+            return result, []
+
+        self._check_declaration(folder_path, result)
+        payload_files = self._list_payload(folder_path)
+        self._check_bag_info(folder_path, payload_files, result)
+        self._check_sip(folder_path, result)
+
+        manifests = self._read_manifests(folder_path, result)
+        algorithms_by_path: Dict[str, List[str]] = {}
+        for name, (algorithm, entries) in manifests.items():
+            if name.startswith("manifest-"):
+                for missing in sorted(set(payload_files) - set(entries)):
+                    result.errors.append(f"{name}: payload file {missing} is not listed")
+            for relative_path in entries:
+                algorithms_by_path.setdefault(relative_path, []).append(algorithm)
+
+        digests: Dict[str, Future] = {}
+        for relative_path, algorithms in algorithms_by_path.items():
+            absolute_path = os.path.join(folder_path, *relative_path.split("/"))
+            if not os.path.isfile(absolute_path):
+                continue
+            digests[relative_path] = self._executor.submit(self._hash_file, absolute_path, sorted(set(algorithms)))
+
+        checks = []
+        for name, (algorithm, entries) in manifests.items():
+            for relative_path, expected in entries.items():
+                if relative_path not in digests:
+                    result.errors.append(f"{name}: listed file {relative_path} does not exist")
+                    continue
+                checks.append((name, relative_path, expected, digests[relative_path], algorithm))
+
+        return result, checks
+
+    def _finish(self, result: BagValidationResult, checks: List[_ChecksumCheck]) -> BagValidationResult:
+        hashed = set()
+        for name, relative_path, expected, future, algorithm in checks:
+            try:
+                size, file_digests = future.result()
+            except OSError as e:
+                result.errors.append(f"{name}: could not read {relative_path}: {e}")
+                continue
+            if relative_path not in hashed:
+                hashed.add(relative_path)
+                result.files_hashed += 1
+                result.bytes_hashed += size
+            if file_digests[algorithm] != expected.lower():
+                result.errors.append(f"{name}: checksum mismatch for {relative_path}")
+        return result
+
+    def _hash_file(self, path: str, algorithms: List[str]) -> Tuple[int, Dict[str, str]]:
+        hashes = {algorithm: hashlib.new(algorithm) for algorithm in algorithms}
+        buffer = bytearray(self.buffer_size)
+        view = memoryview(buffer)
+        size = 0
+        with open(path, "rb", buffering=0) as f:
+            while True:
+                n = f.readinto(buffer)
+                if not n:
+                    break
+                size += n
+                for h in hashes.values():
+                    h.update(view[:n])
+        return size, {algorithm: h.hexdigest() for algorithm, h in hashes.items()}
+
+    def _check_declaration(self, folder_path: str, result: BagValidationResult) -> None:
+        tags = self._read_tag_file(folder_path, self.BAG_DECLARATION, result)
+        if tags is None:
+            return
+        for tag in self.REQUIRED_DECLARATION_TAGS:
+            if tag.lower() not in tags:
+                result.errors.append(f"{self.BAG_DECLARATION}: {tag} is missing")
+
+    def _check_bag_info(self, folder_path: str, payload_files: Dict[str, int], result: BagValidationResult) -> None:
+        tags = self._read_tag_file(folder_path, self.BAG_INFO, result)
+        if tags is None:
+            return
+
+        oxum = tags.get("payload-oxum")
+        if oxum is None:
+            result.errors.append(f"{self.BAG_INFO}: Payload-Oxum is missing")
+            return
+
+        octets, _, streams = oxum.partition(".")
+        if not octets.isdigit() or not streams.isdigit():
+            result.errors.append(f"{self.BAG_INFO}: malformed Payload-Oxum '{oxum}'")
+            return
+
+        actual = f"{sum(payload_files.values())}.{len(payload_files)}"
+        if actual != f"{int(octets)}.{int(streams)}":
+            result.errors.append(f"{self.BAG_INFO}: Payload-Oxum {oxum} does not match the payload ({actual})")
+
+    def _check_sip(self, folder_path: str, result: BagValidationResult) -> None:
+        sip_path = os.path.join(folder_path, *self.SIP_PATH.split("/"))
+        try:
+            with open(sip_path, encoding="utf-8") as f:
+                sip = json.load(f)
+        except FileNotFoundError:
+            result.errors.append(f"{self.SIP_PATH} is missing")
+            return
+        except (OSError, ValueError) as e:
+            result.errors.append(f"{self.SIP_PATH}: could not be parsed: {e}")
+            return
+
+        if not isinstance(sip, dict):
+            result.errors.append(f"{self.SIP_PATH}: expected a JSON object")
+            return
+        for field_name in self.REQUIRED_SIP_FIELDS:
+            if field_name not in sip:
+                result.errors.append(f"{self.SIP_PATH}: {field_name} is missing")
+
+        content_files = sip.get("contentFiles", [])
+        if not isinstance(content_files, list):
+            result.errors.append(f"{self.SIP_PATH}: contentFiles must be a list")
+            return
+        for index, content_file in enumerate(content_files):
+            if not isinstance(content_file, dict):
+                result.errors.append(f"{self.SIP_PATH}: contentFiles[{index}] must be an object")
+                continue
+            for field_name in self.REQUIRED_CONTENT_FILE_FIELDS:
+                if not content_file.get(field_name):
+                    result.errors.append(f"{self.SIP_PATH}: contentFiles[{index}].{field_name} is missing")
+            bagpath = content_file.get("bagpath")
+            if bagpath and not self._is_payload_file(folder_path, bagpath):
+                result.errors.append(f"{self.SIP_PATH}: contentFiles[{index}].bagpath {bagpath} does not exist")
+
+    def _read_manifests(self, folder_path: str, result: BagValidationResult) -> Dict[str, Tuple[str, Dict[str, str]]]:
+        """
+        Reads all manifests into {manifest name: (algorithm, {relative path: checksum})}.
+        """
+        manifests = {}
+        paths = sorted(
+            path for pattern in self.MANIFEST_PATTERNS
+            for path in glob.glob(os.path.join(glob.escape(folder_path), pattern))
+        )
+        if not any(os.path.basename(path).startswith("manifest-") for path in paths):
+            result.errors.append("no payload manifest (manifest-<algorithm>.txt) found")
+
+        for path in paths:
+            name = os.path.basename(path)
+            algorithm = name.split("-", 1)[1][:-len(".txt")].lower()
+            if algorithm not in hashlib.algorithms_available:
+                result.errors.append(f"{name}: unsupported checksum algorithm {algorithm}")
+                continue
+
+            entries = {}
+            try:
+                with open(path, encoding="utf-8") as f:
+                    for line_number, line in enumerate(f, start=1):
+                        line = line.rstrip("\r\n")
+                        if not line.strip():
+                            continue
+                        checksum, _, relative_path = line.partition(" ")
+                        relative_path = self._decode_path(relative_path.lstrip(" \t"))
+                        if not checksum or not relative_path:
+                            result.errors.append(f"{name}: malformed line {line_number}")
+                        elif not self._is_inside_bag(relative_path):
+                            result.errors.append(f"{name}: path {relative_path} points outside of the bag")
+                        else:
+                            entries[relative_path] = checksum
+            except (OSError, UnicodeDecodeError) as e:
+                result.errors.append(f"{name}: could not be read: {e}")
+                continue
+            manifests[name] = (algorithm, entries)
+        return manifests
+
+    def _read_tag_file(self, folder_path: str, name: str, result: BagValidationResult) -> Optional[Dict[str, str]]:
+        """
+        Reads the 'Label: value' lines of a tag file (continuation lines start with whitespace)
+        into a dict of lower cased labels.
+        """
+        tags: Dict[str, str] = {}
+        label = None
+        try:
+            with open(os.path.join(folder_path, name), encoding="utf-8") as f:
+                for line in f:
+                    line = line.rstrip("\r\n")
+                    if not line.strip():
+                        continue
+                    if line[0] in " \t" and label is not None:
+                        tags[label] += " " + line.strip()
+                        continue
+                    label, separator, value = line.partition(":")
+                    if not separator:
+                        result.errors.append(f"{name}: malformed line '{line}'")
+                        label = None
+                        continue
+                    label = label.strip().lower()
+                    tags[label] = value.strip()
+        except FileNotFoundError:
+            result.errors.append(f"{name} is missing")
+            return None
+        except (OSError, UnicodeDecodeError) as e:
+            result.errors.append(f"{name}: could not be read: {e}")
+            return None
+        return tags
+
+    def _list_payload(self, folder_path: str) -> Dict[str, int]:
+        """
+        Returns {relative path: size} of all files below data/.
+        """
+        payload = {}
+        stack = [self.PAYLOAD_DIR]
+        while stack:
+            relative_dir = stack.pop()
+            try:
+                entries = os.scandir(os.path.join(folder_path, *relative_dir.split("/")))
+            except FileNotFoundError:
+                continue
+            with entries:
+                for entry in entries:
+                    relative_path = f"{relative_dir}/{entry.name}"
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(relative_path)
+                    elif entry.is_file():
+                        payload[relative_path] = entry.stat().st_size
+        return payload
+
+    def _is_payload_file(self, folder_path: str, relative_path: str) -> bool:
+        return (
+            relative_path.startswith(f"{self.PAYLOAD_DIR}/")
+            and self._is_inside_bag(relative_path)
+            and os.path.isfile(os.path.join(folder_path, *relative_path.split("/")))
+        )
+
+    @staticmethod
+    def _is_inside_bag(relative_path: str) -> bool:
+        return not relative_path.startswith("/") and ".." not in relative_path.split("/")
+
+    @staticmethod
+    def _decode_path(path: str) -> str:
+        # manifests percent-encode CR, LF and % in file names (RFC 8493, section 2.1.3)
+        if "%" not in path:
+            return path
+        return path.replace("%0A", "\n").replace("%0a", "\n").replace("%0D", "\r").replace("%0d", "\r").replace("%25", "%")
@@ -0,0 +1,38 @@
+import time
+from dataclasses import dataclass, field
+from typing import Optional, Set
+
+
+@dataclass
+class CachedInventory:
+    """
+    Object ids of a project as last listed from (or revalidated with) the server.
+    """
+
+    object_ids: Set[str] = field(default_factory=set)
+    """
+    Ids of the objects of the project, kept up to date by our own ingests and deletes.
+    """
+
+    fetched_at: float = 0.0
+    """
+    Unix time of the last full listing or successful revalidation.
+    """
+
+    etag: Optional[str] = None
+    """
+    ETag of the listing, if the server sent one and the listing fit in one page (for If-None-Match).
+    """
+
+    last_modified: Optional[str] = None
+    """
+    Last-Modified of the listing, if the server sent one and the listing fit in one page (for If-Modified-Since).
+    """
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.fetched_at
+
+    @property
+    def revalidatable(self) -> bool:
+        return bool(self.etag or self.last_modified)
@@ -0,0 +1,123 @@
+import json
+import mimetypes
+import os
+import zipfile
+import zlib
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Set, Tuple
+
+
+DEFAULT_STORED_MIME_TYPES = {
+    "image/jpeg",
+    "image/png",
+    "image/gif",
+    "image/webp",
+    "image/tiff",
+    "image/jp2",
+    "application/pdf",
+    "application/zip",
+    "application/gzip",
+    "audio/mpeg",
+    "audio/mp4",
+    "video/mp4",
+    "video/mpeg",
+    "video/quicktime",
+    "video/webm",
+}
+
+
+@dataclass
+class CompressionPolicy:
+    """
+    Decides per file how it is compressed when a bag is zipped.
+
+    Payloads that are already compressed (images, pdf, audio / video) gain almost nothing from
+    deflate but cost a lot of CPU time, so they are stored as is.
+    """
+
+    stored_mime_types: Set[str] = field(default_factory=lambda: set(DEFAULT_STORED_MIME_TYPES))
+    """
+    Mime types that are written with ZIP_STORED, e.g. 'image/jpeg'. 'image/*' matches a whole family.
+    """
+
+    stored_extensions: Set[str] = field(default_factory=set)
+    """
+    File extensions (including the dot, case-insensitive) that are written with ZIP_STORED, e.g. '.cr2'.
+    """
+
+    default_level: int = 6
+    """
+    Deflate level (0-9) for all files without a more specific entry in levels.
+    """
+
+    levels: Dict[str, int] = field(default_factory=dict)
+    """
+    Deflate level per extension ('.xml') or mime type ('text/xml', 'text/*').
+    """
+
+    sample_size: int = 0
+    """
+    If > 0, the first sample_size bytes of every deflate candidate are test-compressed and the file
+    is stored if the sample does not shrink below min_ratio. 0 disables sampling.
+    """
+
+    min_ratio: float = 0.9
+    """
+    Maximum compressed / original size ratio of the sample that still counts as worth compressing.
+    """
+
+    def resolve(self, file_path: str) -> Tuple[int, Optional[int]]:
+        """
+        Returns compress type and compress level (as accepted by ZipFile.write) for given file.
+        """
+        extension = os.path.splitext(file_path)[1].lower()
+        mime_type, _ = mimetypes.guess_type(file_path, strict=False)
+
+        if extension in self._normalized_extensions() or self._matches(mime_type, self.stored_mime_types):
+            return zipfile.ZIP_STORED, None
+
+        if self.sample_size > 0 and not self._sample_shrinks(file_path):
+            return zipfile.ZIP_STORED, None
+
+        return zipfile.ZIP_DEFLATED, self._level_for(extension, mime_type)
+
+    def fingerprint(self) -> str:
+        """
+        Stable textual representation of the policy, e.g. to key caches of archives built with it.
+        """
+        return json.dumps({
+            "stored_mime_types": sorted(self.stored_mime_types),
+            "stored_extensions": sorted(self._normalized_extensions()),
+            "default_level": self.default_level,
+            "levels": self.levels,
+            "sample_size": self.sample_size,
+            "min_ratio": self.min_ratio,
+        }, sort_keys=True)
+
+    def _level_for(self, extension: str, mime_type: Optional[str]) -> int:
+        if extension in self.levels:
+            return self.levels[extension]
+        if mime_type:
+            if mime_type in self.levels:
+                return self.levels[mime_type]
+            family = mime_type.split("/")[0] + "/*"
+            if family in self.levels:
+                return self.levels[family]
+        return self.default_level
+
+    def _sample_shrinks(self, file_path: str) -> bool:
+        with open(file_path, "rb") as f:
+            sample = f.read(self.sample_size)
+        if not sample:
+            return True
+        # level 1 is a cheap, good enough estimate of the achievable ratio
+        return len(zlib.compress(sample, 1)) <= len(sample) * self.min_ratio
+
+    def _normalized_extensions(self) -> Set[str]:
+        return {ext.lower() if ext.startswith(".") else "." + ext.lower() for ext in self.stored_extensions}
+
+    @staticmethod
+    def _matches(mime_type: Optional[str], patterns: Set[str]) -> bool:
+        if not mime_type:
+            return False
+        return mime_type in patterns or mime_type.split("/")[0] + "/*" in patterns
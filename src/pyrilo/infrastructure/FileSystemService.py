@@ -2,7 +2,13 @@ import os
 import io
 import zipfile
 import logging
-from typing import List
+import shutil
+import sys
+import tempfile
+from typing import BinaryIO, List, Optional, Tuple
+
+from pyrilo.infrastructure.CompressionPolicy import CompressionPolicy
+from pyrilo.infrastructure.MetricsRegistry import MetricsRegistry
 
 
 class FileSystemService:
@@ -10,6 +16,18 @@ class FileSystemService:
     Encapsulates file system operations to isolate side effects (IO) from business logic.
     """
 
+    # fixed metadata of zip entries, so that archives only depend on the file contents
+    ZIP_ENTRY_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+    ZIP_ENTRY_ATTRIBUTES = 0o100644 << 16
+    ZIP_COPY_BUFFER_SIZE = 1024 * 1024
+
+    compression_policy: CompressionPolicy
+    metrics: Optional[MetricsRegistry]
+
+    def __init__(self, compression_policy: CompressionPolicy = None, metrics: MetricsRegistry = None) -> None:
+        self.compression_policy = compression_policy or CompressionPolicy()
+        self.metrics = metrics
+
     def list_subdirectories(self, path: str) -> List[str]:
         """
         Returns a list of subdirectory names in the given path.
@@ -18,10 +36,9 @@ class FileSystemService:
             logging.warning(f"Path does not exist: {path}")
             return []
 
-        return [
-            name for name in os.listdir(path)
-            if os.path.isdir(os.path.join(path, name))
-        ]
+        # scandir provides the file type from the directory listing, no stat call per entry
+        with os.scandir(path) as entries:
+            return [entry.name for entry in entries if entry.is_dir()]
 
     def create_zip_from_folder(self, folder_path: str) -> bytes:
         """
@@ -30,21 +47,73 @@ class FileSystemService:
         Refactoring Benefit:
         - Uses io.BytesIO instead of tempfile, avoiding disk IO entirely.
         - Fixes the Windows 'PermissionError' caused by reading a file while it is still open.
+
+        Only suitable for small folders, use create_spooled_zip_from_folder for bags of arbitrary size.
+        """
+        # In-memory buffer
+        mem_zip = io.BytesIO()
+        self.write_zip_from_folder(folder_path, mem_zip)
+        return mem_zip.getvalue()
+
+    def create_spooled_zip_from_folder(self, folder_path: str, max_memory_size: int) -> BinaryIO:
+        """
+        Zips the contents of a folder into a spooled temporary file.
+
+        The archive is kept in memory up to max_memory_size bytes and rolled over to an anonymous
+        temporary file on disk above that, so memory stays flat regardless of the bag size.
+        The returned file is positioned at its start; the caller is responsible for closing it
+        (which also removes the temporary file).
+        """
+        spooled_zip = tempfile.SpooledTemporaryFile(max_size=max_memory_size, mode="w+b")
+        try:
+            self.write_zip_from_folder(folder_path, spooled_zip)
+        except BaseException:
+            spooled_zip.close()
+            raise
+
+        spooled_zip.seek(0)
+        return spooled_zip
+
+    def write_zip_from_folder(self, folder_path: str, target: BinaryIO) -> None:
+        """
+        Writes the contents of a folder as zip archive into given (seekable) binary file object.
+        Compression of every file is decided by the configured compression policy.
+
+        Archives are deterministic: entries are sorted and timestamps / permissions are fixed,
+        so the same folder content always produces byte-identical archives.
         """
         if not os.path.exists(folder_path):
             raise FileNotFoundError(f"Folder not found: {folder_path}")
 
-        # In-memory buffer
-        mem_zip = io.BytesIO()
+        with MetricsRegistry.timed(self.metrics, "zip"), zipfile.ZipFile(target, 'w', zipfile.ZIP_DEFLATED) as zipf:
+            for file_path, archive_name in self._list_archive_entries(folder_path):
+                compress_type, compress_level = self.compression_policy.resolve(file_path)
+
+                zip_info = zipfile.ZipInfo.from_file(file_path, archive_name, strict_timestamps=False)
+                zip_info.date_time = self.ZIP_ENTRY_DATE_TIME
+                zip_info.external_attr = self.ZIP_ENTRY_ATTRIBUTES
+                zip_info.create_system = 3  # unix, regardless of the platform zipping the bag
+                zip_info.compress_type = compress_type
+                if compress_level is not None:
+                    # ZipFile.open takes the level from the ZipInfo, public since Python 3.13
+                    if sys.version_info >= (3, 13):
+                        zip_info.compress_level = compress_level
+                    else:
+                        zip_info._compresslevel = compress_level
+
+                # streamed, large files aren't read into memory
+                with open(file_path, "rb") as source, zipf.open(zip_info, "w") as entry:
+                    shutil.copyfileobj(source, entry, self.ZIP_COPY_BUFFER_SIZE)
 
-        with zipfile.ZipFile(mem_zip, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            for root, dirs, files in os.walk(folder_path):
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    # Calculate relative path for the zip archive to preserve structure
-                    archive_name = os.path.relpath(file_path, folder_path)
-                    zipf.write(file_path, archive_name)
-
-        # Reset pointer to beginning of the stream so it can be read
-        mem_zip.seek(0)
-        return mem_zip.read()
\ No newline at end of file
+    def _list_archive_entries(self, folder_path: str) -> List[Tuple[str, str]]:
+        """
+        Lists (file path, archive name) of all files below folder_path, sorted by archive name.
+        """
+        entries = []
+        for root, dirs, files in os.walk(folder_path):
+            for file in files:
+                file_path = os.path.join(root, file)
+                # Calculate relative path for the zip archive to preserve structure
+                archive_name = os.path.relpath(file_path, folder_path).replace(os.sep, "/")
+                entries.append((file_path, archive_name))
+        return sorted(entries, key=lambda entry: entry[1])
@@ -0,0 +1,38 @@
+import bisect
+from typing import Dict, List, Sequence
+
+
+class Histogram:
+    """
+    Cumulative histogram with fixed upper bounds, as exported by Prometheus (not thread-safe on
+    its own, the MetricsRegistry guards all updates).
+    """
+
+    # seconds, from fast HEAD requests up to large uploads
+    DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+    buckets: Sequence[float]
+    count: int
+    sum: float
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self._bucket_counts: List[int] = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self._bucket_counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative_counts(self) -> Dict[str, int]:
+        """
+        Number of observations less or equal than each upper bound, keyed by the formatted bound ('+Inf' last).
+        """
+        counts = {}
+        total = 0
+        for bound, bucket_count in zip(list(self.buckets) + [float("inf")], self._bucket_counts):
+            total += bucket_count
+            counts["+Inf" if bound == float("inf") else f"{bound:g}"] = total
+        return counts
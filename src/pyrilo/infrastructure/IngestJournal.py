@@ -0,0 +1,126 @@
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+
+class IngestJournal:
+    """
+    Append-only journal (JSON lines) of the per-bag progress of ingest runs.
+
+    Every record is flushed and fsynced before the next stage starts, so after a crash (or an
+    expired session) the journal tells exactly which bags were already packaged, deleted, uploaded
+    or failed. A truncated last line (crash while writing) is ignored when reading.
+
+    Every record carries the GAMS5 host of the journal, so a journal shared by ingests to several
+    servers only resumes the runs of its own host. Starting a run compacts the file: the records of
+    the previous run of the same host and project are dropped, so the journal holds at most one run
+    per host and project.
+    """
+
+    RUN_STARTED = "run-started"
+    PACKAGED = "packaged"
+    DELETED = "deleted"
+    UPLOADED = "uploaded"
+    """
+    Final state of an ingested bag: uploaded and, if requested, integrated.
+    """
+    FAILED = "failed"
+
+    path: str
+    host: Optional[str]
+
+    def __init__(self, path: str, host: str = None) -> None:
+        self.path = path
+        self.host = host
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._file = open(path, "a", encoding="utf-8")
+
+    def start_run(self, project_abbr: str) -> None:
+        """
+        Marks the start of a new ingest run. Resuming only considers records after the latest run start.
+        """
+        self._compact(project_abbr)
+        self._append({"project": project_abbr, "event": self.RUN_STARTED})
+
+    def record(self, project_abbr: str, bag_path: str, state: str, error: str = None) -> None:
+        """
+        Records that a bag reached given state (one of PACKAGED, DELETED, UPLOADED, FAILED).
+        """
+        entry = {"project": project_abbr, "bag": bag_path, "state": state}
+        if error is not None:
+            entry["error"] = error
+        self._append(entry)
+
+    def latest_states(self, project_abbr: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns the latest record per bag (by relative bag path) of the current run of the project.
+        """
+        states: Dict[str, Dict[str, Any]] = {}
+        with self._lock:
+            self._file.flush()
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        logging.warning(f"Ignoring damaged ingest journal line: {line.strip()}")
+                        continue
+                    if entry.get("project") != project_abbr or entry.get("host") != self.host:
+                        continue
+                    if entry.get("event") == self.RUN_STARTED:
+                        states = {}
+                    elif "bag" in entry:
+                        states[entry["bag"]] = entry
+        return states
+
+    def bags_in_state(self, project_abbr: str, states: Set[str]) -> Set[str]:
+        """
+        Returns the bags of the current run of the project whose latest state is one of states.
+        """
+        return {bag for bag, entry in self.latest_states(project_abbr).items() if entry["state"] in states}
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+    def _compact(self, project_abbr: str) -> None:
+        """
+        Rewrites the journal with the latest run of every other host and project only.
+        """
+        runs: Dict[Tuple[Optional[str], Optional[str]], List[str]] = {}
+        with self._lock:
+            self._file.close()
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    key = (entry.get("host"), entry.get("project"))
+                    if entry.get("event") == self.RUN_STARTED:
+                        runs[key] = []
+                    runs.setdefault(key, []).append(line if line.endswith("\n") else line + "\n")
+
+            runs.pop((self.host, project_abbr), None)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(self.path)), suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as tmp_file:
+                for lines in runs.values():
+                    tmp_file.writelines(lines)
+                tmp_file.flush()
+                os.fsync(tmp_file.fileno())
+            os.replace(tmp_path, self.path)
+            self._file = open(self.path, "a", encoding="utf-8")
+
+    def _append(self, entry: Dict[str, Any]) -> None:
+        entry = {"time": time.time(), "host": self.host, **entry}
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
@@ -0,0 +1,114 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional, Tuple
+
+from pyrilo.infrastructure.BagEntry import BagEntry
+from pyrilo.infrastructure.BagManifest import BagManifest
+from pyrilo.infrastructure.BagState import BagState
+
+
+class IngestStateStore:
+    """
+    SQLite backed record of the bags ingested per GAMS5 host and project (manifest digest, Payload-Oxum
+    and time of the last successful ingest), used to skip bags that didn't change since then.
+
+    The record only covers the local side: whether the object still exists on the server is up to
+    the caller (see IngestPipeline).
+
+    Safe to use from multiple ingest worker threads.
+    """
+
+    db_path: str
+
+    def __init__(self, db_path: str) -> None:
+        self.db_path = db_path
+        db_dir = os.path.dirname(os.path.abspath(db_path))
+        os.makedirs(db_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(db_path, check_same_thread=False)
+        with self._connection:
+            columns = [row[1] for row in self._connection.execute("PRAGMA table_info(ingested_bags)")]
+            if columns and "host" not in columns:
+                # records of earlier versions don't tell the server they were ingested to
+                logging.info(f"Discarding ingest state without hosts in {db_path}, all bags count as changed once")
+                self._connection.execute("DROP TABLE ingested_bags")
+            self._connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS ingested_bags (
+                    host TEXT NOT NULL,
+                    project TEXT NOT NULL,
+                    bag_path TEXT NOT NULL,
+                    stat_signature TEXT NOT NULL,
+                    manifest_digest TEXT,
+                    payload_oxum TEXT,
+                    ingested_at REAL NOT NULL,
+                    PRIMARY KEY (host, project, bag_path)
+                )
+                """
+            )
+
+    def inspect(self, host: str, project_abbr: str, bag_root: str, bag: BagEntry) -> Tuple[BagState, bool]:
+        """
+        Determines the current state of a bag and whether it changed since its last successful ingest
+        to given host.
+
+        Cheap stat checks come first: if sizes and modification times of the bag folder, manifests and
+        tag files are unchanged, no file is read. Otherwise the manifests are hashed and compared.
+        Bags without manifest always count as changed.
+        """
+        folder_path = os.path.join(bag_root, bag.relative_path)
+        stat_signature = BagManifest.stat_signature(folder_path)
+        recorded = self.get(host, project_abbr, bag.relative_path)
+
+        if recorded and recorded.manifest_digest and recorded.stat_signature == stat_signature:
+            return recorded, False
+
+        payload_oxum = f"{bag.payload_bytes}.{bag.payload_files}" if bag.payload_bytes is not None else None
+        state = BagState(bag.relative_path, stat_signature, BagManifest.digest(folder_path), payload_oxum)
+
+        changed = (
+            recorded is None
+            or state.manifest_digest is None
+            or state.manifest_digest != recorded.manifest_digest
+            or state.payload_oxum != recorded.payload_oxum
+        )
+        if not changed:
+            # only the timestamps changed, remember them to keep the next check cheap
+            self.record_ingest(host, project_abbr, state, recorded.ingested_at)
+
+        return state, changed
+
+    def get(self, host: str, project_abbr: str, bag_path: str) -> Optional[BagState]:
+        """
+        Returns the recorded state of a bag or None, if it was never ingested successfully.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT bag_path, stat_signature, manifest_digest, payload_oxum, ingested_at "
+                "FROM ingested_bags WHERE host = ? AND project = ? AND bag_path = ?",
+                (host, project_abbr, bag_path)
+            ).fetchone()
+        return BagState(*row) if row else None
+
+    def record_ingest(self, host: str, project_abbr: str, state: BagState, ingested_at: float = None) -> None:
+        """
+        Records the state of a successfully ingested bag.
+        """
+        state.ingested_at = ingested_at if ingested_at is not None else time.time()
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO ingested_bags "
+                "(host, project, bag_path, stat_signature, manifest_digest, payload_oxum, ingested_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (host, project_abbr, state.bag_path, state.stat_signature, state.manifest_digest,
+                 state.payload_oxum, state.ingested_at)
+            )
+        logging.debug(f"Recorded ingest state of bag {state.bag_path} for project {project_abbr} on {host}")
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
@@ -0,0 +1,141 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Iterable, Optional
+
+from pyrilo.infrastructure.CachedInventory import CachedInventory
+
+
+class InventoryCache:
+    """
+    SQLite backed cache of the object ids per GAMS5 host and project, so that repeated operations on
+    a project (ingest, delete_objects) don't page through the whole listing every time.
+
+    - an inventory younger than `ttl` seconds is used without any request
+    - an older one is revalidated with If-None-Match / If-Modified-Since, if the server sent an ETag or
+      Last-Modified with a single page listing (see DigitalObjectService.inventory)
+    - our own writes (ingests, deletes) update the cached inventory right away, changes made by
+      others are only seen after the ttl
+
+    Safe to use from multiple worker threads.
+    """
+
+    db_path: str
+    ttl: float
+
+    def __init__(self, db_path: str, ttl: float = 600.0) -> None:
+        self.db_path = db_path
+        self.ttl = ttl
+        db_dir = os.path.dirname(os.path.abspath(db_path))
+        os.makedirs(db_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(db_path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS inventories (
+                    host TEXT NOT NULL,
+                    project TEXT NOT NULL,
+                    fetched_at REAL NOT NULL,
+                    etag TEXT,
+                    last_modified TEXT,
+                    PRIMARY KEY (host, project)
+                )
+                """
+            )
+            self._connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS inventory_objects (
+                    host TEXT NOT NULL,
+                    project TEXT NOT NULL,
+                    object_id TEXT NOT NULL,
+                    PRIMARY KEY (host, project, object_id)
+                )
+                """
+            )
+
+    def load(self, host: str, project_abbr: str) -> Optional[CachedInventory]:
+        """
+        Returns the cached inventory of the project (regardless of its age) or None.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT fetched_at, etag, last_modified FROM inventories WHERE host = ? AND project = ?",
+                (host, project_abbr)
+            ).fetchone()
+            if row is None:
+                return None
+            object_ids = {object_id for (object_id,) in self._connection.execute(
+                "SELECT object_id FROM inventory_objects WHERE host = ? AND project = ?",
+                (host, project_abbr)
+            )}
+        return CachedInventory(object_ids, *row)
+
+    def is_fresh(self, inventory: Optional[CachedInventory]) -> bool:
+        return inventory is not None and inventory.age < self.ttl
+
+    def store(self,
+              host: str,
+              project_abbr: str,
+              object_ids: Iterable[str],
+              etag: str = None,
+              last_modified: str = None) -> None:
+        """
+        Replaces the inventory of the project with a complete listing.
+        """
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM inventory_objects WHERE host = ? AND project = ?",
+                                     (host, project_abbr))
+            self._connection.executemany(
+                "INSERT OR IGNORE INTO inventory_objects (host, project, object_id) VALUES (?, ?, ?)",
+                ((host, project_abbr, object_id) for object_id in object_ids)
+            )
+            self._connection.execute(
+                "INSERT OR REPLACE INTO inventories (host, project, fetched_at, etag, last_modified) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (host, project_abbr, time.time(), etag, last_modified)
+            )
+        logging.debug(f"Cached inventory of project {project_abbr} on {host}")
+
+    def touch(self, host: str, project_abbr: str) -> None:
+        """
+        Marks the inventory as fresh again, after the server confirmed it's unchanged (304).
+        """
+        with self._lock, self._connection:
+            self._connection.execute("UPDATE inventories SET fetched_at = ? WHERE host = ? AND project = ?",
+                                     (time.time(), host, project_abbr))
+
+    def add(self, host: str, project_abbr: str, object_id: str) -> None:
+        """
+        Records an object we created. Projects without cached inventory are left alone.
+        """
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR IGNORE INTO inventory_objects (host, project, object_id) "
+                "SELECT host, project, ? FROM inventories WHERE host = ? AND project = ?",
+                (object_id, host, project_abbr)
+            )
+
+    def remove(self, host: str, project_abbr: str, object_id: str) -> None:
+        """
+        Records an object we deleted.
+        """
+        with self._lock, self._connection:
+            self._connection.execute(
+                "DELETE FROM inventory_objects WHERE host = ? AND project = ? AND object_id = ?",
+                (host, project_abbr, object_id)
+            )
+
+    def invalidate(self, host: str, project_abbr: str) -> None:
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM inventory_objects WHERE host = ? AND project = ?",
+                                     (host, project_abbr))
+            self._connection.execute("DELETE FROM inventories WHERE host = ? AND project = ?",
+                                     (host, project_abbr))
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
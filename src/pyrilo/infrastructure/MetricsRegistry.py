@@ -0,0 +1,213 @@
+import contextlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from pyrilo.PyriloStatics import PyriloStatics
+from pyrilo.infrastructure.Histogram import Histogram
+
+
+class MetricsRegistry:
+    """
+    Thread-safe, in-process collection of request and stage metrics:
+
+    - per HTTP method and endpoint template (e.g. 'projects/{p}/objects/{id}'): request counts per
+      status class, bytes sent / received and a latency histogram
+    - per stage (e.g. 'zip', 'upload'): a duration histogram
+
+    Exported as Prometheus text format (for the node exporter textfile collector) or as JSON.
+    """
+
+    PROMETHEUS = "prometheus"
+    JSON = "json"
+
+    # object ids and project abbreviations are replaced, so that the number of series stays bounded
+    ENDPOINT_TEMPLATES = [
+        (re.compile(r"(^|/)projects/[^/]+"), r"\1projects/{p}"),
+        (re.compile(r"/objects/(?!ids(/|$)|search(/|$))[^/]+"), "/objects/{id}"),
+    ]
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._requests: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._stages: Dict[str, Histogram] = {}
+
+    def __getstate__(self):
+        # handed to worker processes together with the services, whose records stay in the worker
+        return {}
+
+    def __setstate__(self, state):
+        self.__init__()
+
+    @classmethod
+    def endpoint_template(cls, endpoint: str) -> str:
+        """
+        Normalizes an endpoint or url to its template e.g. 'projects/demo/objects/demo.1' -> 'projects/{p}/objects/{id}'.
+        """
+        path = urlparse(endpoint).path if "://" in endpoint else endpoint.split("?", 1)[0]
+        if path.startswith(PyriloStatics.API_ROOT + "/"):
+            path = path[len(PyriloStatics.API_ROOT):]
+        path = path.strip("/")
+        for pattern, replacement in cls.ENDPOINT_TEMPLATES:
+            path = pattern.sub(replacement, path)
+        return path
+
+    def observe_request(self,
+                        method: str,
+                        endpoint: str,
+                        status_code: int,
+                        seconds: float,
+                        bytes_sent: int = 0,
+                        bytes_received: int = 0) -> None:
+        """
+        Records a single request (attempt). status_code None means the request failed without response.
+        """
+        key = (method, self.endpoint_template(endpoint))
+        status = f"{status_code // 100}xx" if status_code else "error"
+        with self._lock:
+            metric = self._requests.get(key)
+            if metric is None:
+                metric = self._requests[key] = {
+                    "statuses": {}, "bytes_sent": 0, "bytes_received": 0, "latency": Histogram()
+                }
+            metric["statuses"][status] = metric["statuses"].get(status, 0) + 1
+            metric["bytes_sent"] += bytes_sent
+            metric["bytes_received"] += bytes_received
+            metric["latency"].observe(seconds)
+
+    def observe_stage(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            histogram = self._stages.get(stage)
+            if histogram is None:
+                histogram = self._stages[stage] = Histogram()
+            histogram.observe(seconds)
+
+    @contextlib.contextmanager
+    def time_stage(self, stage: str) -> Iterator[None]:
+        """
+        Records the duration of the block as stage timing (also if it raises).
+        """
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe_stage(stage, time.perf_counter() - started_at)
+
+    @staticmethod
+    def timed(metrics: Optional["MetricsRegistry"], stage: str):
+        """
+        time_stage of given registry, a no-op if metrics are not collected.
+        """
+        return metrics.time_stage(stage) if metrics else contextlib.nullcontext()
+
+    def to_json(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "generated_at": time.time(),
+                "requests": [
+                    {
+                        "method": method,
+                        "endpoint": endpoint,
+                        "count": metric["latency"].count,
+                        "statuses": dict(metric["statuses"]),
+                        "bytes_sent": metric["bytes_sent"],
+                        "bytes_received": metric["bytes_received"],
+                        "latency_seconds": self._histogram_json(metric["latency"]),
+                    }
+                    for (method, endpoint), metric in sorted(self._requests.items())
+                ],
+                "stages": [
+                    {"stage": stage, "duration_seconds": self._histogram_json(histogram)}
+                    for stage, histogram in sorted(self._stages.items())
+                ],
+            }
+
+    def to_prometheus(self) -> str:
+        lines: List[str] = []
+        with self._lock:
+            requests = sorted(self._requests.items())
+            lines += [
+                "# HELP pyrilo_http_requests_total Requests sent to the GAMS5 API by status class.",
+                "# TYPE pyrilo_http_requests_total counter",
+            ]
+            for (method, endpoint), metric in requests:
+                for status, count in sorted(metric["statuses"].items()):
+                    labels = self._labels(method=method, endpoint=endpoint, status=status)
+                    lines.append(f"pyrilo_http_requests_total{labels} {count}")
+
+            for name, field, help_text in [
+                ("pyrilo_http_sent_bytes_total", "bytes_sent", "Request body bytes sent to the GAMS5 API."),
+                ("pyrilo_http_received_bytes_total", "bytes_received", "Response body bytes received from the GAMS5 API."),
+            ]:
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+                for (method, endpoint), metric in requests:
+                    lines.append(f"{name}{self._labels(method=method, endpoint=endpoint)} {metric[field]}")
+
+            lines += [
+                "# HELP pyrilo_http_request_duration_seconds Latency of requests to the GAMS5 API.",
+                "# TYPE pyrilo_http_request_duration_seconds histogram",
+            ]
+            for (method, endpoint), metric in requests:
+                lines += self._histogram_lines(
+                    "pyrilo_http_request_duration_seconds", metric["latency"], method=method, endpoint=endpoint
+                )
+
+            lines += [
+                "# HELP pyrilo_stage_duration_seconds Duration of ingest stages.",
+                "# TYPE pyrilo_stage_duration_seconds histogram",
+            ]
+            for stage, histogram in sorted(self._stages.items()):
+                lines += self._histogram_lines("pyrilo_stage_duration_seconds", histogram, stage=stage)
+
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str, output_format: str = None) -> None:
+        """
+        Writes the metrics to given file, as JSON if the format is 'json' (or the file ends with .json),
+        in Prometheus text format otherwise. The file is replaced atomically, so that collectors never
+        read a partially written file.
+        """
+        output_format = output_format or (self.JSON if path.endswith(".json") else self.PROMETHEUS)
+        if output_format == self.JSON:
+            content = json.dumps(self.to_json(), indent=2)
+        else:
+            content = self.to_prometheus()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(content)
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+    @staticmethod
+    def _histogram_json(histogram: Histogram) -> Dict[str, Any]:
+        return {"count": histogram.count, "sum": histogram.sum, "buckets": histogram.cumulative_counts()}
+
+    @classmethod
+    def _histogram_lines(cls, name: str, histogram: Histogram, **labels: str) -> List[str]:
+        lines = [
+            f"{name}_bucket{cls._labels(**labels, le=bound)} {count}"
+            for bound, count in histogram.cumulative_counts().items()
+        ]
+        lines.append(f"{name}_sum{cls._labels(**labels)} {histogram.sum}")
+        lines.append(f"{name}_count{cls._labels(**labels)} {histogram.count}")
+        return lines
+
+    @staticmethod
+    def _labels(**labels: str) -> str:
+        pairs = []
+        for name, value in labels.items():
+            value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+            pairs.append(f'{name}="{value}"')
+        return "{" + ",".join(pairs) + "}"
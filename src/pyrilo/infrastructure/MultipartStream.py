@@ -0,0 +1,140 @@
+import asyncio
+import os
+import uuid
+from typing import AsyncIterator, BinaryIO, Dict, Iterator, List, Tuple, Union
+
+
+class MultipartStream:
+    """
+    File-like multipart/form-data request body.
+
+    Plain form fields are encoded up front (they are tiny), file parts are read lazily from their
+    file objects while the body is sent. requests detects the object as a stream (it has __iter__
+    and __len__) and hands it to http.client, which pulls it in fixed size blocks via read().
+    Memory usage therefore stays constant regardless of the size of the uploaded files.
+
+    Async clients (httpx) consume the same body via aiter_chunks(), which reads every chunk on a
+    worker thread so the event loop isn't blocked by the file reads.
+    """
+
+    DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+    boundary: str
+    chunk_size: int
+
+    def __init__(self,
+                 fields: Dict[str, str],
+                 files: Dict[str, Tuple[str, BinaryIO, str]],
+                 chunk_size: int = DEFAULT_CHUNK_SIZE) -> None:
+        """
+        :param fields: plain form fields (name -> value)
+        :param files: file parts (name -> (file name, binary file object, content type)).
+         File objects must be seekable, they are read from their start.
+        """
+        self.boundary = uuid.uuid4().hex
+        self.chunk_size = chunk_size
+
+        # segments are either encoded bytes or (file object, size) tuples
+        self._segments: List[Union[bytes, Tuple[BinaryIO, int]]] = []
+        for name, value in fields.items():
+            self._segments.append(
+                self._part_header(name) + b"\r\n" + str(value).encode("utf-8") + b"\r\n"
+            )
+        for name, (file_name, file_obj, content_type) in files.items():
+            file_obj.seek(0, os.SEEK_END)
+            size = file_obj.tell()
+            file_obj.seek(0)
+            self._segments.append(
+                self._part_header(name, file_name)
+                + f"Content-Type: {content_type}\r\n\r\n".encode("utf-8")
+            )
+            self._segments.append((file_obj, size))
+            self._segments.append(b"\r\n")
+        self._segments.append(f"--{self.boundary}--\r\n".encode("utf-8"))
+
+        self._length = sum(self._segment_length(segment) for segment in self._segments)
+        self._position = 0
+
+    @property
+    def content_type(self) -> str:
+        """
+        Value for the Content-Type header of the request.
+        """
+        return f"multipart/form-data; boundary={self.boundary}"
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __iter__(self) -> Iterator[bytes]:
+        while True:
+            chunk = self.read(self.chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+    async def aiter_chunks(self) -> AsyncIterator[bytes]:
+        """
+        Yields the remaining body in chunks of chunk_size, read in a worker thread.
+        """
+        while True:
+            chunk = await asyncio.to_thread(self.read, self.chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        """
+        Repositions the stream. Used by requests to rewind the body (e.g. on redirects or retries).
+        """
+        if whence == os.SEEK_CUR:
+            offset += self._position
+        elif whence == os.SEEK_END:
+            offset += self._length
+        self._position = max(0, min(offset, self._length))
+        return self._position
+
+    def read(self, size: int = -1) -> bytes:
+        """
+        Reads up to size bytes of the encoded body (everything remaining if size is negative).
+        """
+        if size is None or size < 0:
+            size = self._length - self._position
+
+        buffer = bytearray()
+        segment_start = 0
+        for segment in self._segments:
+            if len(buffer) >= size:
+                break
+            segment_length = self._segment_length(segment)
+            segment_end = segment_start + segment_length
+            if self._position < segment_end:
+                offset = self._position - segment_start
+                wanted = min(size - len(buffer), segment_length - offset)
+                if isinstance(segment, bytes):
+                    data = segment[offset:offset + wanted]
+                else:
+                    file_obj, _ = segment
+                    file_obj.seek(offset)
+                    data = file_obj.read(wanted)
+                    if len(data) != wanted:
+                        raise IOError("File part changed in size while streaming the request body.")
+                buffer += data
+                self._position += len(data)
+            segment_start = segment_end
+
+        return bytes(buffer)
+
+    def _part_header(self, name: str, file_name: str = None) -> bytes:
+        disposition = f'form-data; name="{name}"'
+        if file_name is not None:
+            disposition += f'; filename="{file_name}"'
+        return f"--{self.boundary}\r\nContent-Disposition: {disposition}\r\n".encode("utf-8")
+
+    @staticmethod
+    def _segment_length(segment: Union[bytes, Tuple[BinaryIO, int]]) -> int:
+        if isinstance(segment, bytes):
+            return len(segment)
+        return segment[1]
@@ -0,0 +1,154 @@
+import collections
+import logging
+import os
+import shutil
+import tempfile
+import threading
+from typing import BinaryIO, Callable, Counter, Optional
+
+from pyrilo.infrastructure.BagManifest import BagManifest
+
+
+class PackageCache:
+    """
+    On-disk cache of packaged bag archives, keyed by the checksums (manifests) of the bags.
+
+    Entries are evicted least recently used first once the cache grows above max_bytes.
+    The modification time of an entry serves as its last usage time.
+
+    The archives returned by get / put / create are pinned until they are handed back via release
+    (e.g. while they wait for and run through the upload), pinned entries are never evicted. The
+    cache may exceed max_bytes while the archives in flight don't fit into it.
+    """
+
+    # bump whenever the archive layout changes, invalidates all existing entries
+    FORMAT_VERSION = "1"
+
+    cache_dir: str
+    max_bytes: int
+
+    def __init__(self, cache_dir: str, max_bytes: int) -> None:
+        self.cache_dir = os.path.abspath(cache_dir)
+        self.max_bytes = max_bytes
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._pins: Counter[str] = collections.Counter()
+
+    def key_for(self, folder_path: str, fingerprint: str = "") -> Optional[str]:
+        """
+        Computes the cache key of a bag from its manifest / tag manifest files (and the optional
+        fingerprint of the packaging settings). Returns None for bags without any manifest,
+        since their content cannot be identified without hashing the whole payload.
+        """
+        return BagManifest.digest(folder_path, salt=f"v{self.FORMAT_VERSION}\0{fingerprint}")
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Returns the path of the cached archive for key (marked as recently used and pinned until
+        released) or None.
+        """
+        archive_path = self._path_for(key)
+        with self._lock:
+            try:
+                os.utime(archive_path)
+            except FileNotFoundError:
+                return None
+            self._pins[archive_path] += 1
+
+        logging.debug(f"Package cache hit for key {key}")
+        return archive_path
+
+    def create(self, key: str, write_archive: Callable[[BinaryIO], None]) -> str:
+        """
+        Creates the cache entry for key by calling write_archive with a binary file to write into.
+        The entry only becomes visible once write_archive completed successfully. Returns its path,
+        pinned until released.
+        """
+        archive_path = self._install(self._write_tmp(write_archive), key)
+        self.evict()
+        return archive_path
+
+    def put(self, key: str, archive_path: str) -> str:
+        """
+        Moves an existing archive file into the cache as entry for key and returns its new path,
+        pinned until released.
+        """
+        try:
+            target_path = self._install(archive_path, key)
+        except OSError:
+            # e.g. archive lives on another file system
+            with open(archive_path, "rb") as source:
+                tmp_path = self._write_tmp(lambda target: shutil.copyfileobj(source, target, 1024 * 1024))
+            target_path = self._install(tmp_path, key)
+            os.remove(archive_path)
+
+        self.evict()
+        return target_path
+
+    def release(self, archive_path: str) -> None:
+        """
+        Unpins an archive returned by get / put / create, it may be evicted from now on.
+        """
+        archive_path = os.path.abspath(archive_path)
+        with self._lock:
+            if self._pins[archive_path] <= 1:
+                del self._pins[archive_path]
+            else:
+                self._pins[archive_path] -= 1
+        self.evict()
+
+    def evict(self, keep: str = None) -> None:
+        """
+        Removes least recently used entries until the cache fits into max_bytes.
+        Pinned entries and the entry for keep are never removed.
+        """
+        with self._lock:
+            entries = []
+            for entry in os.scandir(self.cache_dir):
+                if entry.is_file() and entry.name.endswith(".zip"):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+            total_bytes = sum(size for _, size, _ in entries)
+            keep_path = self._path_for(keep) if keep else None
+
+            for _, size, path in sorted(entries):
+                if total_bytes <= self.max_bytes:
+                    break
+                if path == keep_path or self._pins[path]:
+                    continue
+                try:
+                    os.remove(path)
+                    total_bytes -= size
+                    logging.debug(f"Evicted {path} from package cache")
+                except FileNotFoundError:
+                    pass
+
+    def contains(self, archive_path: str) -> bool:
+        """
+        Checks whether given archive path is an entry of this cache.
+        """
+        return os.path.dirname(os.path.abspath(archive_path)) == self.cache_dir
+
+    def _write_tmp(self, write_archive: Callable[[BinaryIO], None]) -> str:
+        fd, tmp_path = tempfile.mkstemp(suffix=".tmp", dir=self.cache_dir)
+        try:
+            with os.fdopen(fd, "wb") as tmp_file:
+                write_archive(tmp_file)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+        return tmp_path
+
+    def _install(self, archive_path: str, key: str) -> str:
+        # moving and pinning at once, so that no concurrent eviction removes the new entry in between
+        target_path = self._path_for(key)
+        with self._lock:
+            os.replace(archive_path, target_path)
+            self._pins[target_path] += 1
+        return target_path
+
+    def _path_for(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.zip")
+
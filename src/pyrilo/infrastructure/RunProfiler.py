@@ -0,0 +1,155 @@
+import contextlib
+import cProfile
+import io
+import pstats
+import threading
+import time
+import tracemalloc
+from typing import Any, Dict, Iterator, List, Optional
+
+MIB = 1024 * 1024
+
+
+class RunProfiler:
+    """
+    Profiles a whole pyrilo run:
+
+    - cProfile of all threads (e.g. the stage workers of the ingest pipeline) in one .pstats file
+    - tracemalloc for the memory allocated by Python
+    - wall time and peak memory per span, a span being one stage (discover, verify, package, ...)
+      processing one bag
+
+    Memory is traced process-wide, so the peak of a span is the highest traced memory while it
+    ran, including concurrent spans. Zipping on worker processes (--pack-workers > 1) isn't
+    covered by cProfile / tracemalloc, only by the span timings of the calling stage.
+    """
+
+    SAMPLE_INTERVAL = 0.05
+
+    def __init__(self, top_functions: int = 30) -> None:
+        self.top_functions = top_functions
+        self._lock = threading.Lock()
+        self._profile: Optional[cProfile.Profile] = None
+        self._stages: Dict[str, Dict[str, Any]] = {}
+        self._bags: Dict[str, Dict[str, Any]] = {}
+        self._active_spans: List[Dict[str, Any]] = []
+        self._started_at = None
+        self._wall_time = 0.0
+        self._peak_memory = 0
+        self._stop_sampling = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        tracemalloc.start()
+        self._started_at = time.perf_counter()
+
+        # cProfile is based on sys.monitoring (Python >= 3.12), one profile covers all threads
+        self._profile = cProfile.Profile()
+        self._profile.enable()
+
+        self._sampler = threading.Thread(target=self._sample_memory, name="pyrilo-profiler", daemon=True)
+        self._sampler.start()
+
+    def stop(self) -> None:
+        self._profile.disable()
+        self._stop_sampling.set()
+        if self._sampler:
+            self._sampler.join()
+
+        self._wall_time = time.perf_counter() - self._started_at
+        self._peak_memory = max(self._peak_memory, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+
+    @staticmethod
+    def spanned(profiler: Optional["RunProfiler"], stage: str, bag: str = None):
+        """
+        span of given profiler, a no-op if the run isn't profiled.
+        """
+        return profiler.span(stage, bag) if profiler else contextlib.nullcontext()
+
+    @contextlib.contextmanager
+    def span(self, stage: str, bag: str = None) -> Iterator[None]:
+        """
+        Attributes the wall time and peak memory of the block to given stage (and bag).
+        """
+        span = {"peak": tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else 0}
+        with self._lock:
+            self._active_spans.append(span)
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started_at
+            with self._lock:
+                self._active_spans.remove(span)
+                self._record(self._stages, stage, elapsed, span["peak"])
+                if bag is not None:
+                    record = self._record(self._bags, bag, elapsed, span["peak"])
+                    record["stages"][stage] = record["stages"].get(stage, 0.0) + elapsed
+
+    def bag_durations(self) -> Dict[str, float]:
+        """
+        Wall time per bag, summed over its stages (excluding the time it waited in queues between them).
+        """
+        with self._lock:
+            return {bag: record["total"] for bag, record in self._bags.items()}
+
+    def write(self, output_prefix: str) -> str:
+        """
+        Writes <output_prefix>.pstats (load with pstats / snakeviz) and <output_prefix>.txt with the
+        summary, returns the summary.
+        """
+        stats = pstats.Stats(self._profile)
+        stats.dump_stats(f"{output_prefix}.pstats")
+
+        summary = self.summary(stats)
+        with open(f"{output_prefix}.txt", "w", encoding="utf-8") as f:
+            f.write(summary)
+        return summary
+
+    def summary(self, stats: pstats.Stats = None) -> str:
+        lines = [
+            f"Pyrilo profile: wall time {self._wall_time:.2f}s, peak traced memory {self._peak_memory / MIB:.1f} MiB",
+            "",
+            "Stages (sorted by total wall time, summed over concurrent workers):",
+            f"{'stage':<20} {'calls':>7} {'total s':>10} {'mean s':>9} {'max s':>9} {'peak MiB':>9}",
+        ]
+        for stage, record in sorted(self._stages.items(), key=lambda entry: -entry[1]["total"]):
+            lines.append(
+                f"{stage:<20} {record['calls']:>7} {record['total']:>10.3f} {record['total'] / record['calls']:>9.3f} "
+                f"{record['max']:>9.3f} {record['peak'] / MIB:>9.1f}"
+            )
+
+        if self._bags:
+            lines += ["", "Slowest bags (wall time summed over stages):"]
+            slowest = sorted(self._bags.items(), key=lambda entry: -entry[1]["total"])[:20]
+            for bag, record in slowest:
+                stages = ", ".join(f"{stage} {seconds:.3f}s" for stage, seconds in record["stages"].items())
+                lines.append(f"{bag:<40} {record['total']:>9.3f}s {record['peak'] / MIB:>8.1f} MiB  ({stages})")
+
+        if stats is not None:
+            output = io.StringIO()
+            stats.stream = output
+            stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(self.top_functions)
+            lines += ["", f"Top {self.top_functions} functions by cumulative time (all threads):", output.getvalue()]
+
+        return "\n".join(lines) + "\n"
+
+    def _sample_memory(self) -> None:
+        while not self._stop_sampling.wait(self.SAMPLE_INTERVAL):
+            current, peak = tracemalloc.get_traced_memory()
+            with self._lock:
+                self._peak_memory = max(self._peak_memory, peak)
+                for span in self._active_spans:
+                    span["peak"] = max(span["peak"], current)
+
+    @staticmethod
+    def _record(records: Dict[str, Dict[str, Any]], key: str, elapsed: float, peak: int) -> Dict[str, Any]:
+        record = records.get(key)
+        if record is None:
+            record = records[key] = {"calls": 0, "total": 0.0, "max": 0.0, "peak": 0, "stages": {}}
+        record["calls"] += 1
+        record["total"] += elapsed
+        record["max"] = max(record["max"], elapsed)
+        record["peak"] = max(record["peak"], peak)
+        return record
@@ -0,0 +1,105 @@
+import json
+import logging
+import os
+import stat
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from requests.cookies import RequestsCookieJar, create_cookie
+
+
+class SessionCache:
+    """
+    Persists the session cookies of a login per GAMS5 host and user in a JSON file, so that subsequent
+    pyrilo invocations of the same user skip the login form flow while the session is valid.
+
+    The cookies grant access like the password: the file is created readable by the owner only
+    (0600) and a file readable by others is ignored. Entries older than `max_age` seconds and
+    expired cookies are not restored, a session that ended on the server side anyway is noticed by
+    the first request (401) and replaced by a new login (see GamsApiClient.authenticator).
+    """
+
+    path: str
+    max_age: float
+
+    def __init__(self, path: str, max_age: float = 12 * 3600) -> None:
+        self.path = path
+        self.max_age = max_age
+        self._lock = threading.Lock()
+
+    def load(self, host: str, username: str) -> Optional[RequestsCookieJar]:
+        """
+        Returns the cached cookies of given user on given host, None if there are no (valid) cookies.
+        """
+        if not username:
+            return None
+        with self._lock:
+            entry = self._read().get(host, {}).get(username)
+        if not entry or entry.get("username") != username or time.time() - entry.get("stored_at", 0) > self.max_age:
+            return None
+
+        jar = RequestsCookieJar()
+        for cookie in entry.get("cookies", []):
+            jar.set_cookie(create_cookie(**cookie))
+        jar.clear_expired_cookies()
+        return jar if len(jar) else None
+
+    def store(self, host: str, username: str, cookies: RequestsCookieJar) -> None:
+        """
+        Replaces the cached cookies of given user on given host.
+        """
+        entry = {
+            "username": username,
+            "stored_at": time.time(),
+            "cookies": [
+                {
+                    "name": cookie.name,
+                    "value": cookie.value,
+                    "domain": cookie.domain,
+                    "path": cookie.path,
+                    "expires": cookie.expires,
+                    "secure": cookie.secure,
+                    "rest": {"HttpOnly": None} if cookie.has_nonstandard_attr("HttpOnly") else {},
+                }
+                for cookie in cookies
+            ],
+        }
+        with self._lock:
+            sessions = self._read()
+            sessions.setdefault(host, {})[username] = entry
+            self._write(sessions)
+        logging.debug(f"Cached session cookies of {username} on {host}")
+
+    def clear(self, host: str, username: str) -> None:
+        with self._lock:
+            sessions = self._read()
+            if sessions.get(host, {}).pop(username, None) is not None:
+                self._write(sessions)
+
+    def _read(self) -> Dict[str, Any]:
+        try:
+            if os.name == "posix" and os.stat(self.path).st_mode & (stat.S_IRWXG | stat.S_IRWXO):
+                logging.warning(f"Ignoring session cache {self.path}: it is accessible by other users")
+                return {}
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logging.warning(f"Ignoring unreadable session cache {self.path}: {e}")
+            return {}
+
+    def _write(self, sessions: Dict[str, Any]) -> None:
+        cache_dir = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+        # mkstemp creates the file with 0600, replacing keeps readers from seeing a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, prefix=".sessions-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(sessions, f)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
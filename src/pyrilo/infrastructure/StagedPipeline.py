@@ -0,0 +1,132 @@
+import logging
+import queue
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, List, Optional, Tuple
+
+from pyrilo.infrastructure.MetricsRegistry import MetricsRegistry
+from pyrilo.infrastructure.RunProfiler import RunProfiler
+
+
+@dataclass
+class PipelineStage:
+    """
+    One stage of a StagedPipeline.
+    """
+
+    name: str
+    """
+    Name of the stage, used for logging and failure reports e.g. 'upload'
+    """
+
+    handler: Callable[[Any], Any]
+    """
+    Processes one item and returns the item handed to the next stage (None drops the item).
+    Raised exceptions are recorded as failure of the item, they don't stop the pipeline.
+    """
+
+    workers: int = 1
+    """
+    Number of threads running the handler concurrently.
+    """
+
+
+class StagedPipeline:
+    """
+    Runs items through a chain of stages. Every stage has its own pool of worker threads and stages
+    are joined by bounded queues: a slow stage blocks its producers once its queue is full, which
+    keeps the number of items in flight (and with it memory and disk usage) bounded, while all
+    other stages keep working concurrently.
+    """
+
+    _DONE = object()
+
+    stages: List[PipelineStage]
+    queue_size: int
+
+    def __init__(self,
+                 stages: List[PipelineStage],
+                 queue_size: int,
+                 on_failure: Callable[[Any, str, Exception], None] = None,
+                 metrics: MetricsRegistry = None,
+                 profiler: RunProfiler = None) -> None:
+        """
+        :param on_failure: called with item, stage name and exception whenever a stage fails for an item
+         (e.g. to clean up resources attached to the item)
+        :param metrics: records the handler duration per item as stage timing 'pipeline.<stage name>'
+        :param profiler: attributes wall time and memory of the handler to the stage and the item (str(item))
+        """
+        self.stages = [stage for stage in stages if stage.workers > 0]
+        self.queue_size = queue_size
+        self.on_failure = on_failure
+        self.metrics = metrics
+        self.profiler = profiler
+
+    def run(self, items: Iterable[Any]) -> List[Tuple[Any, str, Exception]]:
+        """
+        Feeds items into the first stage (from the calling thread) and blocks until all items
+        passed the pipeline. Returns the failures as (item, stage name, exception).
+        """
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in self.stages]
+        remaining_workers = [stage.workers for stage in self.stages]
+        failures: List[Tuple[Any, str, Exception]] = []
+        lock = threading.Lock()
+
+        def work(index: int):
+            stage = self.stages[index]
+            next_queue: Optional[queue.Queue] = queues[index + 1] if index + 1 < len(self.stages) else None
+
+            while True:
+                item = queues[index].get()
+                if item is self._DONE:
+                    break
+
+                try:
+                    with MetricsRegistry.timed(self.metrics, f"pipeline.{stage.name}"), \
+                            RunProfiler.spanned(self.profiler, stage.name, str(item)):
+                        result = stage.handler(item)
+                except Exception as e:
+                    logging.debug(f"Stage {stage.name} failed for {item}: {e}")
+                    with lock:
+                        failures.append((item, stage.name, e))
+                    self._notify_failure(item, stage.name, e)
+                    continue
+
+                if result is not None and next_queue is not None:
+                    next_queue.put(result)
+
+            # the last worker of a stage to finish closes the next stage
+            with lock:
+                remaining_workers[index] -= 1
+                stage_finished = remaining_workers[index] == 0
+            if stage_finished and next_queue is not None:
+                for _ in range(self.stages[index + 1].workers):
+                    next_queue.put(self._DONE)
+
+        threads = []
+        for index, stage in enumerate(self.stages):
+            for n in range(stage.workers):
+                thread = threading.Thread(target=work, args=(index,), name=f"pyrilo-{stage.name}-{n}", daemon=True)
+                thread.start()
+                threads.append(thread)
+
+        try:
+            if self.stages:
+                for item in items:
+                    queues[0].put(item)
+        finally:
+            if self.stages:
+                for _ in range(self.stages[0].workers):
+                    queues[0].put(self._DONE)
+            for thread in threads:
+                thread.join()
+
+        return failures
+
+    def _notify_failure(self, item: Any, stage_name: str, error: Exception):
+        if self.on_failure is None:
+            return
+        try:
+            self.on_failure(item, stage_name, error)
+        except Exception as e:
+            logging.error(f"Failure handler of stage {stage_name} failed for {item}: {e}")
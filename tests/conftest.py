@@ -40,6 +40,11 @@ def mock_gams_api():
         object_existence_pattern = re.compile(rf"{api_base}/projects/[^/]+/objects/[^/]+")
         m.head(object_existence_pattern, status_code=404)
 
+        # GET: Object inventory (single empty page)
+        # Matches: .../projects/{project}/objects/ids
+        inventory_pattern = re.compile(rf"{api_base}/projects/[^/]+/objects/ids")
+        m.get(inventory_pattern, json={"results": [], "pagination": {"hasNext": False}})
+
         # POST: Ingest Object
         # Matches: .../projects/{project}/objects
         ingest_pattern = re.compile(rf"{api_base}/projects/[^/]+/objects$")
@@ -0,0 +1,40 @@
+import os
+
+from benchmarks.SyntheticBagGenerator import SyntheticBagGenerator
+from benchmarks.SyntheticBagSpec import SyntheticBagSpec
+from benchmarks.ingest_benchmark import percentile, run_benchmark
+from pyrilo.infrastructure.BagValidator import BagValidator
+
+
+def test_synthetic_bags_are_valid(tmp_path):
+    spec = SyntheticBagSpec(count=4, max_file_size=4096, file_types={"xml": 1, "jpg": 1}, nesting_depth=2)
+
+    bags = SyntheticBagGenerator(spec).generate(str(tmp_path))
+
+    assert len(bags) == 4
+    assert all(relative_path.count(os.sep) == 2 for relative_path, _ in bags)
+    validator = BagValidator()
+    for result in validator.validate_many(str(tmp_path / relative_path) for relative_path, _ in bags):
+        assert result.valid, result.errors
+    validator.close()
+
+
+def test_benchmark_runs_all_scenarios_against_fake_server(tmp_path):
+    """
+    INTEGRATION TEST:
+    The benchmark ingests, re-ingests, lists and deletes the synthetic bags over real sockets.
+    """
+    results = run_benchmark(SyntheticBagSpec(count=5, max_file_size=2048), str(tmp_path), workers=2, page_size=2)
+
+    scenarios = results["scenarios"]
+    assert set(scenarios) == {"ingest", "reingest", "list_objects", "delete_objects"}
+    assert scenarios["ingest"]["items"] == 5
+    assert scenarios["ingest"]["mb_per_second"] > 0
+    assert scenarios["reingest"]["latency_p99_seconds"] >= scenarios["reingest"]["latency_p50_seconds"]
+    assert scenarios["delete_objects"]["latency_p50_seconds"] is not None
+
+
+def test_percentile_uses_nearest_rank():
+    assert percentile([], 0.5) is None
+    assert percentile([3.0, 1.0, 2.0, 4.0], 0.5) == 2.0
+    assert percentile([float(n) for n in range(1, 101)], 0.99) == 99.0
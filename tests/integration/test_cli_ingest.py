@@ -1,6 +1,9 @@
+import re
+import shutil
 
 from click.testing import CliRunner
 from pyrilo.cli import cli
+from tests.utils.TestPyriloProject import TestPyriloProject
 
 def test_cli_ingest_flow_success(tmp_path, mock_pyrilo_ingest_env):
     """
@@ -36,7 +39,8 @@ def test_cli_ingest_flow_success(tmp_path, mock_pyrilo_ingest_env):
             "--host", test_pyrilo_project.TEST_HOST,
             "--bag_root", str(bags_root),  # points to the test data
             "--verbose",
-            "ingest", test_pyrilo_project.TEST_PROJECT
+            "ingest", test_pyrilo_project.TEST_PROJECT,
+            "--journal", str(tmp_path / "journal.jsonl")  # not inside the test data
         ],
         env=env_vars
     )
@@ -63,4 +67,318 @@ def test_cli_ingest_flow_success(tmp_path, mock_pyrilo_ingest_env):
     # Verify the ZIP is in the body (Multipart verification is tricky with requests-mock,
     # but checking the header is a good start)
     last_request = upload_requests[0]
-    assert "multipart/form-data" in last_request.headers.get("Content-Type", "")
\ No newline at end of file
+    assert "multipart/form-data" in last_request.headers.get("Content-Type", "")
+
+def test_cli_ingest_with_pack_workers(tmp_path, mock_pyrilo_ingest_env):
+    """
+    INTEGRATION TEST:
+    Runs 'pyrilo ingest --pack-workers 2' and verifies that the bags zipped by the worker
+    processes are uploaded.
+    """
+    gams_api_mock, test_pyrilo_project = mock_pyrilo_ingest_env
+
+    runner = CliRunner()
+    result = runner.invoke(
+        cli,
+        [
+            "--host", test_pyrilo_project.TEST_HOST,
+            "--bag_root", str(test_pyrilo_project.INGEST_BAGS_PATH),
+            "ingest", test_pyrilo_project.TEST_PROJECT,
+            "--pack-workers", "2",
+            "--journal", str(tmp_path / "journal.jsonl")
+        ],
+        env={"PYRILO_USER": "testuser", "PYRILO_PASSWORD": "testpass"}
+    )
+
+    assert result.exit_code == 0, result.output
+    assert "Ingest complete." in result.output
+
+    upload_requests = [
+        r for r in gams_api_mock.request_history
+        if r.method == "POST" and r.url.endswith(f"projects/{test_pyrilo_project.TEST_PROJECT}/objects")
+    ]
+    assert len(upload_requests) == 1
+
+
+def test_cli_ingest_with_workers_collects_failures(tmp_path, mock_pyrilo_ingest_env):
+    """
+    INTEGRATION TEST:
+    Runs 'pyrilo ingest --workers 4' over several bags, one of which fails, and verifies that all other
+    bags are still uploaded and the failure ends up in the summary.
+    """
+    gams_api_mock, test_pyrilo_project = mock_pyrilo_ingest_env
+
+    source_bag = test_pyrilo_project.INGEST_BAGS_PATH / "demo.person.1"
+    for i in range(1, 7):
+        shutil.copytree(source_bag, tmp_path / f"demo.person.{i}")
+
+    # demo.person.3 exists remotely, but can't be deleted
+    api_base = f"{test_pyrilo_project.TEST_HOST}/api/v1"
+    gams_api_mock.get(
+        f"{api_base}/projects/demo/objects/ids",
+        json={"results": ["demo.person.3"], "pagination": {"hasNext": False}}
+    )
+    gams_api_mock.delete(f"{api_base}/projects/demo/objects/demo.person.3", status_code=500)
+
+    runner = CliRunner()
+    result = runner.invoke(
+        cli,
+        [
+            "--host", test_pyrilo_project.TEST_HOST,
+            "--bag_root", str(tmp_path),
+            "ingest", test_pyrilo_project.TEST_PROJECT,
+            "--workers", "4"
+        ],
+        env={"PYRILO_USER": "testuser", "PYRILO_PASSWORD": "testpass"}
+    )
+
+    assert result.exit_code == 1
+    assert "Batch ingest completed with 1 errors: ['demo.person.3']" in result.output
+
+    upload_requests = [
+        r for r in gams_api_mock.request_history
+        if r.method == "POST" and r.url.endswith(f"projects/{test_pyrilo_project.TEST_PROJECT}/objects")
+    ]
+    assert len(upload_requests) == 5
+
+
+def test_cli_ingest_changed_only_skips_unchanged_bags(tmp_path, mock_pyrilo_ingest_env):
+    """
+    INTEGRATION TEST:
+    Runs 'pyrilo ingest --changed-only' twice and verifies that the second run doesn't upload anything
+    until a bag actually changes.
+    """
+    gams_api_mock, test_pyrilo_project = mock_pyrilo_ingest_env
+
+    shutil.copytree(test_pyrilo_project.INGEST_BAGS_PATH / "demo.person.1", tmp_path / "demo.person.1")
+    shutil.copytree(test_pyrilo_project.INGEST_BAGS_PATH / "demo.person.1", tmp_path / "demo.person.2")
+
+    def run_ingest():
+        result = CliRunner().invoke(
+            cli,
+            [
+                "--host", test_pyrilo_project.TEST_HOST,
+                "--bag_root", str(tmp_path),
+                "ingest", test_pyrilo_project.TEST_PROJECT,
+                "--changed-only"
+            ],
+            env={"PYRILO_USER": "testuser", "PYRILO_PASSWORD": "testpass"}
+        )
+        assert result.exit_code == 0, result.output
+        uploads = [r for r in gams_api_mock.request_history if r.method == "POST" and r.url.endswith("/objects")]
+        gams_api_mock.reset_mock()
+        return len(uploads)
+
+    def remote_objects(*object_ids):
+        gams_api_mock.get(re.compile(r".*/projects/[^/]+/objects/ids"),
+                          json={"results": list(object_ids), "pagination": {"hasNext": False}})
+        gams_api_mock.delete(re.compile(r".*/projects/[^/]+/objects/[^/]+$"), status_code=200)
+
+    assert run_ingest() == 2
+    remote_objects("demo.person.1", "demo.person.2")
+    assert run_ingest() == 0
+
+    with open(tmp_path / "demo.person.2" / "manifest-md5.txt", "a") as manifest:
+        manifest.write("0123 data/content/NEW.xml\n")
+
+    assert run_ingest() == 1
+    assert (tmp_path / ".pyrilo" / "ingest-state.sqlite").exists()
+
+    # unchanged, but deleted on the server since
+    remote_objects("demo.person.2")
+    assert run_ingest() == 1
+
+
+def test_cli_ingest_uses_object_inventory(tmp_path, mock_pyrilo_ingest_env):
+    """
+    INTEGRATION TEST:
+    Verifies that existence checks come from the paginated inventory listing instead of HEAD requests.
+    """
+    gams_api_mock, test_pyrilo_project = mock_pyrilo_ingest_env
+
+    for i in range(1, 4):
+        shutil.copytree(test_pyrilo_project.INGEST_BAGS_PATH / "demo.person.1", tmp_path / f"demo.person.{i}")
+
+    api_base = f"{test_pyrilo_project.TEST_HOST}/api/v1"
+    gams_api_mock.get(f"{api_base}/projects/demo/objects/ids", [
+        {"json": {"results": ["demo.person.1"], "pagination": {"hasNext": True}}},
+        {"json": {"results": ["demo.person.3"], "pagination": {"hasNext": False}}},
+    ])
+    gams_api_mock.delete(re.compile(rf"{api_base}/projects/demo/objects/demo\.person\.\d"), status_code=200)
+
+    result = CliRunner().invoke(
+        cli,
+        [
+            "--host", test_pyrilo_project.TEST_HOST,
+            "--bag_root", str(tmp_path),
+            "ingest", test_pyrilo_project.TEST_PROJECT,
+            "--workers", "2"
+        ],
+        env={"PYRILO_USER": "testuser", "PYRILO_PASSWORD": "testpass"}
+    )
+
+    assert result.exit_code == 0, result.output
+
+    history = gams_api_mock.request_history
+    assert not [r for r in history if r.method == "HEAD"]
+    deleted = sorted(r.url.rsplit("/", 1)[-1] for r in history if r.method == "DELETE")
+    assert deleted == ["demo.person.1", "demo.person.3"]
+
+
+def test_cli_ingest_retry_failed_and_resume(tmp_path, mock_pyrilo_ingest_env):
+    """
+    INTEGRATION TEST:
+    A first run fails for one bag. '--retry-failed' then only ingests that bag and '--resume'
+    skips all bags the journal records as uploaded.
+    """
+    gams_api_mock, test_pyrilo_project = mock_pyrilo_ingest_env
+
+    for i in range(1, 4):
+        shutil.copytree(test_pyrilo_project.INGEST_BAGS_PATH / "demo.person.1", tmp_path / f"demo.person.{i}")
+
+    api_base = f"{test_pyrilo_project.TEST_HOST}/api/v1"
+    gams_api_mock.get(
+        f"{api_base}/projects/demo/objects/ids",
+        json={"results": ["demo.person.2"], "pagination": {"hasNext": False}}
+    )
+    gams_api_mock.delete(f"{api_base}/projects/demo/objects/demo.person.2", status_code=500)
+
+    def run_ingest(*options):
+        result = CliRunner().invoke(
+            cli,
+            [
+                "--host", test_pyrilo_project.TEST_HOST,
+                "--bag_root", str(tmp_path),
+                "ingest", test_pyrilo_project.TEST_PROJECT,
+                *options
+            ],
+            env={"PYRILO_USER": "testuser", "PYRILO_PASSWORD": "testpass"}
+        )
+        uploads = [r for r in gams_api_mock.request_history if r.method == "POST" and r.url.endswith("/objects")]
+        gams_api_mock.reset_mock()
+        return result, len(uploads)
+
+    result, uploads = run_ingest()
+    assert result.exit_code == 1
+    assert uploads == 2
+    assert (tmp_path / ".pyrilo" / "journal-demo.jsonl").exists()
+
+    gams_api_mock.delete(f"{api_base}/projects/demo/objects/demo.person.2", status_code=200)
+
+    result, uploads = run_ingest("--retry-failed")
+    assert result.exit_code == 0, result.output
+    assert uploads == 1
+
+    result, uploads = run_ingest("--resume")
+    assert result.exit_code == 0, result.output
+    assert uploads == 0
+
+    result, _ = run_ingest("--resume", "--retry-failed")
+    assert result.exit_code == 2
+
+
+def test_cli_validate_runs_without_login(tmp_path):
+    """
+    INTEGRATION TEST:
+    'pyrilo validate' checks the local bags only, without credentials or network access.
+    """
+    shutil.copytree(TestPyriloProject.INGEST_BAGS_PATH / "demo.person.1", tmp_path / "demo.person.1")
+    shutil.copytree(TestPyriloProject.INGEST_BAGS_PATH / "demo.person.1", tmp_path / "demo.person.2")
+    (tmp_path / "demo.person.2" / "data" / "content" / "DC.xml").write_text("<changed/>")
+
+    result = CliRunner().invoke(cli, ["--bag_root", str(tmp_path), "validate", "demo", "--workers", "2"], env={})
+
+    assert result.exit_code == 1
+    assert "checksum mismatch for data/content/DC.xml" in result.output
+    assert "Validated 2 bags: 1 valid, 1 invalid." in result.output
+
+
+def test_cli_ingest_validate_rejects_bag_before_delete(tmp_path, mock_pyrilo_ingest_env):
+    """
+    INTEGRATION TEST:
+    With '--validate', an invalid bag fails before its existing remote object is deleted.
+    """
+    gams_api_mock, test_pyrilo_project = mock_pyrilo_ingest_env
+
+    for i in range(1, 3):
+        shutil.copytree(test_pyrilo_project.INGEST_BAGS_PATH / "demo.person.1", tmp_path / f"demo.person.{i}")
+    (tmp_path / "demo.person.2" / "data" / "content" / "DC.xml").write_text("<changed/>")
+
+    api_base = f"{test_pyrilo_project.TEST_HOST}/api/v1"
+    gams_api_mock.get(
+        f"{api_base}/projects/demo/objects/ids",
+        json={"results": ["demo.person.1", "demo.person.2"], "pagination": {"hasNext": False}}
+    )
+    gams_api_mock.delete(re.compile(rf"{api_base}/projects/demo/objects/demo\.person\.\d"), status_code=200)
+
+    result = CliRunner().invoke(
+        cli,
+        [
+            "--host", test_pyrilo_project.TEST_HOST,
+            "--bag_root", str(tmp_path),
+            "ingest", test_pyrilo_project.TEST_PROJECT,
+            "--validate", "--validate-workers", "2"
+        ],
+        env={"PYRILO_USER": "testuser", "PYRILO_PASSWORD": "testpass"}
+    )
+
+    assert result.exit_code == 1
+    assert "Batch ingest completed with 1 errors: ['demo.person.2']" in result.output
+    deleted = [r.url.rsplit("/", 1)[-1] for r in gams_api_mock.request_history if r.method == "DELETE"]
+    assert deleted == ["demo.person.1"]
+
+
+def test_cli_ingest_writes_metrics_file(tmp_path, mock_pyrilo_ingest_env):
+    """
+    INTEGRATION TEST:
+    '--metrics-file' exports request metrics per endpoint template and stage timings.
+    """
+    gams_api_mock, test_pyrilo_project = mock_pyrilo_ingest_env
+    shutil.copytree(test_pyrilo_project.INGEST_BAGS_PATH / "demo.person.1", tmp_path / "bags" / "demo.person.1")
+    metrics_file = tmp_path / "pyrilo.prom"
+
+    result = CliRunner().invoke(
+        cli,
+        [
+            "--host", test_pyrilo_project.TEST_HOST,
+            "--bag_root", str(tmp_path / "bags"),
+            "--metrics-file", str(metrics_file),
+            "ingest", test_pyrilo_project.TEST_PROJECT
+        ],
+        env={"PYRILO_USER": "testuser", "PYRILO_PASSWORD": "testpass"}
+    )
+
+    assert result.exit_code == 0, result.output
+    metrics = metrics_file.read_text()
+    assert 'pyrilo_http_requests_total{method="POST",endpoint="projects/{p}/objects",status="2xx"} 1' in metrics
+    assert 'pyrilo_http_requests_total{method="GET",endpoint="projects/{p}/objects/ids",status="2xx"} 1' in metrics
+    assert 'pyrilo_stage_duration_seconds_count{stage="zip"} 1' in metrics
+    assert 'pyrilo_stage_duration_seconds_count{stage="pipeline.upload"} 1' in metrics
+
+
+def test_cli_ingest_writes_profile(tmp_path, mock_pyrilo_ingest_env):
+    """
+    INTEGRATION TEST:
+    '--profile' writes a summary with the time per stage and bag, and the call stats as .pstats file.
+    """
+    gams_api_mock, test_pyrilo_project = mock_pyrilo_ingest_env
+    shutil.copytree(test_pyrilo_project.INGEST_BAGS_PATH / "demo.person.1", tmp_path / "bags" / "demo.person.1")
+    profile = tmp_path / "ingest-profile"
+
+    result = CliRunner().invoke(
+        cli,
+        [
+            "--host", test_pyrilo_project.TEST_HOST,
+            "--bag_root", str(tmp_path / "bags"),
+            "--profile", str(profile),
+            "ingest", test_pyrilo_project.TEST_PROJECT
+        ],
+        env={"PYRILO_USER": "testuser", "PYRILO_PASSWORD": "testpass"}
+    )
+
+    assert result.exit_code == 0, result.output
+    summary = (tmp_path / "ingest-profile.txt").read_text()
+    for stage in ["discover", "verify", "package", "delete-existing", "upload"]:
+        assert stage in summary
+    assert "demo.person.1" in summary
+    assert (tmp_path / "ingest-profile.pstats").stat().st_size > 0
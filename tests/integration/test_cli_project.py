@@ -1,3 +1,4 @@
+import json
 from click.testing import CliRunner
 from pyrilo.cli import cli
 
@@ -94,4 +95,77 @@ def test_delete_project_fails_if_exists(mock_pyrilo_ingest_env):
 
     # Expecting exit code 1 because cli.py catches Exception and calls sys.exit(1)
     assert result.exit_code == 1
-    assert "Failed to delete project" in result.output
\ No newline at end of file
+    assert "Failed to delete project" in result.output
+
+def test_delete_objects_adaptive_reports_failures(mock_pyrilo_ingest_env):
+    """
+    Verifies 'delete_objects --workers --adaptive' deletes all objects concurrently and reports
+    the objects the server refused (503) instead of aborting.
+    """
+    gams_api_mock, test_pyrilo_project = mock_pyrilo_ingest_env
+    api_base = f"{test_pyrilo_project.TEST_HOST}/api/v1"
+
+    object_ids = [f"demo.person.{i}" for i in range(1, 11)]
+    gams_api_mock.get(
+        f"{api_base}/projects/demo/objects/ids",
+        json={"results": object_ids, "pagination": {"hasNext": False}}
+    )
+    for object_id in object_ids:
+        gams_api_mock.delete(f"{api_base}/projects/demo/objects/{object_id}", status_code=200)
+    gams_api_mock.delete(f"{api_base}/projects/demo/objects/demo.person.4", status_code=503)
+
+    result = CliRunner().invoke(cli, [
+        "--host", test_pyrilo_project.TEST_HOST,
+        "--retries", "0",
+        "delete_objects", test_pyrilo_project.TEST_PROJECT,
+        "--workers", "4", "--adaptive"
+    ], env={"PYRILO_USER": "u", "PYRILO_PASSWORD": "p"})
+
+    assert result.exit_code == 1
+    assert "Deleting objects completed with 1 errors: ['demo.person.4']" in result.output
+    deletes = [r for r in gams_api_mock.request_history if r.method == "DELETE"]
+    assert len(deletes) == 10
+
+
+def test_list_objects_prints_ids_of_all_pages(mock_pyrilo_ingest_env):
+    """
+    Verifies 'list_objects' follows the pagination and prints one id per line.
+    """
+    gams_api_mock, test_pyrilo_project = mock_pyrilo_ingest_env
+    api_base = f"{test_pyrilo_project.TEST_HOST}/api/v1"
+    gams_api_mock.get(f"{api_base}/projects/demo/objects/ids?pageIndex=0",
+                      json={"results": ["demo.1", "demo.2"], "pagination": {"hasNext": True}})
+    gams_api_mock.get(f"{api_base}/projects/demo/objects/ids?pageIndex=1",
+                      json={"results": ["demo.3"], "pagination": {"hasNext": False}})
+
+    result = CliRunner().invoke(cli, [
+        "--host", test_pyrilo_project.TEST_HOST,
+        "list_objects", test_pyrilo_project.TEST_PROJECT
+    ], env={"PYRILO_USER": "u", "PYRILO_PASSWORD": "p"})
+
+    assert result.exit_code == 0, result.output
+    assert result.stdout.split() == ["demo.1", "demo.2", "demo.3"]
+
+
+def test_delete_objects_writes_failure_report(mock_pyrilo_ingest_env, tmp_path):
+    """
+    Verifies 'delete_objects --failure-report' lists the objects that could not be deleted.
+    """
+    gams_api_mock, test_pyrilo_project = mock_pyrilo_ingest_env
+    api_base = f"{test_pyrilo_project.TEST_HOST}/api/v1"
+    gams_api_mock.get(f"{api_base}/projects/demo/objects/ids",
+                      json={"results": ["demo.1", "demo.2"], "pagination": {"hasNext": False}})
+    gams_api_mock.delete(f"{api_base}/projects/demo/objects/demo.1", status_code=200)
+    gams_api_mock.delete(f"{api_base}/projects/demo/objects/demo.2", status_code=403, text="Forbidden")
+    report_path = tmp_path / "failures.json"
+
+    result = CliRunner().invoke(cli, [
+        "--host", test_pyrilo_project.TEST_HOST,
+        "delete_objects", test_pyrilo_project.TEST_PROJECT,
+        "--failure-report", str(report_path)
+    ], env={"PYRILO_USER": "u", "PYRILO_PASSWORD": "p"})
+
+    assert result.exit_code == 1
+    report = json.loads(report_path.read_text())
+    assert report["deleted"] == 1
+    assert list(report["failed"]) == ["demo.2"]
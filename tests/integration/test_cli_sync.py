@@ -46,4 +46,31 @@ def test_sync_plexus_search_remove(mock_pyrilo_ingest_env):
     # Verify DELETE method
     history = gams_api_mock.request_history
     calls = [c for c in history if target_url in c.url and c.method == "DELETE"]
-    assert len(calls) == 1
\ No newline at end of file
+    assert len(calls) == 1
+
+def test_sync_all_reports_every_target(mock_pyrilo_ingest_env):
+    """
+    Test 'pyrilo sync all <project>' integrates all targets within one login and reports them.
+    """
+    gams_api_mock, test_pyrilo_project = mock_pyrilo_ingest_env
+
+    base_url = f"{test_pyrilo_project.TEST_HOST}/api/v1/integration"
+    project = test_pyrilo_project.TEST_PROJECT
+    gams_api_mock.post(f"{base_url}/projects/{project}/objects", status_code=200)
+    gams_api_mock.post(f"{base_url}/c-search/projects/{project}/objects", status_code=200)
+    gams_api_mock.post(f"{base_url}/plexus-search/projects/{project}/objects", status_code=500)
+
+    runner = CliRunner()
+    result = runner.invoke(cli, [
+        "--host", test_pyrilo_project.TEST_HOST, "--retries", "0",
+        "sync", "all", project, "--timeout", "60", "--timeout", "c-search=600"
+    ], env={"PYRILO_USER": "u", "PYRILO_PASSWORD": "p"})
+
+    assert result.exit_code == 1
+    assert "2 of 3 targets succeeded" in result.output
+    timeouts = {c.url: c.timeout for c in gams_api_mock.request_history if c.method == "POST" and "integration" in c.url}
+    assert timeouts == {
+        f"{base_url}/projects/{project}/objects": 60,
+        f"{base_url}/c-search/projects/{project}/objects": 600,
+        f"{base_url}/plexus-search/projects/{project}/objects": 60,
+    }
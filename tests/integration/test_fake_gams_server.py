@@ -0,0 +1,310 @@
+import logging
+import os
+import shutil
+import stat
+import time
+
+import pytest
+import requests
+
+from pyrilo.cli import bootstrap_application
+from pyrilo.exceptions import PyriloAuthenticationError, PyriloConflictError
+from pyrilo.app.IntegrationService import IntegrationService
+from pyrilo.infrastructure.IngestJournal import IngestJournal
+from pyrilo.infrastructure.IngestStateStore import IngestStateStore
+from pyrilo.infrastructure.InventoryCache import InventoryCache
+from pyrilo.infrastructure.SessionCache import SessionCache
+from tests.utils.FakeGamsServer import FakeGamsServer
+from tests.utils.FaultRule import FaultRule
+from tests.utils.LatencyDistribution import LatencyDistribution
+from tests.utils.TestPyriloProject import TestPyriloProject
+
+PROJECT = TestPyriloProject.TEST_PROJECT
+
+
+@pytest.fixture
+def bag_root(tmp_path):
+    shutil.copytree(TestPyriloProject.INGEST_BAGS_PATH / "demo.person.1", tmp_path / "demo.person.1")
+    return tmp_path
+
+
+def _logged_in_app(server: FakeGamsServer, bag_root, username: str = "testuser", **kwargs):
+    pyrilo_app = bootstrap_application(server.url, str(bag_root), **kwargs)
+    pyrilo_app.login(username, "testpass")
+    return pyrilo_app
+
+
+def test_requests_require_login(bag_root):
+    with FakeGamsServer() as server:
+        pyrilo_app = bootstrap_application(server.url, str(bag_root), retries=0)
+        with pytest.raises(PyriloAuthenticationError):
+            pyrilo_app.list_objects(PROJECT)
+
+        pyrilo_app.login("testuser", "testpass")
+        assert pyrilo_app.list_objects(PROJECT) == []
+
+        # an expired session is replaced by a new login
+        server.expire_sessions()
+        assert pyrilo_app.list_objects(PROJECT) == []
+        assert server.requests("login") == 2
+
+
+def test_ingest_integrate_and_delete_keep_state(bag_root):
+    with FakeGamsServer() as server:
+        pyrilo_app = _logged_in_app(server, bag_root)
+
+        pyrilo_app.ingest_bags(PROJECT)
+        pyrilo_app.setup_integration_services(PROJECT)
+        pyrilo_app.setup_integration_services(PROJECT)  # already set up (409) is accepted
+        pyrilo_app.integrate_project_objects(PROJECT)
+        pyrilo_app.integrate_project_objects_plexus_search(PROJECT)
+
+        assert server.objects(PROJECT) == {"demo.person.1"}
+        assert server.integrated_objects(PROJECT) == {"demo.person.1"}
+        assert server.integrated_objects(PROJECT, "plexus-search") == {"demo.person.1"}
+        assert server.integrated_objects(PROJECT, "c-search") == set()
+
+        pyrilo_app.delete_objects(PROJECT)
+        assert server.objects(PROJECT) == set()
+        assert server.integrated_objects(PROJECT) == set()
+
+
+def test_injected_unavailability_is_retried(bag_root):
+    faults = [
+        # Retry-After 0 skips the client backoff
+        FaultRule(route="ingest", status=503, retry_after="0", times=2),
+        FaultRule(route="list", drop=True, times=1),
+    ]
+    with FakeGamsServer(faults=faults) as server:
+        pyrilo_app = _logged_in_app(server, bag_root)
+
+        pyrilo_app.ingest_bags(PROJECT)
+
+        assert server.objects(PROJECT) == {"demo.person.1"}
+        assert server.requests("ingest") == 3
+        assert server.requests("list") == 2
+        assert [fault.injected for fault in faults] == [2, 1]
+
+
+def test_injected_conflict_is_reported(bag_root):
+    with FakeGamsServer(faults=[FaultRule(route="project", method="PUT", status=409)]) as server:
+        pyrilo_app = _logged_in_app(server, bag_root)
+
+        with pytest.raises(PyriloConflictError):
+            pyrilo_app.project_service.client.put(f"projects/{PROJECT}")
+
+
+def test_latency_and_concurrency_are_observable(bag_root):
+    with FakeGamsServer(latency={"object": LatencyDistribution.constant(0.1)}) as server:
+        server.add_objects(PROJECT, [f"{PROJECT}.{n}" for n in range(8)])
+        pyrilo_app = _logged_in_app(server, bag_root)
+
+        started_at = time.perf_counter()
+        pyrilo_app.delete_objects(PROJECT, workers=4)
+        elapsed = time.perf_counter() - started_at
+
+        assert server.objects(PROJECT) == set()
+        # 8 deletes of 0.1s, 4 at a time
+        assert 0.2 <= elapsed < 0.8
+        assert server.max_in_flight == 4
+        # pooled keep-alive connections are reused (plus the connection of the login and the listing)
+        assert server.connections <= 5
+
+
+def test_bandwidth_cap_slows_down_bodies():
+    with FakeGamsServer(bandwidth=256 * 1024, require_auth=False) as server:
+        started_at = time.perf_counter()
+        response = requests.post(f"{server.url}/api/v1/projects/{PROJECT}/objects", data=b"x" * 64 * 1024)
+        elapsed = time.perf_counter() - started_at
+
+    # not a bag archive, but the whole body was read at 256 KiB/s first
+    assert response.status_code == 400
+    assert elapsed >= 0.2
+
+
+def test_delete_objects_while_paging_deletes_everything(bag_root):
+    """
+    Deleting while the listing pages in shifts the pages, the listing is repeated until it's empty.
+    """
+    with FakeGamsServer(page_size=3) as server:
+        server.add_objects(PROJECT, [f"{PROJECT}.{n}" for n in range(20)])
+        pyrilo_app = _logged_in_app(server, bag_root)
+
+        pyrilo_app.delete_objects(PROJECT)
+
+        assert server.objects(PROJECT) == set()
+        assert server.requests("object", "DELETE") == 20
+
+
+def test_inventory_cache_saves_listings(bag_root, tmp_path, caplog):
+    """
+    A fresh cached inventory replaces the listing, an expired one is revalidated with If-None-Match if it
+    fits in one page and listed again otherwise.
+    """
+    with FakeGamsServer(page_size=3) as server:
+        server.add_objects(PROJECT, [f"{PROJECT}.{n}" for n in range(5)])
+        cache = InventoryCache(str(tmp_path / "inventory.sqlite"))
+        pyrilo_app = _logged_in_app(server, bag_root, inventory_cache=cache)
+
+        pyrilo_app.ingest_bags(PROJECT)
+        listed = server.requests("list")
+        assert listed == 2
+        assert cache.load(server.url, PROJECT).object_ids == server.objects(PROJECT)
+
+        # re-ingest: the object is known to exist without listing again
+        pyrilo_app.ingest_bags(PROJECT)
+        assert server.requests("list") == listed
+        assert server.requests("object", "DELETE") == 1
+
+        # expired: a 304 for the first page says nothing about the other pages, they are listed again
+        caplog.set_level(logging.INFO)
+        cache.ttl = 0
+        service = pyrilo_app.digital_object_service
+        assert service.inventory(PROJECT) == server.objects(PROJECT)
+        assert server.requests("list") == listed + 2
+        assert service.inventory(PROJECT) == server.objects(PROJECT)
+        assert server.requests("list") == listed + 4
+        assert "still valid" not in caplog.text
+
+        cache.ttl = 600
+        pyrilo_app.delete_objects(PROJECT)
+        assert server.objects(PROJECT) == set()
+        assert cache.load(server.url, PROJECT).object_ids == set()
+
+        # a single page listing changed since it was cached (our deletes), then it's unchanged (304)
+        cache.ttl = 0
+        listed = server.requests("list")
+        assert service.inventory(PROJECT) == set()
+        assert server.requests("list") == listed + 1
+        server.add_objects(PROJECT, [f"{PROJECT}.new"])
+        assert service.inventory(PROJECT) == {f"{PROJECT}.new"}
+        caplog.clear()
+        assert service.inventory(PROJECT) == {f"{PROJECT}.new"}
+        assert server.requests("list") == listed + 3
+        assert "still valid" in caplog.text
+
+
+def test_ingest_integrates_only_the_ingested_objects(bag_root):
+    with FakeGamsServer() as server:
+        server.add_objects(PROJECT, [f"{PROJECT}.other.{n}" for n in range(10)])
+        pyrilo_app = _logged_in_app(server, bag_root)
+
+        pyrilo_app.ingest_bags(PROJECT, integrate=IntegrationService.TARGETS, integrate_workers=2)
+
+        for target in ["integration", "c-search", "plexus-search"]:
+            assert server.integrated_objects(PROJECT, target) == {"demo.person.1"}
+        # one call per target for the single ingested object, none for the whole project
+        assert server.requests("integration", "POST") == 3
+
+
+def test_failed_integration_is_ingested_again(bag_root, tmp_path):
+    """
+    An object that was uploaded but not integrated isn't recorded as ingested, the next run of changed bags
+    ingests it again.
+    """
+    with FakeGamsServer(faults=[FaultRule(route="integration", method="POST", status=500, times=1)]) as server:
+        pyrilo_app = _logged_in_app(server, bag_root)
+        journal = IngestJournal(str(tmp_path / "journal.jsonl"), host=server.url)
+        pyrilo_app.use_ingest_journal(journal)
+        pyrilo_app.use_ingest_state_store(IngestStateStore(str(tmp_path / "state.db")))
+
+        with pytest.raises(RuntimeError):
+            pyrilo_app.ingest_bags(PROJECT, integrate=["c-search"])
+        assert journal.bags_in_state(PROJECT, {IngestJournal.UPLOADED}) == set()
+        assert journal.bags_in_state(PROJECT, {IngestJournal.FAILED}) == {"demo.person.1"}
+
+        pyrilo_app.ingest_bags(PROJECT, integrate=["c-search"], changed_only=True)
+        assert server.integrated_objects(PROJECT, "c-search") == {"demo.person.1"}
+        assert journal.bags_in_state(PROJECT, {IngestJournal.UPLOADED}) == {"demo.person.1"}
+        journal.close()
+
+
+def test_failed_reingest_disintegrates_the_deleted_object(bag_root):
+    with FakeGamsServer(faults=[FaultRule(route="ingest", status=400, times=1)]) as server:
+        server.add_objects(PROJECT, ["demo.person.1"])
+        server.integrated[("c-search", PROJECT)] = {"demo.person.1"}
+        pyrilo_app = _logged_in_app(server, bag_root)
+
+        with pytest.raises(RuntimeError):
+            pyrilo_app.ingest_bags(PROJECT, integrate=["c-search"])
+
+        assert server.objects(PROJECT) == set()
+        assert server.requests("integration", "DELETE") == 1
+
+
+def test_delete_objects_disintegrates_deleted_objects(bag_root):
+    with FakeGamsServer() as server:
+        server.add_objects(PROJECT, [f"{PROJECT}.{n}" for n in range(5)])
+        pyrilo_app = _logged_in_app(server, bag_root)
+
+        pyrilo_app.delete_objects(PROJECT, workers=2, disintegrate=["c-search", "plexus-search"])
+
+        assert server.objects(PROJECT) == set()
+        assert server.requests("integration", "DELETE") == 10
+
+
+def test_sync_all_fans_out_over_targets(bag_root):
+    """
+    All targets are integrated concurrently, a target exceeding its timeout fails alone and isn't retried.
+    """
+    latency = {"integration": LatencyDistribution.constant(0.3)}
+    with FakeGamsServer(latency=latency) as server:
+        server.add_objects(PROJECT, ["demo.person.1"])
+        pyrilo_app = _logged_in_app(server, bag_root)
+
+        started_at = time.perf_counter()
+        report = pyrilo_app.sync_all(PROJECT, timeouts={"integration": 0})
+        assert time.perf_counter() - started_at < 0.8
+        assert report.succeeded
+        assert server.max_in_flight == 3
+        for target in IntegrationService.TARGETS:
+            assert server.integrated_objects(PROJECT, target) == {"demo.person.1"}
+
+        report = pyrilo_app.sync_all(PROJECT, remove=True, timeouts={"c-search": 0.05})
+        assert set(report.failed) == {"c-search"}
+        assert "c-search" in report.summary() and "FAILED" in report.summary()
+        assert server.integrated_objects(PROJECT, "plexus-search") == set()
+        assert server.requests("integration", "DELETE") == 3
+
+
+def test_expired_session_triggers_a_single_login_for_concurrent_requests(bag_root):
+    with FakeGamsServer(page_size=2) as server:
+        server.add_objects(PROJECT, [f"{PROJECT}.{n}" for n in range(20)])
+        pyrilo_app = _logged_in_app(server, bag_root)
+
+        server.expire_sessions()
+        pyrilo_app.delete_objects(PROJECT, workers=8)
+
+        assert server.objects(PROJECT) == set()
+        assert server.requests("login") == 2
+
+
+def test_cached_session_is_reused_across_invocations(bag_root, tmp_path):
+    cache_path = tmp_path / "sessions.json"
+    with FakeGamsServer() as server:
+        _logged_in_app(server, bag_root, session_cache=SessionCache(str(cache_path)))
+        assert stat.S_IMODE(os.stat(cache_path).st_mode) == 0o600
+
+        # a second invocation: no login form flow
+        pyrilo_app = _logged_in_app(server, bag_root, session_cache=SessionCache(str(cache_path)))
+        assert pyrilo_app.list_objects(PROJECT) == []
+        assert server.requests("auth") == 1
+        assert server.requests("login") == 1
+
+        # the cached session expired on the server: logged in again and cached
+        server.expire_sessions()
+        pyrilo_app = _logged_in_app(server, bag_root, session_cache=SessionCache(str(cache_path)))
+        assert pyrilo_app.list_objects(PROJECT) == []
+        assert server.requests("login") == 2
+
+        pyrilo_app = _logged_in_app(server, bag_root, session_cache=SessionCache(str(cache_path)))
+        assert pyrilo_app.list_objects(PROJECT) == []
+        assert server.requests("login") == 2
+
+        # another user on the same host and cache file logs in with their own credentials
+        _logged_in_app(server, bag_root, username="otheruser", session_cache=SessionCache(str(cache_path)))
+        assert server.requests("login") == 3
+        # ... and both sessions are reused afterwards
+        _logged_in_app(server, bag_root, username="otheruser", session_cache=SessionCache(str(cache_path)))
+        _logged_in_app(server, bag_root, session_cache=SessionCache(str(cache_path)))
+        assert server.requests("login") == 3
@@ -0,0 +1,97 @@
+import threading
+import time
+
+import pytest
+
+from pyrilo.exceptions import PyriloApiError, PyriloNetworkError, PyriloNotFoundError
+from pyrilo.infrastructure.AdaptiveConcurrencyLimiter import AdaptiveConcurrencyLimiter
+
+
+def _saturated_success(limiter: AdaptiveConcurrencyLimiter, latency: float = 0.1):
+    """
+    Reports a success while the limit is fully used.
+    """
+    limiter._in_flight = limiter.limit
+    limiter.on_success(latency)
+    limiter._in_flight = 0
+
+
+def test_limit_grows_while_latency_is_stable():
+    limiter = AdaptiveConcurrencyLimiter(max_limit=16, initial_limit=2)
+
+    for _ in range(6):
+        _saturated_success(limiter)
+
+    assert limiter.limit == 8
+
+    # not using the limit doesn't grow it
+    limiter.on_success(0.1)
+    assert limiter.limit == 8
+
+
+def test_limit_is_held_when_latency_grows():
+    limiter = AdaptiveConcurrencyLimiter(max_limit=16, initial_limit=4)
+    _saturated_success(limiter, 0.1)
+
+    assert limiter.limit == 5
+
+    for _ in range(10):
+        _saturated_success(limiter, 1.0)
+
+    assert limiter.limit == 5
+
+
+def test_overload_halves_limit_once_per_round():
+    limiter = AdaptiveConcurrencyLimiter(max_limit=16, initial_limit=8)
+
+    round_started = time.monotonic()
+    limiter.on_overload(round_started)
+    limiter.on_overload(round_started)
+
+    assert limiter.limit == 4
+
+    # after slow start ended, the limit grows by one per round
+    for _ in range(5):
+        _saturated_success(limiter)
+    assert limiter.limit == 5
+
+
+@pytest.mark.parametrize("error,overload", [
+    (PyriloNetworkError("timeout"), True),
+    (PyriloApiError("busy", 503), True),
+    (PyriloApiError("too many requests", 429), True),
+    (PyriloApiError("server error", 500), False),
+    (PyriloNotFoundError("missing", 404), False),
+])
+def test_overload_classification(error, overload):
+    assert AdaptiveConcurrencyLimiter.is_overload(error) is overload
+
+
+def test_slot_bounds_concurrency_and_backs_off():
+    limiter = AdaptiveConcurrencyLimiter(max_limit=4, initial_limit=2)
+    lock = threading.Lock()
+    in_flight = []
+    peak = [0]
+
+    def request(fail: bool):
+        try:
+            with limiter.slot():
+                with lock:
+                    in_flight.append(1)
+                    peak[0] = max(peak[0], len(in_flight))
+                time.sleep(0.02)
+                with lock:
+                    in_flight.pop()
+                if fail:
+                    raise PyriloApiError("busy", 503)
+        except PyriloApiError:
+            pass
+
+    threads = [threading.Thread(target=request, args=(i == 0,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert peak[0] <= 4
+    assert limiter.limit < 4
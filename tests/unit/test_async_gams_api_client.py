@@ -0,0 +1,113 @@
+import asyncio
+import threading
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+
+from pyrilo.api.AsyncGamsApiClient import AsyncGamsApiClient  # noqa: E402
+from pyrilo.api.DigitalObject.AsyncDigitalObjectService import AsyncDigitalObjectService  # noqa: E402
+from pyrilo.app.AsyncIngestEngine import AsyncIngestEngine  # noqa: E402
+from pyrilo.app.AsyncIngestService import AsyncIngestService  # noqa: E402
+from pyrilo.app.AsyncIntegrationService import AsyncIntegrationService  # noqa: E402
+from pyrilo.exceptions import (  # noqa: E402
+    PyriloApiError,
+    PyriloConflictError,
+    PyriloNetworkError,
+    PyriloNotFoundError,
+)
+from pyrilo.infrastructure.FileSystemService import FileSystemService  # noqa: E402
+from pyrilo.infrastructure.MultipartStream import MultipartStream  # noqa: E402
+from tests.utils.TestPyriloProject import TestPyriloProject  # noqa: E402
+
+
+def _client(handler) -> AsyncGamsApiClient:
+    client = AsyncGamsApiClient("http://mock-host")
+    client.session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client
+
+
+@pytest.mark.parametrize("status_code, exception_class", [
+    (404, PyriloNotFoundError),
+    (409, PyriloConflictError),
+    (500, PyriloApiError),
+])
+def test_async_error_handling_mapping(status_code, exception_class):
+    """
+    Verifies that the async client raises the same exceptions as the synchronous one.
+    """
+    client = _client(lambda request: httpx.Response(status_code, text="Error Message"))
+
+    with pytest.raises(exception_class) as exc_info:
+        asyncio.run(client.get("some-endpoint"))
+
+    assert f"API Error {status_code}" in str(exc_info.value)
+
+
+def test_async_network_error():
+    def handler(request):
+        raise httpx.ConnectError("refused")
+
+    with pytest.raises(PyriloNetworkError):
+        asyncio.run(_client(handler).get("some-endpoint"))
+
+
+def test_async_engine_ingests_bags_concurrently():
+    """
+    Verifies that the engine replaces existing objects, uploads the zipped bags and reports failures.
+    """
+    requests = []
+
+    def handler(request: httpx.Request):
+        requests.append((request.method, request.url.path))
+        if request.method == "HEAD":
+            return httpx.Response(200 if request.url.path.endswith("demo.person.1") else 404)
+        if request.method == "POST":
+            assert b"subInfoPackZIP" in request.read()
+            return httpx.Response(201)
+        return httpx.Response(200)
+
+    client = _client(handler)
+    engine = AsyncIngestEngine(
+        AsyncDigitalObjectService(client),
+        AsyncIngestService(client, FileSystemService(), str(TestPyriloProject.INGEST_BAGS_PATH)),
+        AsyncIntegrationService(client)
+    )
+
+    failures = asyncio.run(engine.ingest_bags("demo", ["demo.person.1", "demo.missing"], concurrency=10))
+
+    assert failures == ["demo.missing"]
+    assert ("DELETE", "/api/v1/projects/demo/objects/demo.person.1") in requests
+    assert requests.count(("POST", "/api/v1/projects/demo/objects")) == 1
+
+
+def test_async_upload_reads_the_archive_off_the_event_loop(tmp_path, monkeypatch):
+    """
+    Verifies that the archive is streamed as multipart body with a known length and read in worker threads.
+    """
+    archive_path = tmp_path / "bag.zip"
+    payload = bytes(range(256)) * 20_000
+    archive_path.write_bytes(payload)
+
+    reading_threads = set()
+    read = MultipartStream.read
+
+    def tracking_read(self, size=-1):
+        reading_threads.add(threading.get_ident())
+        return read(self, size)
+
+    monkeypatch.setattr(MultipartStream, "read", tracking_read)
+
+    received = {}
+
+    def handler(request: httpx.Request):
+        received["length"] = request.headers["Content-Length"]
+        received["body"] = request.read()
+        return httpx.Response(201)
+
+    service = AsyncIngestService(_client(handler), FileSystemService(), str(tmp_path))
+    asyncio.run(service.ingest_archive("demo", str(archive_path)))
+
+    assert int(received["length"]) == len(received["body"])
+    assert payload in received["body"]
+    assert reading_threads and threading.get_ident() not in reading_threads
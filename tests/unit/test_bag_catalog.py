@@ -0,0 +1,64 @@
+import os
+
+from pyrilo.infrastructure.BagCatalog import BagCatalog
+from tests.utils.TestPyriloProject import TestPyriloProject
+
+
+def _make_bag(path, oxum: str = "10.2"):
+    path.mkdir(parents=True)
+    (path / "bagit.txt").write_text("BagIt-Version: 1.0\n")
+    (path / "bag-info.txt").write_text(f"Bagging-Date: 2025-12-05\nPayload-Oxum: {oxum}\n")
+    (path / "data").mkdir()
+
+
+def test_scan_finds_nested_bags_with_payload_oxum(tmp_path):
+    """
+    Verifies that bags are detected by bagit.txt at any depth and not descended into.
+    """
+    _make_bag(tmp_path / "demo.1", "100.3")
+    _make_bag(tmp_path / "persons" / "2025" / "demo.2", "421964.5")
+    (tmp_path / "persons" / "not_a_bag").mkdir()
+    _make_bag(tmp_path / "demo.1" / "data" / "inner_bag")
+
+    bags = BagCatalog(str(tmp_path)).scan()
+
+    assert [bag.relative_path for bag in bags] == ["demo.1", "persons/2025/demo.2"]
+    assert bags[1].name == "demo.2"
+    assert (bags[0].payload_bytes, bags[0].payload_files) == (100, 3)
+    assert (bags[1].payload_bytes, bags[1].payload_files) == (421964, 5)
+
+
+def test_scan_reads_test_resource_bag():
+    bags = BagCatalog(str(TestPyriloProject.INGEST_BAGS_PATH)).scan()
+
+    assert [bag.name for bag in bags] == ["demo.person.1"]
+    assert bags[0].payload_bytes == 11241
+
+
+def test_rescan_only_relists_changed_directories(tmp_path, monkeypatch):
+    """
+    Verifies that a persisted index makes rescans incremental and still picks up new bags.
+    """
+    bag_root = tmp_path / "bags"
+    _make_bag(bag_root / "a" / "demo.1")
+    _make_bag(bag_root / "b" / "demo.2")
+    index_path = str(tmp_path / "catalog.json")
+
+    BagCatalog(str(bag_root), index_path=index_path).scan()
+
+    listed = []
+    original_scandir = os.scandir
+
+    def recording_scandir(path):
+        listed.append(os.path.relpath(path, bag_root))
+        return original_scandir(path)
+
+    monkeypatch.setattr(os, "scandir", recording_scandir)
+
+    _make_bag(bag_root / "b" / "demo.3")
+    os.utime(bag_root / "b", ns=(0, 1))  # make sure the mtime changes on coarse file systems
+
+    bags = BagCatalog(str(bag_root), index_path=index_path).scan()
+
+    assert [bag.name for bag in bags] == ["demo.1", "demo.2", "demo.3"]
+    assert sorted(listed) == ["b", os.path.join("b", "demo.3")]
@@ -0,0 +1,67 @@
+import json
+import shutil
+
+import pytest
+
+from pyrilo.infrastructure.BagValidator import BagValidator
+from tests.utils.TestPyriloProject import TestPyriloProject
+
+
+@pytest.fixture
+def validator():
+    validator = BagValidator(workers=4, buffer_size=1024)
+    yield validator
+    validator.close()
+
+
+@pytest.fixture
+def bag(tmp_path):
+    path = tmp_path / "demo.person.1"
+    shutil.copytree(TestPyriloProject.INGEST_BAGS_PATH / "demo.person.1", path)
+    return path
+
+
+def test_test_resource_bag_is_valid(validator, bag):
+    result = validator.validate(str(bag))
+
+    assert result.valid, result.errors
+    assert result.files_hashed == 4
+    assert result.bytes_hashed == 11241
+
+
+def test_modified_payload_is_detected(validator, bag):
+    with open(bag / "data" / "content" / "DC.xml", "r+b") as f:
+        f.write(b"X")
+
+    result = validator.validate(str(bag))
+
+    assert result.errors == [
+        "manifest-md5.txt: checksum mismatch for data/content/DC.xml",
+        "manifest-sha512.txt: checksum mismatch for data/content/DC.xml",
+    ]
+
+
+def test_structural_errors_are_reported(validator, bag):
+    (bag / "data" / "content" / "EXTRA.xml").write_text("<extra/>")
+    (bag / "bag-info.txt").write_text("Bagging-Date: 2025-12-05\n")
+    sip_path = bag / "data" / "meta" / "sip.json"
+    sip = json.loads(sip_path.read_text(encoding="utf-8"))
+    sip["contentFiles"][0]["bagpath"] = "data/content/MISSING.xml"
+    sip_path.write_text(json.dumps(sip), encoding="utf-8")
+
+    errors = validator.validate(str(bag)).errors
+
+    assert "bag-info.txt: Payload-Oxum is missing" in errors
+    assert "manifest-md5.txt: payload file data/content/EXTRA.xml is not listed" in errors
+    assert "data/meta/sip.json: contentFiles[0].bagpath data/content/MISSING.xml does not exist" in errors
+
+
+def test_validate_many_keeps_order(validator, tmp_path, bag):
+    (bag / "bagit.txt").unlink()
+    other = tmp_path / "demo.person.2"
+    shutil.copytree(TestPyriloProject.INGEST_BAGS_PATH / "demo.person.1", other)
+
+    results = list(validator.validate_many([str(bag), str(other), str(tmp_path / "missing")]))
+
+    assert [result.valid for result in results] == [False, True, False]
+    assert results[0].errors == ["bagit.txt is missing"]
@@ -0,0 +1,116 @@
+import logging
+import threading
+import time
+
+from pyrilo.app.BulkDeleteEngine import BulkDeleteEngine
+from pyrilo.exceptions import PyriloApiError, PyriloNotFoundError
+
+
+class FakeObjectService:
+    """
+    Keeps object ids in memory, pages them like the GAMS5 listing (deletes shift the pages).
+    """
+
+    def __init__(self, object_ids, page_size=5, delay=0.0, failing=(), missing=()):
+        self.object_ids = list(object_ids)
+        self.page_size = page_size
+        self.delay = delay
+        self.failing = set(failing)
+        self.missing = set(missing)
+        self.lock = threading.Lock()
+        self.running = 0
+        self.max_running = 0
+        self.first_delete = threading.Event()
+
+    def cached_objects(self, project_abbr):
+        return None
+
+    def iter_objects(self, project_abbr):
+        page_index = 0
+        while True:
+            with self.lock:
+                page = self.object_ids[page_index * self.page_size:(page_index + 1) * self.page_size]
+                has_next = (page_index + 1) * self.page_size < len(self.object_ids)
+            yield from page
+            if not has_next:
+                return
+            page_index += 1
+
+    def delete_object(self, object_id, project_abbr):
+        self.first_delete.set()
+        with self.lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        try:
+            time.sleep(self.delay)
+            if object_id in self.failing:
+                raise PyriloApiError(f"API Error 500 for {object_id}", 500)
+            if object_id in self.missing:
+                raise PyriloNotFoundError(f"API Error 404 for {object_id}", 404)
+            with self.lock:
+                self.object_ids.remove(object_id)
+        finally:
+            with self.lock:
+                self.running -= 1
+
+
+def test_deletes_all_objects_with_bounded_parallelism():
+    service = FakeObjectService([f"demo.{n}" for n in range(40)], delay=0.01)
+
+    report = BulkDeleteEngine(service, workers=4).run("demo")
+
+    assert report.deleted == 40
+    assert report.succeeded
+    assert service.object_ids == []
+    assert 1 < service.max_running <= 4
+
+
+def test_failures_are_reported_without_aborting():
+    service = FakeObjectService([f"demo.{n}" for n in range(12)], failing={"demo.3", "demo.7"}, missing={"demo.5"})
+
+    report = BulkDeleteEngine(service, workers=3).run("demo")
+
+    # already deleted objects count as deleted
+    assert report.deleted == 10
+    assert sorted(report.failed) == ["demo.3", "demo.7"]
+    assert "500" in report.failed["demo.3"]
+    assert sorted(service.object_ids) == ["demo.3", "demo.5", "demo.7"]
+
+
+def test_deletes_start_while_the_listing_pages_in():
+    service = FakeObjectService([f"demo.{n}" for n in range(10)])
+    listing = service.iter_objects
+
+    def slow_listing(project_abbr):
+        for n, object_id in enumerate(listing(project_abbr)):
+            if n == 5:
+                # the second page only arrives once the first deletes ran
+                assert service.first_delete.wait(timeout=5)
+            yield object_id
+
+    service.iter_objects = slow_listing
+
+    report = BulkDeleteEngine(service, workers=2).run("demo")
+
+    assert report.deleted == 10
+
+
+def test_progress_is_logged(caplog):
+    service = FakeObjectService([f"demo.{n}" for n in range(3)])
+
+    with caplog.at_level(logging.INFO):
+        BulkDeleteEngine(service, workers=2, progress_interval=0).run("demo")
+
+    assert "objects/s" in caplog.text
+    assert "Deleted 3 objects of project demo" in caplog.text
+
+
+def test_report_is_written_as_json(tmp_path):
+    service = FakeObjectService(["demo.1", "demo.2"], failing={"demo.2"})
+    report = BulkDeleteEngine(service, workers=1).run("demo")
+
+    report.write(str(tmp_path / "report.json"))
+
+    content = (tmp_path / "report.json").read_text()
+    assert '"deleted": 1' in content
+    assert '"demo.2"' in content
@@ -0,0 +1,45 @@
+import threading
+import time
+
+import pytest
+
+from pyrilo.api.CircuitBreaker import CircuitBreaker
+from pyrilo.exceptions import PyriloCircuitOpenError
+
+
+def test_circuit_opens_on_error_rate_and_closes_after_probe():
+    breaker = CircuitBreaker(failure_threshold=0.5, window=4, min_requests=4, open_duration=0.05)
+
+    breaker.record_success()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+
+    # the first request after the pause is the probe, others wait for its outcome
+    started = time.monotonic()
+    breaker.before_request()
+    assert time.monotonic() - started >= 0.04
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+
+    waiting = threading.Thread(target=breaker.before_request)
+    waiting.start()
+    waiting.join(timeout=0.1)
+    assert waiting.is_alive()
+
+    breaker.record_success()
+    waiting.join(timeout=1)
+    assert not waiting.is_alive()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_failed_probe_reopens_and_gives_up_after_max_pause():
+    breaker = CircuitBreaker(window=2, min_requests=2, open_duration=0.01, max_open_duration=0.02, max_pause=0.1)
+    breaker.record_failure()
+    breaker.record_failure()
+
+    with pytest.raises(PyriloCircuitOpenError):
+        while True:
+            breaker.before_request()
+            breaker.record_failure()
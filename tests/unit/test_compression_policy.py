@@ -0,0 +1,53 @@
+import os
+import zipfile
+
+from pyrilo.infrastructure.CompressionPolicy import CompressionPolicy
+from pyrilo.infrastructure.FileSystemService import FileSystemService
+
+
+def test_policy_stores_already_compressed_types(tmp_path):
+    """
+    Verifies that known compressed mime types and configured extensions are stored, not deflated.
+    """
+    policy = CompressionPolicy(stored_extensions={"CR2"})
+
+    assert policy.resolve(str(tmp_path / "scan.JPG")) == (zipfile.ZIP_STORED, None)
+    assert policy.resolve(str(tmp_path / "scan.tif")) == (zipfile.ZIP_STORED, None)
+    assert policy.resolve(str(tmp_path / "raw.cr2")) == (zipfile.ZIP_STORED, None)
+    assert policy.resolve(str(tmp_path / "DC.xml")) == (zipfile.ZIP_DEFLATED, 6)
+
+
+def test_policy_levels_per_extension_and_mime_type(tmp_path):
+    policy = CompressionPolicy(default_level=3, levels={".json": 1, "text/*": 9})
+
+    assert policy.resolve(str(tmp_path / "EVENTS.json")) == (zipfile.ZIP_DEFLATED, 1)
+    assert policy.resolve(str(tmp_path / "notes.txt")) == (zipfile.ZIP_DEFLATED, 9)
+    assert policy.resolve(str(tmp_path / "unknown.bin")) == (zipfile.ZIP_DEFLATED, 3)
+
+
+def test_policy_sampling_stores_incompressible_files(tmp_path):
+    """
+    Verifies that with sampling enabled, files whose first chunk does not shrink are stored.
+    """
+    random_file = tmp_path / "random.bin"
+    random_file.write_bytes(os.urandom(8192))
+    text_file = tmp_path / "text.bin"
+    text_file.write_bytes(b"lorem ipsum " * 1000)
+
+    policy = CompressionPolicy(sample_size=4096)
+
+    assert policy.resolve(str(random_file)) == (zipfile.ZIP_STORED, None)
+    assert policy.resolve(str(text_file)) == (zipfile.ZIP_DEFLATED, 6)
+
+
+def test_zip_applies_policy_per_entry(tmp_path):
+    bag_root = tmp_path / "bag"
+    bag_root.mkdir()
+    (bag_root / "image.jpg").write_bytes(os.urandom(1024))
+    (bag_root / "DC.xml").write_text("<dc/>" * 100)
+
+    service = FileSystemService(CompressionPolicy())
+    with service.create_spooled_zip_from_folder(str(bag_root), max_memory_size=1024 * 1024) as spooled_zip:
+        with zipfile.ZipFile(spooled_zip) as zf:
+            assert zf.getinfo("image.jpg").compress_type == zipfile.ZIP_STORED
+            assert zf.getinfo("DC.xml").compress_type == zipfile.ZIP_DEFLATED
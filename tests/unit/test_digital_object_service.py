@@ -0,0 +1,60 @@
+import sys
+import time
+from unittest.mock import MagicMock
+
+from pyrilo.api.DigitalObject.DigitalObjectService import DigitalObjectService
+
+
+class PagedClient:
+    """
+    Answers the object id listing with pages of page_size ids.
+    """
+
+    def __init__(self, total: int, page_size: int) -> None:
+        self.total = total
+        self.page_size = page_size
+        self.requested_pages = []
+
+    def get(self, endpoint, params, headers=None):
+        page_index = int(params["pageIndex"])
+        self.requested_pages.append(page_index)
+        start = page_index * self.page_size
+        ids = [f"demo.{n}" for n in range(start, min(start + self.page_size, self.total))]
+        response = MagicMock()
+        response.json.return_value = {"results": ids, "pagination": {"hasNext": start + self.page_size < self.total}}
+        return response
+
+
+def test_list_objects_follows_more_pages_than_the_recursion_limit():
+    pages = sys.getrecursionlimit() + 100
+    client = PagedClient(total=pages * 2, page_size=2)
+
+    object_ids = DigitalObjectService(client).list_objects("demo")
+
+    assert len(object_ids) == pages * 2
+    assert object_ids[:3] == ["demo.0", "demo.1", "demo.2"]
+    assert client.requested_pages == list(range(pages))
+
+
+def test_iter_object_pages_prefetches_the_next_page():
+    client = PagedClient(total=5, page_size=2)
+    pages = DigitalObjectService(client).iter_object_pages("demo")
+
+    assert next(pages) == ["demo.0", "demo.1"]
+    # page 1 is requested while the caller still works on page 0
+    deadline = time.monotonic() + 5
+    while len(client.requested_pages) < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert client.requested_pages == [0, 1]
+
+    assert list(pages) == [["demo.2", "demo.3"], ["demo.4"]]
+    assert client.requested_pages == [0, 1, 2]
+
+
+def test_iter_objects_without_prefetch_is_lazy():
+    client = PagedClient(total=6, page_size=2)
+    object_ids = DigitalObjectService(client).iter_objects("demo", prefetch=False)
+
+    assert [next(object_ids), next(object_ids), next(object_ids)] == ["demo.0", "demo.1", "demo.2"]
+    assert client.requested_pages == [0, 1]
+    object_ids.close()
@@ -1,6 +1,10 @@
+import builtins
 import io
+import os
 import zipfile
 
+from pyrilo.infrastructure import FileSystemService as file_system_module
+from pyrilo.infrastructure.CompressionPolicy import CompressionPolicy
 from pyrilo.infrastructure.FileSystemService import FileSystemService
 
 
@@ -57,4 +61,93 @@ def test_create_zip_structure(tmp_path):
         # Note: Zip paths are usually forward slashes
         assert "data.txt" in file_list
         # Normalize path separators for cross-platform test safety
-        assert any("sub/config.json" in f.replace("\\", "/") for f in file_list)
\ No newline at end of file
+        assert any("sub/config.json" in f.replace("\\", "/") for f in file_list)
+
+def test_create_spooled_zip_rolls_over_to_disk(tmp_path):
+    """
+    Verifies that archives above the memory threshold are spooled to disk and still readable.
+    """
+    service = FileSystemService()
+
+    bag_root = tmp_path / "my_bag"
+    bag_root.mkdir()
+    payload = os.urandom(16 * 1024)  # incompressible, so the archive exceeds the threshold
+    (bag_root / "data.bin").write_bytes(payload)
+
+    with service.create_spooled_zip_from_folder(str(bag_root), max_memory_size=1024) as spooled_zip:
+        assert spooled_zip._rolled is True
+        assert spooled_zip.tell() == 0
+
+        with zipfile.ZipFile(spooled_zip) as zf:
+            assert zf.read("data.bin") == payload
+
+
+def test_zip_is_deterministic(tmp_path):
+    """
+    Verifies that zipping the same content twice yields byte-identical archives, regardless of timestamps.
+    """
+    service = FileSystemService()
+
+    bag_root = tmp_path / "my_bag"
+    (bag_root / "sub").mkdir(parents=True)
+    (bag_root / "b.txt").write_text("b")
+    (bag_root / "sub" / "a.txt").write_text("a")
+
+    first = service.create_zip_from_folder(str(bag_root))
+    os.utime(bag_root / "b.txt", (0, 0))
+    second = service.create_zip_from_folder(str(bag_root))
+
+    assert first == second
+    with zipfile.ZipFile(io.BytesIO(first)) as zf:
+        assert zf.namelist() == ["b.txt", "sub/a.txt"]
+
+
+def test_deflated_files_are_streamed(tmp_path, monkeypatch):
+    """
+    Verifies that compressed entries are copied in chunks, a large file is never read in a single call.
+    """
+    service = FileSystemService()
+    service.ZIP_COPY_BUFFER_SIZE = 64 * 1024
+
+    bag_root = tmp_path / "my_bag"
+    bag_root.mkdir()
+    content = b"<record/>\n" * (4 * service.ZIP_COPY_BUFFER_SIZE // 10)
+    (bag_root / "large.xml").write_bytes(content)
+
+    read_sizes = []
+
+    class TrackingReader(io.FileIO):
+        def read(self, size=-1):
+            read_sizes.append(size)
+            return super().read(size)
+
+    def tracking_open(path, mode="r", *args, **kwargs):
+        if mode == "rb":
+            return TrackingReader(path, "rb")
+        return builtins.open(path, mode, *args, **kwargs)
+
+    monkeypatch.setattr(file_system_module, "open", tracking_open, raising=False)
+    archive = service.create_zip_from_folder(str(bag_root))
+
+    assert len(read_sizes) > 1
+    assert all(0 < size <= service.ZIP_COPY_BUFFER_SIZE for size in read_sizes)
+    with zipfile.ZipFile(io.BytesIO(archive)) as zf:
+        assert zf.getinfo("large.xml").compress_type == zipfile.ZIP_DEFLATED
+        assert zf.read("large.xml") == content
+
+
+def test_streamed_entries_use_the_policy_level(tmp_path):
+    """
+    Verifies that the compression level of the policy reaches the streamed entries.
+    """
+    bag_root = tmp_path / "my_bag"
+    bag_root.mkdir()
+    (bag_root / "data.xml").write_bytes(os.urandom(1000).hex().encode() * 50)
+
+    sizes = []
+    for level in (1, 9):
+        archive = FileSystemService(CompressionPolicy(default_level=level)).create_zip_from_folder(str(bag_root))
+        with zipfile.ZipFile(io.BytesIO(archive)) as zf:
+            sizes.append(zf.getinfo("data.xml").compress_size)
+
+    assert sizes[0] > sizes[1]
@@ -1,13 +1,20 @@
+import io
+from http.client import RemoteDisconnected
+
 import pytest
 import requests
 from unittest.mock import MagicMock
+from urllib3.exceptions import MaxRetryError, NewConnectionError, ProtocolError
 from pyrilo.api.GamsApiClient import GamsApiClient
+from pyrilo.api.RetryPolicy import RetryPolicy
+from pyrilo.infrastructure.AdaptiveConcurrencyLimiter import AdaptiveConcurrencyLimiter
 from pyrilo.exceptions import (
     PyriloAuthenticationError,
     PyriloPermissionError,
     PyriloNotFoundError,
     PyriloConflictError,
-    PyriloApiError
+    PyriloApiError,
+    PyriloNetworkError
 )
 
 
@@ -58,4 +65,160 @@ def test_successful_request_no_error(client_with_mock_session):
     try:
         client_with_mock_session.get("some-endpoint")
     except PyriloApiError:
-        pytest.fail("Client raised PyriloApiError on 200 OK response")
\ No newline at end of file
+        pytest.fail("Client raised PyriloApiError on 200 OK response")
+
+def _response(status_code: int, headers: dict = None):
+    response = MagicMock(spec=requests.Response)
+    response.status_code = status_code
+    response.headers = headers or {}
+    response.text = ""
+    response.url = "http://mock-host/api"
+    return response
+
+
+@pytest.fixture
+def no_sleep(monkeypatch):
+    delays = []
+    monkeypatch.setattr("pyrilo.api.GamsApiClient.time.sleep", delays.append)
+    return delays
+
+
+def test_idempotent_request_is_retried(client_with_mock_session, no_sleep):
+    """
+    Verifies that transient failures of a GET are retried with backoff (honoring Retry-After).
+    """
+    client_with_mock_session.session.request.side_effect = [
+        requests.ConnectionError("refused"),
+        _response(503, {"Retry-After": "2"}),
+        _response(200),
+    ]
+
+    response = client_with_mock_session.get("some-endpoint")
+
+    assert response.status_code == 200
+    assert client_with_mock_session.session.request.call_count == 3
+    assert no_sleep[1] == 2.0
+
+
+def test_retried_overloads_reach_the_limiter(client_with_mock_session, no_sleep):
+    """
+    Verifies that overloaded attempts are reported to the limiter whose slot is held, although the request
+    succeeds after retrying.
+    """
+    limiter = AdaptiveConcurrencyLimiter(8, initial_limit=8)
+    client_with_mock_session.session.request.side_effect = [
+        requests.ConnectionError("refused"),
+        _response(503),
+        _response(200),
+    ]
+
+    with limiter.slot():
+        client_with_mock_session.get("some-endpoint")
+
+    # every attempt started after the previous decrease
+    assert limiter.limit == 2
+
+    client_with_mock_session.session.request.side_effect = [_response(503), _response(200)]
+    client_with_mock_session.get("some-endpoint")  # no slot held
+    assert limiter.limit == 2
+
+
+def test_post_is_not_retried(client_with_mock_session, no_sleep):
+    client_with_mock_session.session.request.return_value = _response(503)
+
+    with pytest.raises(PyriloApiError):
+        client_with_mock_session.post("some-endpoint")
+
+    assert client_with_mock_session.session.request.call_count == 1
+
+
+def test_replay_safe_post_rewinds_body(client_with_mock_session, no_sleep):
+    """
+    Verifies that replay safe POSTs are retried with a rewound body, but not after read timeouts.
+    """
+    body = io.BytesIO(b"payload")
+    sent = []
+
+    def request(method, url, data=None, **kwargs):
+        sent.append(data.read())
+        if len(sent) == 1:
+            return _response(503)
+        raise requests.ReadTimeout("read timed out")
+
+    client_with_mock_session.session.request.side_effect = request
+
+    with pytest.raises(PyriloNetworkError):
+        client_with_mock_session.post("some-endpoint", data=body, replay_safe=True)
+
+    assert sent == [b"payload", b"payload"]
+
+
+@pytest.mark.parametrize("failure", [
+    _response(504),
+    _response(502),
+    requests.ConnectionError(ProtocolError("Connection aborted.", RemoteDisconnected("closed without response"))),
+])
+def test_replay_safe_post_is_not_replayed_after_it_may_have_been_processed(client_with_mock_session, no_sleep,
+                                                                          failure):
+    """
+    Verifies that a replay safe POST isn't sent again after a gateway timeout or a connection lost mid-request.
+    """
+    client_with_mock_session.session.request.side_effect = [failure, _response(200)]
+
+    with pytest.raises((PyriloApiError, PyriloNetworkError)):
+        client_with_mock_session.post("some-endpoint", data=b"payload", replay_safe=True)
+
+    assert client_with_mock_session.session.request.call_count == 1
+
+
+def test_replay_safe_post_is_replayed_after_failing_to_connect(client_with_mock_session, no_sleep):
+    refused = NewConnectionError(None, "Connection refused")
+    client_with_mock_session.session.request.side_effect = [
+        requests.ConnectionError(MaxRetryError(None, "/api", refused)),
+        requests.ConnectTimeout("connect timed out"),
+        _response(200),
+    ]
+
+    client_with_mock_session.post("some-endpoint", data=b"payload", replay_safe=True)
+
+    assert client_with_mock_session.session.request.call_count == 3
+
+
+def test_retries_are_exhausted(client_with_mock_session, no_sleep):
+    client_with_mock_session.retry_policies = RetryPolicy.defaults(max_attempts=3)
+    client_with_mock_session.session.request.return_value = _response(502)
+
+    with pytest.raises(PyriloApiError):
+        client_with_mock_session.delete("some-endpoint")
+
+    assert client_with_mock_session.session.request.call_count == 3
+    assert all(0 <= delay <= 30 for delay in no_sleep)
+
+
+def test_expired_session_is_renewed_and_request_repeated(requests_mock):
+    """
+    Verifies that a redirect to the login page triggers a single new login and the request is sent again.
+    """
+    login_page = '<html><form action="/login-action"><input type="password" name="password"/></form></html>'
+    requests_mock.get("http://mock-host/login-page", text=login_page, headers={"Content-Type": "text/html"})
+    requests_mock.get("http://mock-host/api/v1/projects/demo/objects/ids", [
+        {"status_code": 302, "headers": {"Location": "http://mock-host/login-page"}},
+        {"json": {"results": ["demo.1"]}},
+    ])
+    requests_mock.post("http://mock-host/api/v1/projects/demo/objects/demo.1", [
+        {"status_code": 401},
+        {"status_code": 201},
+    ])
+    logins = []
+    client = GamsApiClient("http://mock-host")
+    client.authenticator = lambda: logins.append(True)
+
+    assert client.get("projects/demo/objects/ids").json() == {"results": ["demo.1"]}
+    assert client.post("projects/demo/objects/demo.1").status_code == 201
+    assert len(logins) == 2
+
+    # still unauthorized after the new login: raised instead of looping
+    requests_mock.post("http://mock-host/api/v1/projects/demo/objects/demo.1", status_code=401)
+    with pytest.raises(PyriloAuthenticationError):
+        client.post("projects/demo/objects/demo.1")
+    assert len(logins) == 3
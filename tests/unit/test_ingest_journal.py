@@ -0,0 +1,73 @@
+from pyrilo.infrastructure.IngestJournal import IngestJournal
+
+
+def test_latest_states_keeps_last_record_per_bag(tmp_path):
+    journal = IngestJournal(str(tmp_path / "journal.jsonl"))
+    journal.start_run("demo")
+    journal.record("demo", "demo.person.1", IngestJournal.PACKAGED)
+    journal.record("demo", "demo.person.1", IngestJournal.UPLOADED)
+    journal.record("demo", "demo.person.2", IngestJournal.FAILED, error="boom")
+    journal.record("other", "other.person.1", IngestJournal.UPLOADED)
+
+    states = journal.latest_states("demo")
+
+    assert states["demo.person.1"]["state"] == IngestJournal.UPLOADED
+    assert states["demo.person.2"]["error"] == "boom"
+    assert "other.person.1" not in states
+    assert journal.bags_in_state("demo", {IngestJournal.FAILED}) == {"demo.person.2"}
+    journal.close()
+
+
+def test_new_run_resets_states(tmp_path):
+    journal = IngestJournal(str(tmp_path / "journal.jsonl"))
+    journal.start_run("demo")
+    journal.record("demo", "demo.person.1", IngestJournal.FAILED)
+    journal.start_run("demo")
+    journal.record("demo", "demo.person.2", IngestJournal.PACKAGED)
+
+    assert set(journal.latest_states("demo")) == {"demo.person.2"}
+    journal.close()
+
+
+def test_damaged_lines_are_ignored(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    journal = IngestJournal(str(path))
+    journal.start_run("demo")
+    journal.record("demo", "demo.person.1", IngestJournal.UPLOADED)
+    journal.close()
+
+    # crash while writing the last record
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"project": "demo", "bag": "demo.pers')
+
+    reopened = IngestJournal(str(path))
+    assert reopened.bags_in_state("demo", {IngestJournal.UPLOADED}) == {"demo.person.1"}
+    reopened.close()
+
+
+def test_runs_are_kept_per_host_and_compacted(tmp_path):
+    """
+    Verifies that resuming only sees the runs of the journal's host and that a new run replaces the previous one.
+    """
+    path = str(tmp_path / "journal.jsonl")
+    dev = IngestJournal(path, host="http://dev")
+    dev.start_run("demo")
+    dev.record("demo", "demo.person.1", IngestJournal.UPLOADED)
+    prod = IngestJournal(path, host="http://prod")
+    prod.start_run("demo")
+    prod.record("demo", "demo.person.2", IngestJournal.UPLOADED)
+
+    assert dev.bags_in_state("demo", {IngestJournal.UPLOADED}) == {"demo.person.1"}
+    assert prod.bags_in_state("demo", {IngestJournal.UPLOADED}) == {"demo.person.2"}
+
+    for _ in range(3):
+        dev.start_run("demo")
+        dev.record("demo", "demo.person.1", IngestJournal.UPLOADED)
+    dev.close()
+    prod.close()
+
+    with open(path, encoding="utf-8") as f:
+        lines = f.readlines()
+    # one run of each host: run start and one record
+    assert len(lines) == 4
+    assert IngestJournal(path, host="http://prod").bags_in_state("demo", {IngestJournal.UPLOADED}) == {"demo.person.2"}
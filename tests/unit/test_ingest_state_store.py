@@ -0,0 +1,40 @@
+import os
+
+from pyrilo.infrastructure.BagCatalog import BagCatalog
+from pyrilo.infrastructure.IngestStateStore import IngestStateStore
+
+HOST = "http://localhost:18085"
+
+
+def _make_bag(path, manifest: str = "abc data/content/DC.xml"):
+    path.mkdir(parents=True)
+    (path / "bagit.txt").write_text("BagIt-Version: 1.0\n")
+    (path / "bag-info.txt").write_text("Payload-Oxum: 10.1\n")
+    (path / "manifest-sha512.txt").write_text(manifest)
+
+
+def test_unchanged_bags_are_detected_after_ingest(tmp_path):
+    """
+    Verifies that only bags with changed manifests count as changed after their ingest was recorded.
+    """
+    bag_root = tmp_path / "bags"
+    _make_bag(bag_root / "demo.1")
+    _make_bag(bag_root / "demo.2")
+    store = IngestStateStore(str(tmp_path / "state.sqlite"))
+
+    for bag in BagCatalog(str(bag_root)).scan():
+        state, changed = store.inspect(HOST, "demo", str(bag_root), bag)
+        assert changed
+        store.record_ingest(HOST, "demo", state)
+
+    # timestamps only (e.g. copied bag) vs. real content change
+    os.utime(bag_root / "demo.1" / "manifest-sha512.txt", ns=(0, 1))
+    (bag_root / "demo.2" / "manifest-sha512.txt").write_text("def data/content/DC.xml")
+
+    changes = {bag.name: store.inspect(HOST, "demo", str(bag_root), bag)[1] for bag in BagCatalog(str(bag_root)).scan()}
+
+    assert changes == {"demo.1": False, "demo.2": True}
+    assert store.get(HOST, "demo", "demo.1").ingested_at is not None
+    assert store.get(HOST, "other", "demo.1") is None
+    # ingested to another server: changed there
+    assert store.inspect("http://other-host", "demo", str(bag_root), BagCatalog(str(bag_root)).scan()[0])[1]
@@ -0,0 +1,39 @@
+from pyrilo.infrastructure.InventoryCache import InventoryCache
+
+HOST = "http://localhost:18085"
+
+
+def test_inventory_is_persisted_and_updated(tmp_path):
+    """
+    Verifies that a stored inventory survives reopening the cache and follows our own creations / deletions.
+    """
+    db_path = str(tmp_path / "inventory.sqlite")
+    cache = InventoryCache(db_path)
+    cache.store(HOST, "demo", ["demo.1", "demo.2"], etag='"v1"')
+    cache.add(HOST, "demo", "demo.3")
+    cache.remove(HOST, "demo", "demo.1")
+    # projects without cached inventory aren't started by a single creation
+    cache.add(HOST, "other", "other.1")
+    cache.close()
+
+    cache = InventoryCache(db_path)
+    inventory = cache.load(HOST, "demo")
+    assert inventory.object_ids == {"demo.2", "demo.3"}
+    assert inventory.etag == '"v1"'
+    assert inventory.revalidatable
+    assert cache.is_fresh(inventory)
+    assert cache.load(HOST, "other") is None
+    assert cache.load("http://other-host", "demo") is None
+
+    cache.invalidate(HOST, "demo")
+    assert cache.load(HOST, "demo") is None
+
+
+def test_expired_inventory_is_fresh_again_after_touch(tmp_path):
+    cache = InventoryCache(str(tmp_path / "inventory.sqlite"), ttl=60)
+    cache.store(HOST, "demo", ["demo.1"])
+    cache._connection.execute("UPDATE inventories SET fetched_at = fetched_at - 120")
+
+    assert not cache.is_fresh(cache.load(HOST, "demo"))
+    cache.touch(HOST, "demo")
+    assert cache.is_fresh(cache.load(HOST, "demo"))
@@ -0,0 +1,53 @@
+import json
+
+import pytest
+
+from pyrilo.infrastructure.MetricsRegistry import MetricsRegistry
+
+
+@pytest.mark.parametrize("endpoint,template", [
+    ("projects/demo/objects", "projects/{p}/objects"),
+    ("projects/demo/objects/demo.person.1", "projects/{p}/objects/{id}"),
+    ("projects/demo/objects/ids?pageIndex=3", "projects/{p}/objects/ids"),
+    ("http://localhost:18085/api/v1/projects/demo/objects/demo.1/collect", "projects/{p}/objects/{id}/collect"),
+    ("integration/c-search/projects/demo/objects", "integration/c-search/projects/{p}/objects"),
+    ("integration/projects/demo/objects/search/setup", "integration/projects/{p}/objects/search/setup"),
+    ("http://localhost:18085/login-action", "login-action"),
+])
+def test_endpoint_template(endpoint, template):
+    assert MetricsRegistry.endpoint_template(endpoint) == template
+
+
+def test_prometheus_export():
+    metrics = MetricsRegistry()
+    metrics.observe_request("DELETE", "projects/demo/objects/demo.1", 200, 0.02)
+    metrics.observe_request("DELETE", "projects/demo/objects/demo.2", 503, 0.3)
+    metrics.observe_request("POST", "projects/demo/objects", None, 1.5, bytes_sent=2048)
+    metrics.observe_stage("zip", 0.7)
+
+    text = metrics.to_prometheus()
+
+    assert 'pyrilo_http_requests_total{method="DELETE",endpoint="projects/{p}/objects/{id}",status="2xx"} 1' in text
+    assert 'pyrilo_http_requests_total{method="DELETE",endpoint="projects/{p}/objects/{id}",status="5xx"} 1' in text
+    assert 'pyrilo_http_requests_total{method="POST",endpoint="projects/{p}/objects",status="error"} 1' in text
+    assert 'pyrilo_http_sent_bytes_total{method="POST",endpoint="projects/{p}/objects"} 2048' in text
+    assert 'pyrilo_http_request_duration_seconds_bucket{method="DELETE",endpoint="projects/{p}/objects/{id}",le="0.025"} 1' in text
+    assert 'pyrilo_http_request_duration_seconds_count{method="DELETE",endpoint="projects/{p}/objects/{id}"} 2' in text
+    assert 'pyrilo_stage_duration_seconds_bucket{stage="zip",le="+Inf"} 1' in text
+
+
+def test_json_export(tmp_path):
+    metrics = MetricsRegistry()
+    with metrics.time_stage("upload"):
+        pass
+    metrics.observe_request("GET", "projects/demo/objects/ids", 200, 0.01, bytes_received=100)
+
+    path = tmp_path / "metrics.json"
+    metrics.write(str(path))
+    exported = json.loads(path.read_text())
+
+    assert exported["requests"][0]["endpoint"] == "projects/{p}/objects/ids"
+    assert exported["requests"][0]["bytes_received"] == 100
+    assert exported["requests"][0]["latency_seconds"]["buckets"]["0.01"] == 1
+    assert exported["stages"][0]["stage"] == "upload"
+    assert exported["stages"][0]["duration_seconds"]["count"] == 1
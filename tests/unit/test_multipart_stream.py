@@ -0,0 +1,71 @@
+import asyncio
+import io
+from email.parser import BytesParser
+
+from pyrilo.infrastructure.MultipartStream import MultipartStream
+
+
+def _parse(stream: MultipartStream, body: bytes):
+    message = BytesParser().parsebytes(
+        f"Content-Type: {stream.content_type}\r\n\r\n".encode() + body
+    )
+    return {part.get_param("name", header="content-disposition"): part for part in message.get_payload()}
+
+
+def test_stream_encodes_fields_and_files():
+    """
+    Verifies that the streamed body is a valid multipart/form-data document.
+    """
+    payload = bytes(range(256)) * 100
+    stream = MultipartStream(
+        fields={"ingestProfile": "simple"},
+        files={"subInfoPackZIP": ("bag.zip", io.BytesIO(payload), "application/zip")}
+    )
+
+    body = stream.read()
+
+    assert len(body) == len(stream)
+    parts = _parse(stream, body)
+    assert parts["ingestProfile"].get_payload() == "simple"
+    assert parts["subInfoPackZIP"].get_filename() == "bag.zip"
+    assert parts["subInfoPackZIP"].get_content_type() == "application/zip"
+    assert parts["subInfoPackZIP"].get_payload(decode=True) == payload
+
+
+def test_stream_chunked_reads_match_full_read():
+    """
+    Verifies that reading in small blocks (like http.client does) yields the same bytes and that
+    the stream can be rewound.
+    """
+    stream = MultipartStream(
+        fields={"a": "1"},
+        files={"file": ("f.bin", io.BytesIO(b"x" * 10_000), "application/octet-stream")},
+        chunk_size=333
+    )
+
+    chunked = b"".join(stream)
+    stream.seek(0)
+
+    assert chunked == stream.read()
+    assert stream.tell() == len(stream)
+    assert stream.read(10) == b""
+
+
+def test_stream_async_chunks_match_full_read():
+    """
+    Verifies that the async iteration used by the asyncio client yields the same body.
+    """
+    stream = MultipartStream(
+        fields={"a": "1"},
+        files={"file": ("f.bin", io.BytesIO(b"x" * 10_000), "application/octet-stream")},
+        chunk_size=333
+    )
+
+    async def collect():
+        return [chunk async for chunk in stream.aiter_chunks()]
+
+    chunks = asyncio.run(collect())
+    stream.seek(0)
+
+    assert all(len(chunk) <= 333 for chunk in chunks)
+    assert b"".join(chunks) == stream.read()
@@ -0,0 +1,68 @@
+import os
+import time
+
+from pyrilo.infrastructure.PackageCache import PackageCache
+
+
+def _make_bag(path, manifest: str):
+    path.mkdir(parents=True)
+    (path / "bagit.txt").write_text("BagIt-Version: 1.0")
+    (path / "manifest-sha512.txt").write_text(manifest)
+    return str(path)
+
+
+def test_key_depends_on_manifests_and_fingerprint(tmp_path):
+    cache = PackageCache(str(tmp_path / "cache"), max_bytes=1024)
+
+    bag_a = _make_bag(tmp_path / "a", "111 data/x")
+    bag_b = _make_bag(tmp_path / "b", "111 data/x")
+    bag_c = _make_bag(tmp_path / "c", "222 data/x")
+    (tmp_path / "no_manifest").mkdir()
+
+    assert cache.key_for(bag_a) == cache.key_for(bag_b)
+    assert cache.key_for(bag_a) != cache.key_for(bag_c)
+    assert cache.key_for(bag_a) != cache.key_for(bag_a, fingerprint="other-policy")
+    assert cache.key_for(str(tmp_path / "no_manifest")) is None
+
+
+def test_lru_eviction_keeps_recently_used_entries(tmp_path):
+    """
+    Verifies that the least recently used archives are evicted once the cache exceeds its size.
+    """
+    cache = PackageCache(str(tmp_path / "cache"), max_bytes=250)
+
+    cache.release(cache.create("old", lambda f: f.write(b"o" * 100)))
+    cache.release(cache.create("used", lambda f: f.write(b"u" * 100)))
+    past = time.time() - 100
+    os.utime(os.path.join(cache.cache_dir, "old.zip"), (past, past))
+    os.utime(os.path.join(cache.cache_dir, "used.zip"), (past + 1, past + 1))
+    cache.release(cache.get("used"))  # refreshes usage time
+
+    cache.release(cache.create("new", lambda f: f.write(b"n" * 100)))
+
+    assert cache.get("old") is None
+    assert cache.get("used") is not None
+    assert cache.get("new") is not None
+
+
+def test_archives_in_flight_are_not_evicted(tmp_path):
+    """
+    Verifies that archives handed out (e.g. queued for upload) survive a cache smaller than them.
+    """
+    cache = PackageCache(str(tmp_path / "cache"), max_bytes=0)
+
+    first = cache.create("first", lambda f: f.write(b"f" * 100))
+    second = cache.get("first")
+    source = tmp_path / "other.zip"
+    source.write_bytes(b"o" * 100)
+    other = cache.put("other", str(source))
+
+    assert os.path.exists(first) and os.path.exists(other)
+
+    cache.release(other)
+    assert not os.path.exists(other)
+    cache.release(first)
+    # still leased by the get
+    assert os.path.exists(second)
+    cache.release(second)
+    assert not os.path.exists(second)
@@ -0,0 +1,56 @@
+import os
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from pyrilo.app.PackagingService import PackagingService
+from pyrilo.infrastructure.FileSystemService import FileSystemService
+from pyrilo.infrastructure.PackageCache import PackageCache
+
+
+def test_package_bag_on_process_pool(tmp_path):
+    """
+    Verifies that bags are zipped by the worker processes into the work dir and released afterwards.
+    """
+    bag_root = tmp_path / "demo.1"
+    bag_root.mkdir()
+    (bag_root / "bagit.txt").write_text("demo.1")
+    work_dir = tmp_path / "work"
+    work_dir.mkdir()
+    service = PackagingService(FileSystemService())
+
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        archive_path = service.package_bag(str(bag_root), str(work_dir), executor)
+
+        with pytest.raises(FileNotFoundError):
+            service.package_bag(str(tmp_path / "demo.missing"), str(work_dir), executor)
+
+    assert os.path.dirname(archive_path) == str(work_dir)
+    with zipfile.ZipFile(archive_path) as zf:
+        assert zf.read("bagit.txt").decode() == "demo.1"
+
+    service.release_archive(archive_path)
+    assert os.listdir(work_dir) == []
+
+
+def test_package_bag_reuses_cached_archives(tmp_path):
+    """
+    Verifies that packaged bags end up in the package cache and are not zipped again.
+    """
+    bag_root = tmp_path / "bags" / "demo.1"
+    bag_root.mkdir(parents=True)
+    (bag_root / "bagit.txt").write_text("BagIt-Version: 1.0")
+    (bag_root / "manifest-sha512.txt").write_text("abc data/file.txt")
+
+    cache = PackageCache(str(tmp_path / "cache"), max_bytes=1024 * 1024)
+    service = PackagingService(FileSystemService(), package_cache=cache)
+
+    first = service.package_bag(str(bag_root), str(tmp_path))
+    (bag_root / "bagit.txt").touch()  # timestamps alone don't invalidate the cache
+    second = service.package_bag(str(bag_root), str(tmp_path))
+
+    assert first == second
+    assert cache.contains(first)
+    service.release_archive(first)
+    assert os.path.exists(first)
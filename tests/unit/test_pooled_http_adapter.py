@@ -0,0 +1,64 @@
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from pyrilo.api.GamsApiClient import GamsApiClient
+from pyrilo.api.PooledHTTPAdapter import PooledHTTPAdapter
+
+
+class _KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.server.connections.add(self.client_address)
+        body = b"{}"
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def keep_alive_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _KeepAliveHandler)
+    server.daemon_threads = True
+    server.connections = set()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_concurrent_requests_reuse_pooled_connections(keep_alive_server):
+    """
+    Verifies that worker threads sharing the client reuse at most pool size connections.
+    """
+    client = GamsApiClient(f"http://127.0.0.1:{keep_alive_server.server_address[1]}", pool_maxsize=1)
+    client.ensure_pool_size(4)
+    assert client.pool_maxsize == 4
+
+    def work():
+        for _ in range(25):
+            client.get("objects")
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(keep_alive_server.connections) <= 4
+
+
+def test_keepalive_socket_options():
+    options = PooledHTTPAdapter(pool_maxsize=2).socket_options
+
+    assert (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1) in options
+    assert (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1) in options
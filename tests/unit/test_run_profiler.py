@@ -0,0 +1,60 @@
+import pstats
+import threading
+
+from pyrilo.infrastructure.RunProfiler import RunProfiler
+
+
+def _busy_work():
+    return sorted(str(n) for n in range(20000))
+
+
+def test_spans_are_attributed_to_stages_and_bags(tmp_path):
+    profiler = RunProfiler()
+    profiler.start()
+    with profiler.span("discover"):
+        pass
+    for bag in ["demo.1", "demo.2"]:
+        with profiler.span("package", bag):
+            _busy_work()
+        with profiler.span("upload", bag):
+            pass
+    profiler.stop()
+
+    summary = profiler.write(str(tmp_path / "profile"))
+
+    assert "discover" in summary
+    assert "package" in summary
+    assert "demo.1" in summary and "demo.2" in summary
+    assert (tmp_path / "profile.txt").read_text() == summary
+    stats = pstats.Stats(str(tmp_path / "profile.pstats"))
+    assert any(function == "_busy_work" for _, _, function in stats.stats)
+
+
+def test_span_records_failing_blocks():
+    profiler = RunProfiler()
+    try:
+        with profiler.span("upload", "demo.1"):
+            raise ValueError("upload failed")
+    except ValueError:
+        pass
+
+    assert "demo.1" in profiler.summary()
+
+
+def test_worker_threads_are_profiled(tmp_path):
+    profiler = RunProfiler()
+    profiler.start()
+    thread = threading.Thread(target=_busy_work)
+    thread.start()
+    thread.join()
+    profiler.stop()
+
+    profiler.write(str(tmp_path / "profile"))
+
+    stats = pstats.Stats(str(tmp_path / "profile.pstats"))
+    assert any(function == "_busy_work" for _, _, function in stats.stats)
+
+
+def test_spanned_without_profiler_is_a_no_op():
+    with RunProfiler.spanned(None, "upload", "demo.1"):
+        pass
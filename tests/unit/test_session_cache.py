@@ -0,0 +1,59 @@
+import os
+import stat
+
+import pytest
+from requests.cookies import RequestsCookieJar, create_cookie
+
+from pyrilo.infrastructure.SessionCache import SessionCache
+
+HOST = "http://localhost:18085"
+
+
+def _jar(**cookies) -> RequestsCookieJar:
+    jar = RequestsCookieJar()
+    for name, value in cookies.items():
+        jar.set_cookie(create_cookie(name, value, domain="localhost.local", path="/"))
+    return jar
+
+
+def test_cookies_are_restored_per_host(tmp_path):
+    path = str(tmp_path / "cache" / "sessions.json")
+    SessionCache(path).store(HOST, "alice", _jar(KEYCLOAK_SESSION="abc", JSESSIONID="def"))
+
+    cache = SessionCache(path)
+    assert dict(cache.load(HOST, "alice")) == {"KEYCLOAK_SESSION": "abc", "JSESSIONID": "def"}
+    assert cache.load("http://other-host", "alice") is None
+    if os.name == "posix":
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+
+    cache.clear(HOST, "alice")
+    assert cache.load(HOST, "alice") is None
+
+
+def test_sessions_are_restored_for_their_user_only(tmp_path):
+    cache = SessionCache(str(tmp_path / "sessions.json"))
+    cache.store(HOST, "alice", _jar(JSESSIONID="alice-session"))
+
+    assert cache.load(HOST, "bob") is None
+    assert cache.load(HOST, None) is None
+
+    cache.store(HOST, "bob", _jar(JSESSIONID="bob-session"))
+    assert dict(cache.load(HOST, "alice")) == {"JSESSIONID": "alice-session"}
+    assert dict(cache.load(HOST, "bob")) == {"JSESSIONID": "bob-session"}
+
+
+def test_old_sessions_are_not_restored(tmp_path):
+    cache = SessionCache(str(tmp_path / "sessions.json"), max_age=0)
+    cache.store(HOST, "alice", _jar(JSESSIONID="def"))
+
+    assert cache.load(HOST, "alice") is None
+
+
+@pytest.mark.skipif(os.name != "posix", reason="file modes are posix only")
+def test_cache_readable_by_others_is_ignored(tmp_path):
+    path = str(tmp_path / "sessions.json")
+    cache = SessionCache(path)
+    cache.store(HOST, "alice", _jar(JSESSIONID="def"))
+    os.chmod(path, 0o644)
+
+    assert cache.load(HOST, "alice") is None
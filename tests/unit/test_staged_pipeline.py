@@ -0,0 +1,65 @@
+import threading
+import time
+
+from pyrilo.infrastructure.StagedPipeline import PipelineStage, StagedPipeline
+
+
+def test_pipeline_runs_all_stages_and_isolates_failures():
+    """
+    Verifies that items pass all stages, dropped items stop early and failures don't stop the pipeline.
+    """
+    results = []
+    cleaned_up = []
+
+    def check(item):
+        if item == 3:
+            raise ValueError("broken item")
+        return None if item == 5 else item
+
+    pipeline = StagedPipeline(
+        [
+            PipelineStage("check", check, 2),
+            PipelineStage("double", lambda item: item * 2, 3),
+            PipelineStage("collect", results.append, 1),
+            PipelineStage("disabled", lambda item: item, 0),
+        ],
+        queue_size=2,
+        on_failure=lambda item, stage, error: cleaned_up.append((item, stage))
+    )
+
+    failures = pipeline.run(range(10))
+
+    assert sorted(results) == [0, 2, 4, 8, 12, 14, 16, 18]
+    assert [(item, stage) for item, stage, _ in failures] == [(3, "check")]
+    assert cleaned_up == [(3, "check")]
+
+
+def test_pipeline_stages_overlap_with_bounded_queues():
+    """
+    Verifies that stages work concurrently and a slow stage limits the number of items in flight.
+    """
+    in_flight = 0
+    max_in_flight = 0
+    lock = threading.Lock()
+
+    def produce(item):
+        nonlocal in_flight, max_in_flight
+        with lock:
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+        return item
+
+    def slow_consume(item):
+        nonlocal in_flight
+        time.sleep(0.005)
+        with lock:
+            in_flight -= 1
+
+    pipeline = StagedPipeline(
+        [PipelineStage("produce", produce, 1), PipelineStage("consume", slow_consume, 1)],
+        queue_size=2
+    )
+
+    assert pipeline.run(range(30)) == []
+    # queue of the consumer + the item it works on + the item the producer waits to hand over
+    assert max_in_flight <= 4
@@ -0,0 +1,397 @@
+import collections
+import io
+import json
+import random
+import re
+import threading
+import time
+import uuid
+import zipfile
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Counter, Dict, List, Optional, Set, Tuple, Union
+from urllib.parse import parse_qs, urlsplit
+
+from tests.utils.FaultRule import FaultRule
+from tests.utils.LatencyDistribution import LatencyDistribution
+
+
+class FakeGamsServer:
+    """
+    In-process stand-in for the GAMS5 endpoints used by pyrilo, listening on a real socket of
+    localhost (so connection pooling, keep-alive and concurrency behave as against a deployed instance).
+
+    State: projects, their objects (by the recid of the sip.json in the uploaded bag archive), the
+    objects integrated per integration target and the login sessions. The listing of object ids
+    carries an ETag (a version of the project, changed by every write) and answers If-None-Match
+    with 304, like a caching proxy in front of GAMS5.
+
+    Load testing:
+    - latency: processing delay per response, one distribution for all routes or per route
+    - bandwidth: bytes per second per connection, for request and response bodies
+    - faults: FaultRules answering matching requests with a status (e.g. 503, 409), after a delay or by
+      dropping the connection, instead of processing them
+    The server records the requests per route, the connections opened and the peak number of
+    concurrently processed requests.
+    """
+
+    API_ROOT = "/api/v1"
+    SESSION_COOKIE = "FAKE_GAMS_SESSION"
+
+    # route name -> (methods, pattern of the path below the api root)
+    ROUTES = {
+        "auth": ({"GET"}, re.compile(r"auth")),
+        "project": ({"PUT", "PATCH", "DELETE"}, re.compile(r"projects/(?P<project>[^/]+)")),
+        "list": ({"GET"}, re.compile(r"projects/(?P<project>[^/]+)/objects/ids")),
+        "ingest": ({"POST"}, re.compile(r"projects/(?P<project>[^/]+)/objects")),
+        "collect": ({"PATCH"}, re.compile(r"projects/(?P<project>[^/]+)/objects/(?P<object>[^/]+)/collect")),
+        "object": ({"HEAD", "PUT", "DELETE"}, re.compile(r"projects/(?P<project>[^/]+)/objects/(?P<object>[^/]+)")),
+        "search-setup": ({"POST"}, re.compile(r"integration/projects/(?P<project>[^/]+)/objects/search/setup")),
+        "integration": ({"POST", "DELETE"}, re.compile(
+            r"integration/(?:(?P<target>c-search|plexus-search)/)?projects/(?P<project>[^/]+)/objects(?:/(?P<object>[^/]+))?"
+        )),
+    }
+    # integration target of integration/projects/...
+    DEFAULT_TARGET = "integration"
+
+    def __init__(self,
+                 page_size: int = 100,
+                 latency: Union[LatencyDistribution, Dict[str, LatencyDistribution]] = None,
+                 bandwidth: int = None,
+                 faults: List[FaultRule] = None,
+                 require_auth: bool = True,
+                 seed: int = None) -> None:
+        """
+        :param latency: delay of every response, or delays per route name (see ROUTES, 'login' for the login form post)
+        :param bandwidth: bytes per second per connection, None for no limit
+        :param require_auth: api requests without a session cookie of a login are answered with 401
+        """
+        self.page_size = page_size
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.faults = list(faults or [])
+        self.require_auth = require_auth
+
+        self.projects: Dict[str, Set[str]] = {}
+        self.versions: Counter[str] = collections.Counter()
+        self.integrated: Dict[Tuple[str, str], Set[str]] = {}
+        self.search_setup: Set[str] = set()
+        self.sessions: Set[str] = set()
+
+        self.request_counts: Counter[Tuple[str, str]] = collections.Counter()
+        self.connections = 0
+        self.max_in_flight = 0
+        self._in_flight = 0
+
+        self.lock = threading.Lock()
+        self._rng = random.Random(seed)
+        self._httpd: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeGamsServer":
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), _FakeGamsRequestHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.fake_server = self
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="fake-gams-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._thread.join()
+            self._httpd = None
+
+    def __enter__(self) -> "FakeGamsServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.stop()
+
+    def objects(self, project_abbr: str) -> Set[str]:
+        with self.lock:
+            return set(self.projects.get(project_abbr, set()))
+
+    def add_objects(self, project_abbr: str, object_ids) -> None:
+        with self.lock:
+            self.projects.setdefault(project_abbr, set()).update(object_ids)
+            self.versions[project_abbr] += 1
+
+    def integrated_objects(self, project_abbr: str, target: str = DEFAULT_TARGET) -> Set[str]:
+        with self.lock:
+            return set(self.integrated.get((target, project_abbr), set()))
+
+    def requests(self, route: str, method: str = None) -> int:
+        """
+        Number of requests received for given route (and method), including those hit by faults.
+        """
+        with self.lock:
+            return sum(count for (request_method, request_route), count in self.request_counts.items()
+                       if request_route == route and (method is None or request_method == method))
+
+    def expire_sessions(self) -> None:
+        """
+        Invalidates all logins, like a server restart or an expired session.
+        """
+        with self.lock:
+            self.sessions.clear()
+
+    def route(self, method: str, path: str) -> Tuple[Optional[str], Dict[str, str]]:
+        """
+        Resolves the route name and path parameters of a request, (None, {}) for unknown routes.
+        """
+        if path == "/login-action":
+            return ("login", {}) if method == "POST" else (None, {})
+        if not path.startswith(self.API_ROOT + "/"):
+            return None, {}
+        relative_path = path[len(self.API_ROOT) + 1:]
+        for name, (methods, pattern) in self.ROUTES.items():
+            match = pattern.fullmatch(relative_path)
+            if match and method in methods:
+                return name, {key: value for key, value in match.groupdict().items() if value is not None}
+        return None, {}
+
+    def delay(self, route: str) -> float:
+        latency = self.latency.get(route) if isinstance(self.latency, dict) else self.latency
+        if latency is None:
+            return 0.0
+        with self.lock:
+            return latency.sample(self._rng)
+
+    def fault(self, route: str, method: str) -> Optional[FaultRule]:
+        """
+        The fault to inject into a request, if any (the first matching rule).
+        """
+        with self.lock:
+            for rule in self.faults:
+                if rule.matches(route, method):
+                    if self._rng.random() >= rule.probability:
+                        return None
+                    rule.injected += 1
+                    return rule
+        return None
+
+    def handle(self, method: str, route: str, params: Dict[str, str], query: Dict[str, str], headers, body: bytes):
+        """
+        Processes a request of a known route, returns (status, headers, body).
+        """
+        if route == "auth":
+            form = '<form action="/login-action"><input type="hidden" name="execution" value="fake"/></form>'
+            return 200, {"Content-Type": "text/html"}, form.encode()
+        if route == "login":
+            session = uuid.uuid4().hex
+            with self.lock:
+                self.sessions.add(session)
+            cookie = f"{self.SESSION_COOKIE}={session}; Path=/; HttpOnly"
+            return 200, {"Content-Type": "text/plain", "Set-Cookie": cookie}, b"Login Successful"
+
+        if self.require_auth and not self._authenticated(headers):
+            return 401, {}, b"Unauthorized"
+
+        project_abbr = params.get("project")
+        if route == "project":
+            return self._handle_project(method, project_abbr)
+        if route == "list":
+            return self._list_object_ids(project_abbr, int(query.get("pageIndex", "0")), headers.get("If-None-Match"))
+        if route == "ingest":
+            return self._ingest(project_abbr, headers.get("Content-Type", ""), body)
+        if route in ("object", "collect"):
+            return self._handle_object(method, project_abbr, params["object"], route == "collect")
+        if route == "search-setup":
+            with self.lock:
+                if project_abbr in self.search_setup:
+                    return 409, {}, b"Search already set up"
+                self.search_setup.add(project_abbr)
+            return 200, {}, b""
+        return self._handle_integration(method, params.get("target", self.DEFAULT_TARGET), project_abbr,
+                                        params.get("object"))
+
+    def _authenticated(self, headers) -> bool:
+        cookie = SimpleCookie(headers.get("Cookie", ""))
+        session = cookie.get(self.SESSION_COOKIE)
+        with self.lock:
+            return session is not None and session.value in self.sessions
+
+    def _handle_project(self, method: str, project_abbr: str):
+        with self.lock:
+            if method == "PUT":
+                if project_abbr in self.projects:
+                    return 409, {}, b"Project already exists"
+                self.projects[project_abbr] = set()
+                self.versions[project_abbr] += 1
+                return 201, {}, b""
+            if project_abbr not in self.projects:
+                return 404, {}, b"Project not found"
+            if method == "DELETE":
+                del self.projects[project_abbr]
+                self.versions[project_abbr] += 1
+            return 200, {}, b""
+
+    def _list_object_ids(self, project_abbr: str, page_index: int, if_none_match: Optional[str]):
+        with self.lock:
+            ids = sorted(self.projects.get(project_abbr, set()))
+            etag = f'"{project_abbr}-{self.versions[project_abbr]}"'
+        if if_none_match == etag:
+            return 304, {"ETag": etag}, b""
+        page = ids[page_index * self.page_size:(page_index + 1) * self.page_size]
+        has_next = (page_index + 1) * self.page_size < len(ids)
+        body = json.dumps({"results": page, "pagination": {"pageIndex": page_index, "hasNext": has_next}})
+        return 200, {"Content-Type": "application/json", "ETag": etag}, body.encode()
+
+    def _ingest(self, project_abbr: str, content_type: str, body: bytes):
+        try:
+            object_id = self._read_recid(content_type, body)
+        except (KeyError, ValueError, zipfile.BadZipFile) as e:
+            return 400, {}, f"Invalid submission information package: {e}".encode()
+        with self.lock:
+            objects = self.projects.setdefault(project_abbr, set())
+            if object_id in objects:
+                return 409, {}, f"Object {object_id} already exists".encode()
+            objects.add(object_id)
+            self.versions[project_abbr] += 1
+        return 201, {}, b""
+
+    def _handle_object(self, method: str, project_abbr: str, object_id: str, collect: bool):
+        with self.lock:
+            objects = self.projects.setdefault(project_abbr, set())
+            if method == "PUT":
+                objects.add(object_id)
+                self.versions[project_abbr] += 1
+                return 201, {}, b""
+            if object_id not in objects:
+                return 404, {}, b""
+            if method == "DELETE" and not collect:
+                objects.discard(object_id)
+                self.versions[project_abbr] += 1
+                for (_, integrated_project), integrated in self.integrated.items():
+                    if integrated_project == project_abbr:
+                        integrated.discard(object_id)
+            return 200, {}, b""
+
+    def _handle_integration(self, method: str, target: str, project_abbr: str, object_id: Optional[str]):
+        with self.lock:
+            objects = self.projects.get(project_abbr, set())
+            integrated = self.integrated.setdefault((target, project_abbr), set())
+            if object_id is None:
+                if method == "POST":
+                    integrated.update(objects)
+                else:
+                    integrated.clear()
+                return 200, {}, b""
+
+            if method == "POST":
+                if object_id not in objects:
+                    return 404, {}, f"Object {object_id} not found".encode()
+                integrated.add(object_id)
+            else:
+                integrated.discard(object_id)
+            return 200, {}, b""
+
+    @staticmethod
+    def _read_recid(content_type: str, body: bytes) -> str:
+        message = BytesParser(policy=HTTP).parsebytes(f"Content-Type: {content_type}\r\n\r\n".encode() + body)
+        for part in message.iter_parts():
+            if part.get_param("name", header="content-disposition") == "subInfoPackZIP":
+                with zipfile.ZipFile(io.BytesIO(part.get_payload(decode=True))) as archive:
+                    return json.loads(archive.read("data/meta/sip.json"))["recid"]
+        raise KeyError("subInfoPackZIP")
+
+
+class _FakeGamsRequestHandler(BaseHTTPRequestHandler):
+    # keep-alive, like the servers in front of GAMS5
+    protocol_version = "HTTP/1.1"
+
+    CHUNK_SIZE = 16 * 1024
+
+    def log_message(self, format, *args):
+        pass
+
+    def setup(self):
+        super().setup()
+        with self.server.fake_server.lock:
+            self.server.fake_server.connections += 1
+
+    def _dispatch(self):
+        fake_server: FakeGamsServer = self.server.fake_server
+        url = urlsplit(self.path)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        route, params = fake_server.route(self.command, url.path)
+        body = self._read_body()
+
+        with fake_server.lock:
+            fake_server.request_counts[(self.command, route)] += 1
+            fake_server._in_flight += 1
+            fake_server.max_in_flight = max(fake_server.max_in_flight, fake_server._in_flight)
+        try:
+            fault = fake_server.fault(route, self.command) if route else None
+            if fault is not None:
+                time.sleep(fault.delay)
+                if fault.drop:
+                    self.close_connection = True
+                    return
+                headers = {"Retry-After": fault.retry_after} if fault.retry_after else {}
+                self._respond(fault.status or 500, headers, f"Injected fault {fault.status}".encode())
+                return
+
+            if route is None:
+                self._respond(404, {}, b"")
+                return
+            time.sleep(fake_server.delay(route))
+            self._respond(*fake_server.handle(self.command, route, params, query, self.headers, body))
+        finally:
+            with fake_server.lock:
+                fake_server._in_flight -= 1
+
+    def _respond(self, status: int, headers: Dict[str, str], body: bytes):
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            for offset in range(0, len(body), self.CHUNK_SIZE):
+                self._throttle(lambda: self.wfile.write(body[offset:offset + self.CHUNK_SIZE]))
+
+    def _read_body(self) -> bytes:
+        if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int(self.rfile.readline().split(b";")[0], 16)
+                if size == 0:
+                    self.rfile.readline()
+                    return b"".join(chunks)
+                chunks.append(self._throttle(lambda: self.rfile.read(size)))
+                self.rfile.readline()
+
+        remaining = int(self.headers.get("Content-Length") or 0)
+        chunks = []
+        while remaining > 0:
+            chunk = self._throttle(lambda: self.rfile.read(min(remaining, self.CHUNK_SIZE)))
+            if not chunk:
+                break
+            chunks.append(chunk)
+            remaining -= len(chunk)
+        return b"".join(chunks)
+
+    def _throttle(self, transfer):
+        """
+        Runs the transfer of one chunk, taking at least chunk size / bandwidth seconds.
+        """
+        bandwidth = self.server.fake_server.bandwidth
+        started_at = time.perf_counter()
+        result = transfer()
+        if bandwidth:
+            # bytes read, or the number of bytes written
+            size = len(result) if isinstance(result, bytes) else result or 0
+            time.sleep(max(0.0, size / bandwidth - (time.perf_counter() - started_at)))
+        return result
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = do_HEAD = _dispatch
@@ -0,0 +1,59 @@
+from dataclasses import dataclass, field
+from typing import Optional
+
+
+@dataclass
+class FaultRule:
+    """
+    Fault injected by the FakeGamsServer into matching requests, instead of processing them.
+    """
+
+    route: Optional[str] = None
+    """
+    Route the rule applies to (see FakeGamsServer.ROUTES e.g. 'ingest'), None matches all routes.
+    """
+
+    method: Optional[str] = None
+    """
+    HTTP method the rule applies to, None matches all methods.
+    """
+
+    status: Optional[int] = None
+    """
+    Status code answered instead of processing the request e.g. 503 or 409.
+    """
+
+    drop: bool = False
+    """
+    Closes the connection without a response (the client sees a connection error, or a read timeout
+    if the delay exceeds its timeout).
+    """
+
+    delay: float = 0.0
+    """
+    Seconds to wait before answering with the status / dropping the connection.
+    """
+
+    retry_after: Optional[str] = None
+    """
+    Retry-After header sent with the status.
+    """
+
+    probability: float = 1.0
+    """
+    Probability that a matching request is hit by the fault.
+    """
+
+    times: Optional[int] = None
+    """
+    Number of requests hit by the fault, None for no limit.
+    """
+
+    injected: int = field(default=0, init=False)
+    """
+    Number of requests the fault was injected into so far.
+    """
+
+    def matches(self, route: str, method: str) -> bool:
+        return (self.route is None or self.route == route) and (self.method is None or self.method == method) \
+            and (self.times is None or self.injected < self.times)
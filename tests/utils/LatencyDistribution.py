@@ -0,0 +1,29 @@
+import random
+from typing import Callable
+
+
+class LatencyDistribution:
+    """
+    Distribution of the processing delay (in seconds) the FakeGamsServer adds to a response.
+    """
+
+    def __init__(self, sample: Callable[[random.Random], float]) -> None:
+        self._sample = sample
+
+    def sample(self, rng: random.Random) -> float:
+        return max(0.0, self._sample(rng))
+
+    @classmethod
+    def constant(cls, seconds: float) -> "LatencyDistribution":
+        return cls(lambda rng: seconds)
+
+    @classmethod
+    def uniform(cls, low: float, high: float) -> "LatencyDistribution":
+        return cls(lambda rng: rng.uniform(low, high))
+
+    @classmethod
+    def lognormal(cls, median: float, sigma: float = 0.5) -> "LatencyDistribution":
+        """
+        Long tailed latency like a loaded server: most responses near the median, a few much slower.
+        """
+        return cls(lambda rng: median * rng.lognormvariate(0.0, sigma))